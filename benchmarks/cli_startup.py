@@ -0,0 +1,102 @@
+"""
+Benchmark: CLI cold-start time
+Starts fresh interpreters and measures how long the command line entry
+point and the imports behind each subcommand take before any work is
+done, and which heavy libraries each of them loads. With --record the
+run is appended to the history CSV so regressions show up over time.
+
+Usage (from the project root):
+    python benchmarks/cli_startup.py --repeat 5
+    python benchmarks/cli_startup.py --repeat 5 --record
+"""
+
+import argparse
+import datetime
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Libraries that dominate startup when imported
+HEAVY_MODULES = ["pandas", "ortools", "pypsa", "linopy", "matplotlib", "networkx"]
+
+# What each command imports before it starts working
+CASES = {
+    "help": ["-m", "src", "--help"],
+    "load": ["-c", "import src.main, src.utils.dataloader"],
+    "solve_ortools": ["-c", "import src.main, src.utils.dataloader, src.models.ortools_model"],
+    "solve_pypsa": ["-c", "import src.main, src.utils.dataloader, src.models.pypsa_model"],
+    "plot": ["-c", "import src.main, src.utils.dataloader, src.utils.plotting"],
+    "sweep": ["-c", "import src.main, src.utils.dataloader, src.utils.scenarios"],
+}
+
+_REPORT_MODULES = (
+    "import sys; print(','.join(m for m in {modules} if m in sys.modules))"
+)
+
+
+def run_case(args: list, repeat: int) -> tuple:
+    """Return the best wall time and the heavy modules loaded by a case."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+
+    if args[0] == "-c":
+        code = f"{args[1]}; " + _REPORT_MODULES.format(modules=HEAVY_MODULES)
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        loaded = out.strip().replace(",", " ")
+    else:
+        loaded = ""
+    return best, loaded
+
+
+def git_revision() -> str:
+    """Short hash of the checked out commit, or an empty string."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is kept)")
+    parser.add_argument("--record", action="store_true",
+                        help="Append the results to the history CSV")
+    parser.add_argument("--history", default="benchmarks/cli_startup_history.csv",
+                        help="History CSV used with --record")
+    args = parser.parse_args()
+
+    # Interpreter start alone, as the floor of every case
+    baseline, _ = run_case(["-c", "pass"], args.repeat)
+
+    rows = []
+    for case, case_args in CASES.items():
+        seconds, loaded = run_case(case_args, args.repeat)
+        rows.append({"case": case, "seconds": seconds,
+                     "over_interpreter_s": seconds - baseline, "heavy_modules": loaded})
+    table = pd.DataFrame(rows).set_index("case")
+
+    print(f"CLI cold start (best of {args.repeat}, interpreter alone {baseline:.3f} s)")
+    print(table.round(3).to_string())
+
+    if args.record:
+        history = table.reset_index()[["case", "seconds"]]
+        history.insert(0, "revision", git_revision())
+        history.insert(0, "timestamp", datetime.datetime.now().isoformat(timespec="seconds"))
+        path = os.path.join(ROOT, args.history)
+        history.round(4).to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+        print(f"History appended to: {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: Raw price parser vs. the previous read_csv parsing
+Parses the exchange price exports with parse_price_csv() and with the
+former pandas read_csv(parse_dates=..., dayfirst=True) code, checks that
+both give the same hourly series and reports the speedup.
+
+Usage (from the project root):
+    python benchmarks/price_parser.py --repeat 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from src.utils.dataloader import load_config
+from src.utils.prices import parse_price_csv
+
+
+def read_price_csv_legacy(source, col_name: str, skiprows: int = 1) -> pd.DataFrame:
+    """The parsing process_energy_data used before parse_price_csv()."""
+    df = pd.read_csv(
+        source,
+        sep=";",
+        usecols=[1, 2],
+        names=["datetime", col_name],
+        header=None,
+        skiprows=skiprows,
+        decimal=",",
+        parse_dates=["datetime"],
+        dayfirst=True,
+    )
+    df = df.drop_duplicates(subset="datetime").set_index("datetime").sort_index()
+    return df.resample("h").asfreq()
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of repeat calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per parser (best is kept)")
+    args = parser.parse_args()
+
+    cfg = load_config(os.path.join(ROOT, "config/model_config.yaml"))
+    rows = []
+    for key in ("electricity_price", "gas_price"):
+        path = os.path.join(ROOT, cfg["data"][key])
+        legacy = read_price_csv_legacy(path, "price")
+        parsed, _ = parse_price_csv(path, "price")
+        pd.testing.assert_frame_equal(legacy, parsed)
+
+        t_legacy = best_time(lambda: read_price_csv_legacy(path, "price"), args.repeat)
+        t_parser = best_time(lambda: parse_price_csv(path, "price"), args.repeat)
+        rows.append({
+            "file": cfg["data"][key],
+            "rows": len(legacy),
+            "read_csv_s": t_legacy,
+            "parse_price_csv_s": t_parser,
+            "speedup": t_legacy / t_parser,
+        })
+
+    table = pd.DataFrame(rows).set_index("file")
+    print(f"Raw price parsing (best of {args.repeat}, identical output)")
+    print(table.round(4).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: PyPSA model reuse vs. full rebuild
+Re-solves the same horizon with perturbed prices and demand, once by
+rebuilding network and linopy model per scenario and once by patching
+the existing model with PyPSAOptimizer.update_parameters().
+
+The horizon starts at the first hour of --month; the PyPSA model is only
+feasible in the summer months (CHP_gas_geq_Boiler_gas). Both paths must
+solve every scenario, otherwise the benchmark aborts.
+
+Usage (from the project root):
+    python benchmarks/pypsa_model_reuse.py --days 7 --scenarios 5 --solver highs
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.pypsa_model import PyPSAOptimizer
+from src.utils.dataloader import load_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=7, help="Horizon length in days")
+    parser.add_argument("--month", type=int, default=7, help="Month the horizon starts in")
+    parser.add_argument("--scenarios", type=int, default=5, help="Number of re-solves")
+    parser.add_argument("--solver", default="highs", help="linopy solver name")
+    parser.add_argument("--data", default="data/interim/data_1year_strict.csv")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    df = pd.read_csv(args.data, parse_dates=["datetime"], index_col="datetime")
+    df = df[df.index.month >= args.month].iloc[: args.days * 24]
+
+    rng = np.random.default_rng(0)
+    scenarios = [
+        {
+            "price_el": df["price_el"].values * rng.uniform(0.8, 2.0, len(df)),
+            "price_gas": df["price_gas"].values * rng.uniform(0.9, 1.1, len(df)),
+            "demand_th": df["demand_th"].values * rng.uniform(0.9, 1.1, len(df)),
+        }
+        for _ in range(args.scenarios)
+    ]
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        reused = PyPSAOptimizer(df, cfg)
+        reused.build_model()
+        reused.solve(solver_name=args.solver, export_readable=False, use_cache=False)
+        if reused.status != "ok":
+            raise RuntimeError(f"Initial solve failed ({reused.status}); choose a feasible window.")
+
+        for k, scenario in enumerate(scenarios):
+            start = time.perf_counter()
+            data = df.assign(**scenario)
+            rebuilt = PyPSAOptimizer(data, copy.deepcopy(cfg))
+            rebuilt.build_model()
+            rebuilt.solve(solver_name=args.solver, export_readable=False, use_cache=False)
+            t_rebuild = time.perf_counter() - start
+
+            start = time.perf_counter()
+            reused.update_parameters(**scenario)
+            reused.resolve(solver_name=args.solver)
+            t_reuse = time.perf_counter() - start
+
+            for path, optimizer in (("rebuild", rebuilt), ("reuse", reused)):
+                if optimizer.status != "ok":
+                    raise RuntimeError(f"Scenario {k}: {path} solve failed ({optimizer.status}).")
+
+            max_diff = np.abs(rebuilt.results.values - reused.results.values).max()
+            rows.append({
+                "scenario": k,
+                "rebuild_s": t_rebuild,
+                "reuse_s": t_reuse,
+                "speedup": t_rebuild / t_reuse,
+                "max_abs_diff": max_diff,
+            })
+
+    table = pd.DataFrame(rows).set_index("scenario")
+    print(f"PyPSA model reuse: {len(df)} snapshots, solver {args.solver}")
+    print(table.round(4))
+    print(f"Mean speedup: {table['speedup'].mean():.1f}x")
+
+
+if __name__ == "__main__":
+    main()
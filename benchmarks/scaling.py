@@ -0,0 +1,305 @@
+"""
+Benchmark: Scaling of both optimizer backends
+Builds, solves and extracts ORToolsOptimizer and PyPSAOptimizer models
+on horizons from one day to five years of the interim datasets and
+records the time of each phase, the peak memory and the model size.
+Each case runs in a fresh process, so peak memory is per case.
+
+Windows shorter than a year are taken from the summer months: the
+PyPSA model (CHP_gas_geq_Boiler_gas) is infeasible in every other month,
+so PyPSA runs only the summer windows unless --horizons is given.
+
+Results can be saved as a machine-readable baseline (JSON) and later
+runs compared against it; metrics that got worse by more than the
+threshold are flagged and the script exits with status 1. Only cases
+solved to optimality are saved.
+
+Usage (from the project root):
+    python benchmarks/scaling.py --save benchmarks/baselines/scaling.json
+    python benchmarks/scaling.py --compare benchmarks/baselines/scaling.json
+    python benchmarks/scaling.py --backends ortools --horizons 24h 1w --repeat 3
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+# Horizon name -> (interim dataset, settings.month, number of hours;
+# None = all months / all hours of the selection)
+HORIZONS = {
+    "24h": ("data/interim/data_1year_strict.csv", [7], 24),
+    "1w": ("data/interim/data_1year_strict.csv", [7], 168),
+    "1m": ("data/interim/data_1year_strict.csv", [7], None),
+    "4m": ("data/interim/data_1year_strict.csv", [6, 7, 8, 9], None),
+    "1y": ("data/interim/data_1year_strict.csv", None, None),
+    "5y": ("data/interim/data_5year_synthetic.csv", None, None),
+}
+BACKENDS = ["ortools", "pypsa"]
+
+# Default horizons per backend (PyPSA: feasible windows only)
+DEFAULT_HORIZONS = {
+    "ortools": list(HORIZONS),
+    "pypsa": ["24h", "1w", "1m", "4m"],
+}
+
+# Metrics compared against a baseline, with the default absolute change
+# below which a relative change is treated as noise
+METRICS = {
+    "build_s": 0.05,
+    "solve_s": 0.05,
+    "extract_s": 0.05,
+    "peak_mb": 20.0,
+}
+SIZE_METRICS = ["n_vars", "n_cons", "n_nonzeros"]
+
+
+def run_ortools(df: pd.DataFrame, cfg: dict, solver: str) -> dict:
+    """Build, solve and extract one OR-Tools model."""
+    from ortools.linear_solver import pywraplp
+
+    from src.models.ortools_model import ORToolsOptimizer
+
+    optimizer = ORToolsOptimizer(df, cfg)
+    start = time.perf_counter()
+    optimizer._build_model()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    status = optimizer.solver.Solve()
+    solve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if status == pywraplp.Solver.OPTIMAL:
+        optimizer._extract_results()
+    extract = time.perf_counter() - start
+
+    return {
+        "status": "optimal" if status == pywraplp.Solver.OPTIMAL else f"status {status}",
+        "build_s": build,
+        "solve_s": solve,
+        "extract_s": extract,
+        **optimizer.model_size(),
+    }
+
+
+def run_pypsa(df: pd.DataFrame, cfg: dict, solver: str) -> dict:
+    """Build, solve and extract one PyPSA model."""
+    from src.models.pypsa_model import PyPSAOptimizer
+
+    optimizer = PyPSAOptimizer(df, cfg)
+    start = time.perf_counter()
+    optimizer.build_model()
+    optimizer._create_model()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    status, condition = optimizer.network.optimize.solve_model(solver_name=solver)
+    solve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if status == "ok":
+        optimizer._extract_results()
+    extract = time.perf_counter() - start
+
+    return {
+        "status": condition,
+        "build_s": build,
+        "solve_s": solve,
+        "extract_s": extract,
+        **optimizer.model_size(),
+    }
+
+
+def run_case(backend: str, horizon: str, solver: str) -> dict:
+    """Run one case in this process and return its record."""
+    from src.utils.config import override_section
+    from src.utils.dataloader import load_config, load_data
+
+    cfg = load_config(os.path.join(ROOT, "config/model_config.yaml"))
+    cfg = override_section(cfg, "export", enabled=False)
+    cfg = override_section(cfg, "result_cache", enabled=False)
+
+    path, months, hours = HORIZONS[horizon]
+    cfg["settings"] = {**cfg["settings"], "month": months, "day": None, "hour": None}
+
+    func = run_ortools if backend == "ortools" else run_pypsa
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        df = load_data(os.path.join(ROOT, path), cfg)
+        if hours is not None:
+            df = df.iloc[:hours]
+        record = func(df, cfg, solver)
+
+    # ru_maxrss is in KiB on Linux
+    record["peak_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"backend": backend, "horizon": horizon, "hours": len(df), **record}
+
+
+def run_isolated(backend: str, horizon: str, solver: str, timeout: float) -> dict:
+    """Run one case in a fresh interpreter."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--case", backend, horizon, "--solver", solver]
+    try:
+        out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True,
+                             timeout=timeout, check=True).stdout
+        return json.loads(out.strip().splitlines()[-1])
+    except subprocess.TimeoutExpired:
+        return {"backend": backend, "horizon": horizon, "status": "timeout"}
+    except subprocess.CalledProcessError as e:
+        message = (e.stderr.strip().splitlines() or ["failed"])[-1]
+        return {"backend": backend, "horizon": horizon, "status": f"error: {message}"}
+
+
+def run_suite(backends: list, horizons: list, solver: str, repeat: int, timeout: float) -> list:
+    """
+    Run every case; times and memory are the best of the repetitions.
+
+    Args:
+        horizons: Horizons to run (None = DEFAULT_HORIZONS of each backend)
+    """
+    records = []
+    for backend in backends:
+        for horizon in horizons or DEFAULT_HORIZONS[backend]:
+            print(f"{backend} {horizon}...", flush=True)
+            runs = [run_isolated(backend, horizon, solver, timeout) for _ in range(repeat)]
+            record = runs[0]
+            for metric in METRICS:
+                values = [r[metric] for r in runs if metric in r]
+                if values:
+                    record[metric] = min(values)
+            records.append(record)
+    return records
+
+
+def git_revision() -> str:
+    """Short hash of the checked out commit, or an empty string."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(records: list, baseline: dict, threshold: float, min_delta_s: float = None) -> pd.DataFrame:
+    """
+    Compare results with a baseline.
+
+    Args:
+        records: Records of the current run
+        baseline: Loaded baseline JSON
+        threshold: Relative increase that counts as a regression
+        min_delta_s: Noise floor of the time metrics in seconds (None =
+            the METRICS defaults)
+
+    Returns:
+        DataFrame with one row per compared metric, flagged rows marked
+    """
+    base = {(r["backend"], r["horizon"]): r for r in baseline["results"]}
+    rows = []
+    for record in records:
+        old = base.get((record["backend"], record["horizon"]))
+        if old is None:
+            continue
+        if record.get("status") != old.get("status"):
+            # E.g. a timeout or error where the baseline had a solution
+            rows.append({
+                "backend": record["backend"], "horizon": record["horizon"], "metric": "status",
+                "baseline": old.get("status"), "current": record.get("status"),
+                "change_pct": None, "regression": True,
+            })
+        for metric, min_delta in METRICS.items():
+            if metric not in record or metric not in old:
+                continue
+            if min_delta_s is not None and metric.endswith("_s"):
+                min_delta = min_delta_s
+            delta = record[metric] - old[metric]
+            change = delta / old[metric] if old[metric] else 0.0
+            rows.append({
+                "backend": record["backend"], "horizon": record["horizon"], "metric": metric,
+                "baseline": old[metric], "current": record[metric], "change_pct": 100 * change,
+                "regression": change > threshold and delta > min_delta,
+            })
+        for metric in SIZE_METRICS:
+            if record.get(metric) != old.get(metric):
+                rows.append({
+                    "backend": record["backend"], "horizon": record["horizon"], "metric": metric,
+                    "baseline": old.get(metric), "current": record.get(metric),
+                    "change_pct": None, "regression": False,
+                })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--horizons", nargs="+", choices=list(HORIZONS),
+                        help="Horizons to run (default: all feasible ones per backend)")
+    parser.add_argument("--solver", default="highs", help="linopy solver name for PyPSA")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case (best is kept)")
+    parser.add_argument("--timeout", type=float, default=1800, help="Seconds per case run")
+    parser.add_argument("--save", help="Write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative increase flagged as regression (0.25 = +25%%)")
+    parser.add_argument("--min-delta-s", type=float,
+                        help="Ignore time changes smaller than this many seconds (default 0.05)")
+    parser.add_argument("--case", nargs=2, metavar=("BACKEND", "HORIZON"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(*args.case, args.solver)))
+        return
+
+    records = run_suite(args.backends, args.horizons, args.solver, args.repeat, args.timeout)
+    table = pd.DataFrame(records).set_index(["backend", "horizon"])
+    print(f"\nScaling benchmark (best of {args.repeat}, PyPSA solver {args.solver})")
+    print(table.round(3).to_string())
+
+    if args.save:
+        # Infeasible or timed-out cases measure no solve of the model
+        saved = [r for r in records if r.get("status") == "optimal"]
+        for r in records:
+            if r.get("status") != "optimal":
+                print(f"Not saved: {r['backend']} {r['horizon']} ({r.get('status')})")
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "pypsa_solver": args.solver,
+                "results": saved,
+            }, f, indent=2)
+        print(f"Baseline saved to: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparison = compare(records, baseline, args.threshold, args.min_delta_s)
+        print(f"\nComparison with {args.compare} (revision {baseline.get('revision') or '?'})")
+        if comparison.empty:
+            print("No matching cases.")
+            return
+        print(comparison.round(3).to_string(index=False))
+        regressions = comparison[comparison["regression"]]
+        if len(regressions):
+            print(f"\n{len(regressions)} regressions beyond {args.threshold:.0%}.")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
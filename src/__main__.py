@@ -0,0 +1,9 @@
+"""
+Package entry point: python -m src
+"""
+
+from .main import main
+
+
+if __name__ == "__main__":
+    main()
@@ -1,110 +1,400 @@
 ﻿"""
 Main Entry Point for Energy System Optimization
-Runs both OR-Tools and PyPSA models and compares results.
+Command line interface for loading data, solving, comparing and plotting.
+
+Usage (from the project root):
+    python -m src                          # Solve both models and compare
+    python -m src load [--process | --append]
+    python -m src solve --backend ortools [--no-plot] [--no-cache]
+    python -m src compare
+    python -m src plot --backend pypsa
+    python -m src sweep
+    python -m src --metrics results/metrics.jsonl solve   # Per-phase records
+    python -m src --telemetry results/solver_telemetry.jsonl solve   # Solver progress
+
+solve, compare and plot run a stage pipeline (load -> solve -> report ->
+compare / plots) that skips every stage whose inputs did not change
+since the last run, e.g. a new plotting.dpi only re-renders the plots.
+--force reruns all stages.
+
+python src/main.py takes the same arguments from any directory. Paths
+in the config are relative to the project root; paths given on the
+command line are relative to the current directory.
+
+Heavy libraries (PyPSA, OR-Tools, matplotlib) are imported only by the
+stages and commands that use them.
 """
 
+import argparse
 import os
 import sys
 
-# Add project root (OR_tools folder) to path BEFORE imports
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
 
-# Change working directory to project root for relative paths
-os.chdir(project_root)
+# Backends of the solve command, with their display names
+BACKENDS = {"ortools": "OR-Tools", "pypsa": "PyPSA", "merit_order": "Merit Order",
+            "cpsat": "CP-SAT"}
 
-# Now import from src (after path is set)
-from src.models.pypsa_model import PyPSAOptimizer
-from src.models.ortools_model import ORToolsOptimizer
-from src.utils.dataloader import load_config, load_data
-from src.utils.plotting import plot_network, plot_results_comparison, plot_results_timeseries, plot_energy_balance, plot_daily_profile
-from src.utils.analysis import compare_results, calculate_kpis
+# Backends solved and compared when no --backend is given
+DEFAULT_BACKENDS = ["ortools", "pypsa"]
 
+# Defaults of the "plotting" config section
+PLOT_DEFAULTS = {"dpi": 150}
 
-def main():
-    """Run the full optimization workflow."""
+# Paths in the config and the defaults below are relative to the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "config/model_config.yaml")
+DATA_PATH = os.path.join(PROJECT_ROOT, "data/interim/data_1year_strict.csv")
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
 
-    print("ENERGY SYSTEM OPTIMIZATION")
+# Command line options that take a path, resolved against the working directory
+PATH_ARGS = ("config", "data", "metrics", "telemetry")
 
-    # 1. Load Configuration
-    try:
-        cfg = load_config()
-        print("Configuration loaded")
-    except FileNotFoundError:
-        print("Error: config/model_config.yaml not found.")
-        return
 
-    # 2. Load Data
-    try:
-        df = load_data("data/interim/data_1year_strict.csv", cfg)
-        print("Data loaded")
-    except Exception as e:
-        print(f"Data Load Error: {e}")
-        return
+# --- Pipeline stages -------------------------------------------------------
 
-    # Create results folder
-    os.makedirs("results", exist_ok=True)
+def load_stage(filepath: str, cfg: dict):
+    """Load and filter the input data."""
+    from src.utils.dataloader import load_data
 
-    # 3. Run OR-Tools Optimization
-    print("Running OR-Tools Model...")
+    return load_data(filepath, cfg)
 
-    try:
-        optimizer_ortools = ORToolsOptimizer(df, cfg)
-        results_ortools = optimizer_ortools.optimize()
-
-        if results_ortools is not None:
-            results_ortools["heat_demand"] = df["demand_th"]
-            results_ortools["electricity_price"] = df["price_el"]
-            results_ortools["gas_price"] = df["price_gas"]
-            results_ortools.round(3).to_csv("results/ortools_results.csv")
-            print("OR-Tools results saved to: results/ortools_results.csv")
-            calculate_kpis(results_ortools, cfg)
-            plot_results_timeseries(results_ortools, "OR-Tools", save_path="results/ortools_timeseries.png")
-            plot_energy_balance(results_ortools, save_path="results/ortools_energy_balance.png")
-
-    except Exception as e:
-        print(f"OR-Tools Error: {e}")
-        import traceback
-        traceback.print_exc()
-        results_ortools = None
-
-    # 4. Run PyPSA Optimization
-    print("Running PyPSA Model...")
 
-    try:
-        optimizer_pypsa = PyPSAOptimizer(df, cfg)
-        optimizer_pypsa.build_model()
-        plot_network(optimizer_pypsa.network, save_path="results/network_diagram.png")
+def solve_stage(data, backend: str, cfg: dict):
+    """
+    Build and solve one backend (runs inside a worker process).
+
+    Args:
+        data: Filtered input DataFrame
+        backend: Key of BACKENDS
+        cfg: Configuration dictionary
+
+    Returns:
+        Results DataFrame
+    """
+    print(f"Running {BACKENDS[backend]} Model...")
+
+    if backend == "ortools":
+        if cfg.get("rolling_horizon", {}).get("enabled", False):
+            from src.models.rolling_horizon import RollingHorizonOptimizer
+
+            results = RollingHorizonOptimizer(data, cfg).optimize()
+        else:
+            from src.models.ortools_model import ORToolsOptimizer
+
+            results = ORToolsOptimizer(data, cfg).optimize()
+    elif backend == "merit_order":
+        from src.models.dispatch import MeritOrderDispatch
+
+        results = MeritOrderDispatch(data, cfg).optimize()
+    elif backend == "cpsat":
+        from src.models.cpsat_model import CPSATOptimizer
+
+        results = CPSATOptimizer(data, cfg).optimize()
+    else:
+        from src.models.pypsa_model import PyPSAOptimizer
+
+        optimizer = PyPSAOptimizer(data, cfg)
+        optimizer.build_model()
         solver_name = cfg["settings"].get("solver", "scip").lower()
-        optimizer_pypsa.solve(solver_name=solver_name)
-        results_pypsa = optimizer_pypsa.get_results()
-
-        if results_pypsa is not None:
-            results_pypsa["heat_demand"] = df["demand_th"]
-            results_pypsa["electricity_price"] = df["price_el"]
-            results_pypsa["gas_price"] = df["price_gas"]
-            results_pypsa.round(3).to_csv("results/pypsa_results.csv")
-            print("PyPSA results saved to: results/pypsa_results.csv")
-            calculate_kpis(results_pypsa, cfg)
-            plot_results_timeseries(results_pypsa, "PyPSA", save_path="results/pypsa_timeseries.png")
-            plot_energy_balance(results_pypsa, save_path="results/pypsa_energy_balance.png")
-    except Exception as e:
-        print(f"PyPSA Error: {e}")
-        import traceback
-        traceback.print_exc()
-        results_pypsa = None
-
-    # 5. Compare Results
-    if results_ortools is not None and results_pypsa is not None:
-        print("Comparing Models...")
-        comparison = compare_results(results_ortools, results_pypsa)
-        comparison.to_csv("results/model_comparison.csv")
-        print("Comparison saved to: results/model_comparison.csv")
-        plot_results_comparison(results_ortools, results_pypsa, save_path="results/comparison_plot.png")
+        optimizer.solve(solver_name=solver_name)
+        if optimizer.status != "ok":
+            # linopy still fills the results (NaN objective, zero flows)
+            raise RuntimeError(f"PyPSA solve failed (status {optimizer.status}).")
+        results = optimizer.get_results()
+
+    if results is None:
+        raise RuntimeError("No optimal solution found.")
+    return results
+
+
+def report_stage(data, results, backend: str, cfg: dict):
+    """Add the inputs to the results, save them and print the KPIs."""
+    from src.utils.analysis import calculate_kpis
+
+    results = results.copy()
+    results["heat_demand"] = data["demand_th"]
+    results["electricity_price"] = data["price_el"]
+    results["gas_price"] = data["price_gas"]
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    results.round(3).to_csv(results_path(backend))
+    print(f"{BACKENDS[backend]} results saved to: {results_path(backend)}")
+    calculate_kpis(results, cfg)
+    return results
+
+
+def timeseries_plot_stage(results, backend: str, dpi: int) -> None:
+    """Plot the time series of one backend."""
+    from src.utils.plotting import plot_results_timeseries
+
+    plot_results_timeseries(results, BACKENDS[backend],
+                            save_path=f"{RESULTS_DIR}/{backend}_timeseries.png", dpi=dpi)
+
+
+def balance_plot_stage(results, backend: str, dpi: int) -> None:
+    """Plot the energy balance of one backend."""
+    from src.utils.plotting import plot_energy_balance
+
+    plot_energy_balance(results, save_path=f"{RESULTS_DIR}/{backend}_energy_balance.png", dpi=dpi)
+
+
+def network_stage(data, cfg: dict) -> dict:
+    """Build the PyPSA network and return its topology (runs inside a worker process)."""
+    from src.models.pypsa_model import PyPSAOptimizer
+
+    optimizer = PyPSAOptimizer(data, cfg)
+    optimizer.build_model()
+    n = optimizer.network
+    columns = {"generators": ["bus"], "loads": ["bus"],
+               "links": [c for c in ("bus0", "bus1", "bus2") if c in n.links.columns]}
+    topology = {"buses": list(n.buses.index)}
+    for component, cols in columns.items():
+        topology[component] = n.static(component)[cols].to_dict(orient="index")
+    return topology
+
+
+def network_plot_stage(topology: dict, dpi: int) -> None:
+    """Draw the network diagram from the stored topology (no PyPSA import)."""
+    import types
+
+    import pandas as pd
+
+    from src.utils.plotting import plot_network
+
+    network = types.SimpleNamespace(
+        buses=pd.DataFrame(index=topology["buses"]),
+        **{component: pd.DataFrame.from_dict(rows, orient="index")
+           for component, rows in topology.items() if component != "buses"},
+    )
+    plot_network(network, save_path=f"{RESULTS_DIR}/network_diagram.png", dpi=dpi)
+
+
+def compare_stage(results_ortools, results_pypsa) -> None:
+    """Compare the OR-Tools and PyPSA results and save the comparison."""
+    from src.utils.analysis import compare_results
+
+    print("Comparing Models...")
+    comparison = compare_results(results_ortools, results_pypsa)
+    comparison.to_csv(f"{RESULTS_DIR}/model_comparison.csv")
+    print(f"Comparison saved to: {RESULTS_DIR}/model_comparison.csv")
+
+
+def comparison_plot_stage(results_ortools, results_pypsa, dpi: int) -> None:
+    """Plot the OR-Tools and PyPSA results on top of each other."""
+    from src.utils.plotting import plot_results_comparison
 
+    plot_results_comparison(results_ortools, results_pypsa,
+                            save_path=f"{RESULTS_DIR}/comparison_plot.png", dpi=dpi)
+
+
+def results_path(backend: str) -> str:
+    """Path of the results CSV of a backend."""
+    return f"{RESULTS_DIR}/{backend}_results.csv"
+
+
+def model_key(cfg: dict, backend: str) -> dict:
+    """Config values a backend's results depend on."""
+    from src.utils.telemetry import early_stop_rules
+
+    key = {section: cfg.get(section) for section in ("chp", "boiler", "economics")}
+    key["co2_price"] = cfg["data"]["co2_price"]
+    key["solver"] = cfg["settings"].get("solver")
+    key["early_stop"] = early_stop_rules(cfg)
+    key["solver_options"] = cfg.get("solver_options")
+    if backend in ("ortools", "pypsa"):
+        key["commitment"] = cfg.get("commitment")
+    if backend == "ortools":
+        key["rolling_horizon"] = cfg.get("rolling_horizon")
+    if backend == "cpsat":
+        key["cpsat"] = cfg.get("cpsat")
+    return key
+
+
+def build_pipeline(args, cfg: dict):
+    """Create the stage pipeline for all backends."""
+    from src.utils.cache import file_hash
+    from src.utils.config import config_section
+    from src.utils.pipeline import Pipeline, Stage
+
+    plotting = config_section(cfg, "plotting", PLOT_DEFAULTS)
+    dpi = plotting["dpi"]
+    settings = cfg["settings"]
+    stages = [
+        Stage("load", load_stage, kwargs={"filepath": args.data, "cfg": cfg},
+              key={"file": file_hash(args.data),
+                   "filters": [settings.get(k) for k in ("month", "day", "hour")]}),
+        Stage("network", network_stage, inputs=["load"], kwargs={"cfg": cfg},
+              key=model_key(cfg, "pypsa"), process=True),
+        Stage("plot_network", network_plot_stage, inputs=["network"],
+              kwargs={"dpi": dpi}, key=plotting, outputs=[f"{RESULTS_DIR}/network_diagram.png"]),
+        Stage("compare", compare_stage, inputs=["report_ortools", "report_pypsa"],
+              outputs=[f"{RESULTS_DIR}/model_comparison.csv"]),
+        Stage("plot_comparison", comparison_plot_stage, inputs=["report_ortools", "report_pypsa"],
+              kwargs={"dpi": dpi}, key=plotting, outputs=[f"{RESULTS_DIR}/comparison_plot.png"]),
+    ]
+    for backend in BACKENDS:
+        stages += [
+            Stage(f"solve_{backend}", solve_stage, inputs=["load"],
+                  kwargs={"backend": backend, "cfg": cfg}, key=model_key(cfg, backend),
+                  process=True),
+            Stage(f"report_{backend}", report_stage, inputs=["load", f"solve_{backend}"],
+                  kwargs={"backend": backend, "cfg": cfg}, key=backend,
+                  outputs=[results_path(backend)]),
+            Stage(f"plot_timeseries_{backend}", timeseries_plot_stage, inputs=[f"report_{backend}"],
+                  kwargs={"backend": backend, "dpi": dpi}, key=[backend, plotting],
+                  outputs=[f"{RESULTS_DIR}/{backend}_timeseries.png"]),
+            Stage(f"plot_balance_{backend}", balance_plot_stage, inputs=[f"report_{backend}"],
+                  kwargs={"backend": backend, "dpi": dpi}, key=[backend, plotting],
+                  outputs=[f"{RESULTS_DIR}/{backend}_energy_balance.png"]),
+        ]
+    return Pipeline(cfg, stages)
+
+
+def plot_targets(backends: list) -> list:
+    """Plot stages of the given backends."""
+    targets = []
+    for backend in backends:
+        targets += [f"plot_timeseries_{backend}", f"plot_balance_{backend}"]
+    if "pypsa" in backends:
+        targets.append("plot_network")
+    if "ortools" in backends and "pypsa" in backends:
+        targets.append("plot_comparison")
+    return targets
+
+
+def run_pipeline(args, cfg: dict, targets: list) -> None:
+    """Bring the target stages up to date."""
+    from src.utils.parallel import execution_settings
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    concurrent = execution_settings(cfg)["backends_concurrent"]
+    status = build_pipeline(args, cfg).run(
+        targets, force=args.force, workers=None if concurrent else 0)
+    for name, state in status.items():
+        if state in ("failed", "blocked"):
+            print(f"  {name}: {state}")
+
+
+# --- Commands ----------------------------------------------------------------
+
+def cmd_load(args, cfg: dict) -> None:
+    """Process the raw data (optional) and summarize the selected window."""
+    from src.utils.dataloader import append_price_data, load_data, process_energy_data
+
+    if args.process or args.append:
+        (append_price_data if args.append else process_energy_data)(cfg)
+
+    df = load_data(args.data, cfg)
+    print(f"Data loaded: {len(df)} rows", end="")
+    if len(df):
+        print(f" from {df.index[0]} to {df.index[-1]}", end="")
+    print()
+    print(df.describe().T.round(2))
+
+
+def cmd_solve(args, cfg: dict) -> None:
+    """Solve the selected backends and compare OR-Tools and PyPSA."""
+    backends = list(dict.fromkeys(args.backend))
+    targets = [f"report_{backend}" for backend in backends]
+    if "ortools" in backends and "pypsa" in backends:
+        targets.append("compare")
+    if not args.no_plot:
+        targets += plot_targets(backends)
+    run_pipeline(args, cfg, targets)
+
+
+def cmd_compare(args, cfg: dict) -> None:
+    """Compare the OR-Tools and PyPSA results."""
+    targets = ["compare"] if args.no_plot else ["compare", "plot_comparison"]
+    run_pipeline(args, cfg, targets)
+
+
+def cmd_plot(args, cfg: dict) -> None:
+    """Plot the results of the selected backends."""
+    run_pipeline(args, cfg, plot_targets(list(dict.fromkeys(args.backend))))
+
+
+def cmd_sweep(args, cfg: dict) -> None:
+    """Run the scenario sweep from the "sweep" config section."""
+    from src.utils.dataloader import load_data
+    from src.utils.scenarios import run_sweep
+
+    run_sweep(load_data(args.data, cfg), cfg)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser with all subcommands."""
+    parser = argparse.ArgumentParser(prog="python -m src", description="Energy system optimization")
+    parser.add_argument("--config", default=CONFIG_PATH, help="Configuration file")
+    parser.add_argument("--data", default=DATA_PATH, help="Input data CSV")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read or write cached results (implies --force)")
+    parser.add_argument("--force", action="store_true", help="Rerun all pipeline stages")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="Append per-phase timing/size records to this JSON Lines file")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="Append solver progress records (incumbent, bound, gap) to this JSON Lines file")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Log level (DEBUG shows per-hour diagnostics)")
+    parser.set_defaults(func=cmd_solve, backend=DEFAULT_BACKENDS, no_plot=False)
+    commands = parser.add_subparsers(title="commands")
+
+    load = commands.add_parser("load", help="Load (and optionally rebuild) the input data")
+    group = load.add_mutually_exclusive_group()
+    group.add_argument("--process", action="store_true", help="Rebuild the processed datasets")
+    group.add_argument("--append", action="store_true", help="Append new raw price rows")
+    load.set_defaults(func=cmd_load)
+
+    solve = commands.add_parser("solve", help="Solve one or more backends (default: run all and compare)")
+    solve.add_argument("--backend", nargs="+", choices=list(BACKENDS), default=DEFAULT_BACKENDS)
+    solve.add_argument("--no-plot", action="store_true", help="Skip all plots")
+    solve.set_defaults(func=cmd_solve)
+
+    comp = commands.add_parser("compare", help="Compare the OR-Tools and PyPSA results")
+    comp.add_argument("--no-plot", action="store_true", help="Skip the comparison plot")
+    comp.set_defaults(func=cmd_compare)
+
+    plot = commands.add_parser("plot", help="Plot the results")
+    plot.add_argument("--backend", nargs="+", choices=list(BACKENDS), default=DEFAULT_BACKENDS)
+    plot.set_defaults(func=cmd_plot)
+
+    sweep = commands.add_parser("sweep", help="Run the scenario sweep")
+    sweep.set_defaults(func=cmd_sweep)
+    return parser
+
+
+def main(argv: list = None) -> None:
+    """Run the command given on the command line."""
+    args = build_parser().parse_args(argv)
+    # Paths given on the command line are relative to the caller's directory,
+    # the paths in the config to the project root
+    for name in PATH_ARGS:
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    os.chdir(PROJECT_ROOT)
+    from src.utils.config import override_section
+    from src.utils.dataloader import load_config
+    from src.utils.instrumentation import configure
+
+    try:
+        cfg = load_config(args.config)
+    except FileNotFoundError:
+        print(f"Error: {args.config} not found.")
+        return
+    if args.no_cache:
+        cfg = override_section(cfg, "result_cache", enabled=False)
+        args.force = True
+    if args.telemetry:
+        cfg = override_section(cfg, "telemetry", enabled=True, path=args.telemetry)
+    configure(cfg, path=args.metrics, log_level=args.log_level)
+
+    print("ENERGY SYSTEM OPTIMIZATION")
+    args.func(args, cfg)
     print("OPTIMIZATION COMPLETE")
 
 
 if __name__ == "__main__":
-    main()
+    # Run as a script (python src/main.py): same as python -m src
+    sys.path.insert(0, PROJECT_ROOT)
+    from src.main import main as package_main
+
+    package_main()
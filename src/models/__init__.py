@@ -1,3 +1,19 @@
-# Model classes
-from .pypsa_model import PyPSAOptimizer
-from .ortools_model import ORToolsOptimizer
+# Model classes, imported on first access so that e.g. the OR-Tools
+# backend can be used without loading PyPSA
+import importlib
+
+_EXPORTS = {
+    "PyPSAOptimizer": ".pypsa_model",
+    "ORToolsOptimizer": ".ortools_model",
+    "CPSATOptimizer": ".cpsat_model",
+    "MeritOrderDispatch": ".dispatch",
+    "RollingHorizonOptimizer": ".rolling_horizon",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,329 @@
+"""
+CP-SAT based Energy System Optimizer
+CHP + Boiler unit commitment on integer-scaled gas flows
+"""
+
+from ortools.sat.python import cp_model
+import pandas as pd
+import numpy as np
+import math
+import os
+import time
+
+from .dispatch import _hourly_options, heuristic_dispatch, objective_coefficients
+from ..utils import instrumentation
+from ..utils.cache import RESULT_CACHE_VERSION, fingerprint, lookup_result, save_result
+from ..utils.config import config_section
+from ..utils.instrumentation import phase
+from ..utils.solver_options import active_options, solver_options, stop_gap, stop_time
+from ..utils.telemetry import SolveMonitor, early_stop_rules, relative_gap, telemetry_settings
+
+
+# Defaults of the "cpsat" config section; workers and the time limit
+# come from "solver_options" (threads, time_limit_s) like for every backend
+CPSAT_DEFAULTS = {
+    "resolution": 0.001,  # MWh of CHP gas per integer step
+}
+
+# Former "cpsat" settings and the "solver_options" entries replacing them
+MOVED_SETTINGS = {"workers": "threads", "time_limit_s": "time_limit_s"}
+
+
+def cpsat_settings(cfg: dict) -> dict:
+    """Return the "cpsat" config section merged with the defaults."""
+    settings = config_section(cfg, "cpsat", CPSAT_DEFAULTS)
+    for key, option in MOVED_SETTINGS.items():
+        if key in settings:
+            raise KeyError(f"cpsat.{key} is now solver_options.{option}.")
+    return settings
+
+
+class _ProgressCallback(cp_model.CpSolverSolutionCallback):
+    """Reports every new CP-SAT solution to a SolveMonitor."""
+
+    def __init__(self, monitor: SolveMonitor, offset: float):
+        super().__init__()
+        self.monitor = monitor
+        self.offset = offset
+
+    def on_solution_callback(self) -> None:
+        reason = self.monitor.update(
+            incumbent=self.objective_value + self.offset,
+            bound=self.best_objective_bound + self.offset,
+            nodes=self.num_branches,
+        )
+        if reason is not None:
+            self.stop_search()
+
+
+class CPSATOptimizer:
+    """CP-SAT optimizer for CHP + Boiler energy system."""
+
+    def __init__(self, data: pd.DataFrame, config: dict, initial_status: int = 0):
+        self.data = data
+        self.cfg = config
+        self.initial_status = initial_status
+        self.model = None
+        self.solver = None
+        self.results = None
+        self.objective_value = None
+
+        self.c_chp = config["chp"]
+        self.c_boiler = config["boiler"]
+        self.startup_cost = self.c_chp.get("startup_cost", 0.0)
+        self.settings = cpsat_settings(config)
+        self.timings = {}
+        self.from_cache = False
+        self.stop_reason = None
+        self.discretization = None
+
+    def optimize(self, use_cache: bool = True) -> pd.DataFrame:
+        """
+        Run the full optimization workflow.
+
+        Args:
+            use_cache: Return cached results for unchanged inputs (see the
+                "result_cache" config); False always builds and solves
+
+        Returns:
+            Results DataFrame, or None if no solution was found
+        """
+        key = self._cache_key() if use_cache else None
+        cached = lookup_result(self.cfg, "cpsat", key, self.data.index)
+        if cached is not None:
+            self.results, extra = cached
+            self.objective_value = extra["objective_value"]
+            self.discretization = extra.get("discretization")
+            self.from_cache = True
+            print(f"CP-SAT results loaded from cache. Profit: {self.objective_value:,.2f} EUR")
+            return self.results
+
+        with phase("cpsat", "build", steps=len(self.data),
+                   resolution=self.settings["resolution"]) as record:
+            self._build_model()
+            if instrumentation.enabled():
+                record.update(self.model_size())
+        self.timings["build"] = record["wall_s"]
+
+        start = time.perf_counter()
+        self._solve()
+        self.timings["solve"] = time.perf_counter() - start
+
+        if self.results is not None:
+            save_result(self.cfg, "cpsat", key, self.results,
+                        {"objective_value": self.objective_value,
+                         "discretization": self.discretization})
+        return self.results
+
+    def _cache_key(self) -> str:
+        """Fingerprint of everything the solved results depend on."""
+        return fingerprint(
+            "cpsat",
+            RESULT_CACHE_VERSION,
+            self.data,
+            {section: self.cfg[section] for section in ("chp", "boiler", "economics")},
+            self.cfg["data"]["co2_price"],
+            self.settings["resolution"],
+            self.initial_status,
+            early_stop_rules(self.cfg),
+            active_options(solver_options(self.cfg, len(self.data))),
+        )
+
+    def _build_model(self) -> None:
+        """
+        Build the CP-SAT model.
+
+        CP-SAT needs integer variables, so the CHP gas input of every hour
+        is a count of resolution-sized steps. The boiler is no variable:
+        it covers the residual heat, so its cost is folded into the CHP
+        objective coefficient (as in merit_order_dispatch). The CHP heat
+        limit (at most the demand) and the boiler capacity become bounds
+        on the step count, rounded inwards, so every solution is feasible
+        in the continuous model. The heuristic dispatch, rounded to the
+        grid, is passed as hint so the portfolio starts from a good
+        incumbent.
+        """
+        T = len(self.data)
+        r = self.settings["resolution"]
+        coeff_chp, coeff_boiler = objective_coefficients(self.data, self.cfg)
+        demand = self.data["demand_th"].values
+
+        # Profit with the boiler covering the rest: base + slope * chp_gas
+        self.hourly = _hourly_options(coeff_chp, coeff_boiler, demand, self.c_chp, self.c_boiler)
+        self.base = self.hourly["base"]
+        self.slope = self.hourly["slope"]
+
+        # Gas ranges in steps: min load when on, heat limit and boiler capacity.
+        # Hours the boiler cannot cover alone must run the CHP in its range.
+        n_min = math.ceil(self.c_chp["p_gas_min"] / r - 1e-9)
+        n_hi = np.floor(self.hourly["hi"] / r + 1e-9).astype(int)
+        n_lo = np.where(self.hourly["off_ok"], 0,
+                        np.ceil(self.hourly["lo"] / r - 1e-9)).astype(int)
+        infeasible = n_lo > n_hi
+        if infeasible.any():
+            raise ValueError(
+                f"Heat demand cannot be met on the {r} MWh grid in {int(infeasible.sum())} "
+                f"hours (first at position {int(np.argmax(infeasible))}).")
+
+        model = cp_model.CpModel()
+        self.v_chp_gas = [model.new_int_var(int(n_lo[t]), int(n_hi[t]), f"chp_gas_{t}")
+                          for t in range(T)]
+        self.v_chp_status = [model.new_bool_var(f"chp_on_{t}") for t in range(T)]
+        for t in range(T):
+            # CHP min/max load (linked to status)
+            model.add(self.v_chp_gas[t] <= int(n_hi[t]) * self.v_chp_status[t])
+            model.add(self.v_chp_gas[t] >= n_min * self.v_chp_status[t])
+
+        # Start-up detection: start_t >= on_t - on_(t-1)
+        self.v_chp_start = []
+        if self.startup_cost:
+            for t in range(T):
+                v_start = model.new_bool_var(f"chp_start_{t}")
+                prev = self.v_chp_status[t - 1] if t > 0 else int(self.initial_status)
+                model.add(v_start >= self.v_chp_status[t] - prev)
+                self.v_chp_start.append(v_start)
+
+        # Hint: heuristic dispatch, gas rounded into the feasible step range
+        hint = heuristic_dispatch(coeff_chp, coeff_boiler, demand, self.c_chp, self.c_boiler,
+                                  self.startup_cost, self.initial_status)
+        hint_on = hint["chp_status"] > 0.5
+        hint_gas = np.where(hint_on, np.clip(np.round(hint["chp_gas"] / r), n_min, n_hi), 0)
+        hint_gas = np.clip(hint_gas, n_lo, n_hi)
+        for t in range(T):
+            model.add_hint(self.v_chp_gas[t], int(hint_gas[t]))
+            model.add_hint(self.v_chp_status[t], bool(hint_on[t]))
+        for v, x in zip(self.v_chp_start, hint["chp_start"]):
+            model.add_hint(v, bool(x > 0.5))
+
+        model.maximize(
+            sum(float(s * r) * v for s, v in zip(self.slope, self.v_chp_gas))
+            - self.startup_cost * sum(self.v_chp_start)
+        )
+        self.model = model
+        print(f"CP-SAT model built: {T} time steps, {r} MWh resolution.")
+
+    def _solve(self) -> None:
+        """Solve with the parallel portfolio and extract the results."""
+        self.solver = cp_model.CpSolver()
+        params = self.solver.parameters
+        options = solver_options(self.cfg, len(self.data))
+        self._apply_options(params, options)
+
+        telemetry = telemetry_settings(self.cfg)
+        callback = None
+        if telemetry["enabled"]:
+            monitor = SolveMonitor("cpsat", telemetry, sense="max", solver="CP-SAT",
+                                   steps=len(self.data))
+            if telemetry["gap"] is not None:
+                params.relative_gap_limit = stop_gap(telemetry["gap"], options["mip_rel_gap"])
+            limit = stop_time(telemetry["time_limit_s"], options["time_limit_s"])
+            if limit is not None:
+                params.max_time_in_seconds = limit
+            callback = _ProgressCallback(monitor, float(self.base.sum()))
+
+        print(f"Solving with CP-SAT ({params.num_workers or os.cpu_count()} workers)...")
+        if active_options(options):
+            print(f"Solver options: {active_options(options)}")
+        self.stop_reason = None
+        with phase("cpsat", "solve", solver="CP-SAT", workers=params.num_workers) as record:
+            status = self.solver.solve(self.model, callback)
+            record["status"] = self.solver.status_name(status).lower()
+        if callback is not None:
+            self.stop_reason = callback.monitor.stop_reason
+            callback.monitor.finish(self.solver.status_name(status).lower())
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            print("No optimal solution found.")
+            return
+        with phase("cpsat", "extract"):
+            self._extract_results(status)
+
+    @staticmethod
+    def _apply_options(params, options: dict) -> None:
+        """
+        Apply the "solver_options" config to the CP-SAT parameters.
+
+        Threads set the number of search workers (None = all cores).
+        CP-SAT has no emphasis setting.
+        """
+        if options["time_limit_s"] is not None:
+            params.max_time_in_seconds = float(options["time_limit_s"])
+        if options["threads"] is not None:
+            params.num_workers = int(options["threads"])
+        if options["seed"] is not None:
+            params.random_seed = int(options["seed"])
+        if options["mip_rel_gap"] is not None:
+            params.relative_gap_limit = float(options["mip_rel_gap"])
+        if options["mip_abs_gap"] is not None:
+            params.absolute_gap_limit = float(options["mip_abs_gap"])
+        if options["presolve"] is not None:
+            params.cp_model_presolve = bool(options["presolve"])
+        if options["emphasis"] is not None:
+            print("Solver emphasis is not supported by CP-SAT; ignored.")
+
+    def _extract_results(self, status: int) -> None:
+        """
+        Map the integer solution back into the results DataFrame.
+
+        Once the CHP status is fixed the hours are independent, so the gas
+        flows are set to their continuous optimum for that status (the
+        best end of the feasible CHP range). The difference to the
+        objective on the grid is the error the discretization introduced.
+        """
+        r = self.settings["resolution"]
+        eta_chp = self.c_chp["eta_th"]
+        eta_boiler = self.c_boiler["eta_th"]
+        demand = self.data["demand_th"].values
+
+        status_on = np.array([self.solver.value(v) for v in self.v_chp_status], dtype=float)
+        on = status_on > 0.5
+        chp_gas = np.where(on, self.hourly["g_on"], 0.0)
+        boiler_gas = np.maximum(demand - chp_gas * eta_chp, 0.0) / eta_boiler
+        starts = np.diff(status_on, prepend=float(self.initial_status)).clip(min=0.0)
+
+        offset = float(self.base.sum())
+        discrete = self.solver.objective_value + offset
+        self.objective_value = float(
+            offset + self.slope @ chp_gas - self.startup_cost * starts.sum())
+        self.discretization = {
+            "resolution": r,
+            "discrete_objective": discrete,
+            "error": self.objective_value - discrete,
+            # Rounding one hour's gas to the grid costs at most one step
+            "scaling_error_bound": float(r * np.abs(self.slope).sum()),
+            "gap": relative_gap(discrete, self.solver.best_objective_bound + offset),
+        }
+        label = "Optimal" if status == cp_model.OPTIMAL else "Feasible"
+        print(f"{label}. Profit: {self.objective_value:,.2f} EUR "
+              f"(grid objective {discrete:,.2f} EUR, discretization error "
+              f"{self.discretization['error']:,.2f} EUR, scaling error bound "
+              f"{self.discretization['scaling_error_bound']:,.2f} EUR)")
+
+        self.results = pd.DataFrame(
+            {
+                "chp_gas_in": chp_gas,
+                "chp_el_out": chp_gas * self.c_chp["eta_el"],
+                "chp_heat_out": chp_gas * eta_chp,
+                "chp_status": status_on,
+                "boiler_gas_in": boiler_gas,
+                "boiler_heat_out": boiler_gas * eta_boiler,
+            },
+            index=self.data.index,
+        )
+
+        # Print summary
+        print("\n--- CP-SAT Results Summary ---")
+        print(self.results.sum())
+
+    def model_size(self) -> dict:
+        """Return the number of variables, constraints and nonzeros of the built model."""
+        proto = self.model.proto
+        return {
+            "n_vars": len(proto.variables),
+            "n_cons": len(proto.constraints),
+            "n_nonzeros": sum(len(c.linear.vars) for c in proto.constraints),
+        }
+
+    def get_results(self) -> pd.DataFrame:
+        """Return the results DataFrame."""
+        return self.results
@@ -0,0 +1,474 @@
+"""
+Closed-form Merit-Order Dispatch
+MILP-free fast path for the CHP + Boiler model
+"""
+
+import pandas as pd
+import numpy as np
+
+from ..utils.config import config_section
+
+
+# Defaults of the "commitment" config section
+COMMITMENT_DEFAULTS = {
+    "mode": "milp",  # milp, relaxed or auto
+    "relax_above_hours": 26280,  # auto: relax horizons longer than this (3 years)
+    "lp_solver": "CLP",  # OR-Tools solver of the relaxation (CLP, GLOP, PDLP)
+    "pypsa_lp_solver": "highs",  # linopy solver of the relaxation
+}
+
+
+def commitment_settings(cfg: dict) -> dict:
+    """Return the "commitment" config section merged with the defaults."""
+    return config_section(cfg, "commitment", COMMITMENT_DEFAULTS)
+
+
+def commitment_mode(cfg: dict, steps: int) -> str:
+    """
+    Whether a horizon is solved as MILP or as relaxed commitment.
+
+    Args:
+        cfg: Configuration dictionary (uses the "commitment" section)
+        steps: Number of time steps of the horizon
+
+    Returns:
+        "milp" or "relaxed"
+    """
+    settings = commitment_settings(cfg)
+    mode = settings["mode"]
+    if mode == "auto":
+        return "relaxed" if steps > settings["relax_above_hours"] else "milp"
+    if mode not in ("milp", "relaxed"):
+        raise ValueError(f"Unknown commitment mode: {mode}")
+    return mode
+
+
+def objective_coefficients(data: pd.DataFrame, cfg: dict) -> tuple:
+    """
+    Per-hour objective coefficients of CHP and boiler gas input.
+
+    Args:
+        data: DataFrame with price_el and price_gas columns
+        cfg: Configuration dictionary
+
+    Returns:
+        Tuple of (CHP coefficients, boiler coefficients) in EUR/MWh_gas
+    """
+    # Economics: Gas cost + CO2 tax
+    gas_cost_total = data["price_gas"].values + (
+        cfg["data"]["co2_price"] * cfg["economics"]["co2_intensity_gas"]
+    )
+    price_el = data["price_el"].values
+
+    coeff_chp = (
+        (price_el * cfg["chp"]["eta_el"])
+        - gas_cost_total
+        - cfg["chp"]["marginal_cost"]
+    )
+    coeff_boiler = -gas_cost_total - cfg["boiler"]["marginal_cost"]
+    return coeff_chp, coeff_boiler
+
+
+def evaluate_objective(
+    results: pd.DataFrame,
+    data: pd.DataFrame,
+    cfg: dict,
+    initial_status: int = 0,
+) -> float:
+    """
+    Evaluate the MILP objective of a dispatch schedule.
+
+    Args:
+        results: Results DataFrame with chp_gas_in and boiler_gas_in
+            (and optionally chp_status) columns
+        data: Input DataFrame the schedule was computed for
+        cfg: Configuration dictionary
+        initial_status: CHP status before the first hour
+
+    Returns:
+        Profit in EUR, including start-up costs if configured
+    """
+    coeff_chp, coeff_boiler = objective_coefficients(data, cfg)
+    profit = (
+        coeff_chp @ results["chp_gas_in"].values
+        + coeff_boiler @ results["boiler_gas_in"].values
+    )
+
+    startup_cost = cfg["chp"].get("startup_cost", 0.0)
+    if startup_cost:
+        if "chp_status" in results.columns:
+            status = np.round(results["chp_status"].values)
+        else:
+            status = (results["chp_gas_in"].values > 1e-6).astype(float)
+        starts = np.diff(status, prepend=initial_status).clip(min=0).sum()
+        profit -= startup_cost * starts
+    return float(profit)
+
+
+def _hourly_options(
+    coeff_chp: np.ndarray,
+    coeff_boiler: np.ndarray,
+    demand: np.ndarray,
+    c_chp: dict,
+    c_boiler: dict,
+) -> dict:
+    """
+    Feasible CHP choices of every hour and their profit.
+
+    Once the boiler covers the residual heat, profit is linear in the CHP
+    gas input, so the best "on" point is one end of the feasible CHP range.
+
+    Returns:
+        Dictionary with base (profit with the CHP off), slope (profit per
+        MWh of CHP gas), lo/hi (feasible CHP gas range when on), g_on
+        (best CHP gas when on), off_ok and on_ok arrays
+    """
+    eta_chp = c_chp["eta_th"]
+    eta_boiler = c_boiler["eta_th"]
+    boiler_heat_max = c_boiler["p_gas_max"] * eta_boiler
+
+    # Profit with the boiler covering the rest: base + slope * chp_gas
+    base = coeff_boiler * demand / eta_boiler
+    slope = coeff_chp - coeff_boiler * eta_chp / eta_boiler
+
+    # CHP on: gas range limited by min/max load, demand and boiler capacity
+    lo = np.maximum(c_chp["p_gas_min"], (demand - boiler_heat_max) / eta_chp)
+    hi = np.minimum(c_chp["p_gas_max"], demand / eta_chp)
+    return {
+        "base": base,
+        "slope": slope,
+        "lo": lo,
+        "hi": hi,
+        "g_on": np.where(slope > 0, hi, lo),
+        # CHP off: boiler alone must cover the demand
+        "off_ok": demand <= boiler_heat_max,
+        "on_ok": lo <= hi,
+    }
+
+
+def merit_order_dispatch(
+    coeff_chp: np.ndarray,
+    coeff_boiler: np.ndarray,
+    demand: np.ndarray,
+    c_chp: dict,
+    c_boiler: dict,
+) -> dict:
+    """
+    Solve every hour of the CHP + Boiler model at once.
+
+    Without intertemporal constraints each hour is independent. Once the
+    boiler covers the residual heat, profit is linear in the CHP gas input,
+    so the best "on" point is one end of the feasible CHP range and only
+    "off" and that end point need to be compared.
+
+    Args:
+        coeff_chp: Objective coefficient of CHP gas input per hour
+        coeff_boiler: Objective coefficient of boiler gas input per hour
+        demand: Heat demand per hour (MWh_th)
+        c_chp: CHP parameters (config "chp" section)
+        c_boiler: Boiler parameters (config "boiler" section)
+
+    Returns:
+        Dictionary with chp_gas, boiler_gas, chp_status and profit arrays
+    """
+    options = _hourly_options(coeff_chp, coeff_boiler, demand, c_chp, c_boiler)
+    base, off_ok, on_ok = options["base"], options["off_ok"], options["on_ok"]
+    g_on = options["g_on"]
+    profit_on = base + options["slope"] * g_on
+
+    infeasible = ~(on_ok | off_ok)
+    if infeasible.any():
+        raise ValueError(
+            f"Heat demand cannot be met in {int(infeasible.sum())} hours "
+            f"(first at position {int(np.argmax(infeasible))})."
+        )
+
+    on = on_ok & (~off_ok | (profit_on > base))
+    chp_gas = np.where(on, g_on, 0.0)
+    boiler_gas = np.maximum(demand - chp_gas * c_chp["eta_th"], 0.0) / c_boiler["eta_th"]
+
+    return {
+        "chp_gas": chp_gas,
+        "boiler_gas": boiler_gas,
+        "chp_status": on.astype(float),
+        "profit": np.where(on, profit_on, base),
+    }
+
+
+def presolve_status(
+    coeff_chp: np.ndarray,
+    coeff_boiler: np.ndarray,
+    demand: np.ndarray,
+    c_chp: dict,
+    c_boiler: dict,
+    startup_cost: float = 0.0,
+) -> dict:
+    """
+    Fix the CHP status of hours that are decided without search.
+
+    Demand rule: the CHP must be off where its minimum heat output
+    exceeds the demand (the boiler cannot absorb heat) and on where the
+    boiler alone cannot cover it. Margin rule: switching one hour on or
+    off changes the number of start-ups by at most one, so an hour whose
+    best "on" profit differs from "off" by more than the start-up cost
+    has that status in every optimal solution. Hours where neither
+    status is feasible are left to the solver.
+
+    Args:
+        coeff_chp: Objective coefficient of CHP gas input per hour
+        coeff_boiler: Objective coefficient of boiler gas input per hour
+        demand: Heat demand per hour (MWh_th)
+        c_chp: CHP parameters (config "chp" section)
+        c_boiler: Boiler parameters (config "boiler" section)
+        startup_cost: Cost per CHP start-up (EUR)
+
+    Returns:
+        Dictionary with the status per hour (NaN = free, 0 = off, 1 = on),
+        tightened chp_gas_lb/ub and boiler_gas_lb/ub arrays and the
+        number of hours fixed by each rule
+    """
+    options = _hourly_options(coeff_chp, coeff_boiler, demand, c_chp, c_boiler)
+    off_ok, on_ok = options["off_ok"], options["on_ok"]
+    lo, hi = options["lo"], options["hi"]
+    eta_chp = c_chp["eta_th"]
+    eta_boiler = c_boiler["eta_th"]
+
+    # Profit of the best "on" point over "off"; near-ties stay free
+    advantage = options["slope"] * options["g_on"]
+    threshold = startup_cost + 1e-9 * np.maximum(1.0, np.abs(options["base"]))
+
+    demand_off = off_ok & ~on_ok
+    demand_on = on_ok & ~off_ok
+    margin_off = off_ok & on_ok & (advantage < -threshold)
+    margin_on = off_ok & on_ok & (advantage > threshold)
+
+    status = np.full(len(demand), np.nan)
+    status[demand_off | margin_off] = 0.0
+    status[demand_on | margin_on] = 1.0
+    on = status == 1
+
+    # CHP heat never exceeds the demand and the boiler covers the rest
+    chp_gas_ub = np.where(status == 0, 0.0, hi)
+    chp_gas_lb = np.where(on, lo, 0.0)
+    boiler_gas_lb = np.maximum(demand - chp_gas_ub * eta_chp, 0.0) / eta_boiler
+    boiler_gas_ub = np.minimum(
+        c_boiler["p_gas_max"], (demand - chp_gas_lb * eta_chp) / eta_boiler)
+
+    return {
+        "status": status,
+        "chp_gas_lb": chp_gas_lb,
+        "chp_gas_ub": chp_gas_ub,
+        "boiler_gas_lb": boiler_gas_lb,
+        "boiler_gas_ub": boiler_gas_ub,
+        "fixed_by_demand": int((demand_off | demand_on).sum()),
+        "fixed_by_margin": int((margin_off | margin_on).sum()),
+    }
+
+
+def heuristic_dispatch(
+    coeff_chp: np.ndarray,
+    coeff_boiler: np.ndarray,
+    demand: np.ndarray,
+    c_chp: dict,
+    c_boiler: dict,
+    startup_cost: float = 0.0,
+    initial_status: int = 0,
+) -> dict:
+    """
+    Fast feasible dispatch as incumbent for the MILP.
+
+    Starts from the per-hour merit order, which is optimal without a
+    start-up cost. With one, a repair pass then bridges "off" gaps that
+    lose less than a start-up by running the CHP through, and switches
+    off "on" runs that earn less than their start-up.
+
+    Args:
+        coeff_chp: Objective coefficient of CHP gas input per hour
+        coeff_boiler: Objective coefficient of boiler gas input per hour
+        demand: Heat demand per hour (MWh_th)
+        c_chp: CHP parameters (config "chp" section)
+        c_boiler: Boiler parameters (config "boiler" section)
+        startup_cost: Cost per CHP start-up (EUR)
+        initial_status: CHP status before the first hour
+
+    Returns:
+        Dictionary with chp_gas, boiler_gas, chp_status and chp_start
+        arrays and the total profit including start-up costs
+    """
+    dispatch = merit_order_dispatch(coeff_chp, coeff_boiler, demand, c_chp, c_boiler)
+    on = dispatch["chp_status"].astype(bool)
+    options = _hourly_options(coeff_chp, coeff_boiler, demand, c_chp, c_boiler)
+
+    if startup_cost:
+        _repair_runs(on, options, startup_cost, initial_status)
+
+    chp_gas = np.where(on, options["g_on"], 0.0)
+    boiler_gas = np.maximum(demand - chp_gas * c_chp["eta_th"], 0.0) / c_boiler["eta_th"]
+    status = on.astype(float)
+    starts = np.diff(status, prepend=float(initial_status)).clip(min=0.0)
+
+    return {
+        "chp_gas": chp_gas,
+        "boiler_gas": boiler_gas,
+        "chp_status": status,
+        "chp_start": starts,
+        "profit": float(coeff_chp @ chp_gas + coeff_boiler @ boiler_gas
+                        - startup_cost * starts.sum()),
+    }
+
+
+def repair_commitment(
+    status: np.ndarray,
+    coeff_chp: np.ndarray,
+    coeff_boiler: np.ndarray,
+    demand: np.ndarray,
+    c_chp: dict,
+    c_boiler: dict,
+    startup_cost: float = 0.0,
+    initial_status: int = 0,
+    must_run: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Round a fractional CHP status to a feasible commitment.
+
+    Hours are rounded at 0.5. Hours whose rounded status cannot meet the
+    demand are flipped (see the demand rule of presolve_status), and with
+    a start-up cost the run repair of heuristic_dispatch follows.
+
+    Args:
+        status: CHP status per hour, e.g. from the LP relaxation
+        coeff_chp: Objective coefficient of CHP gas input per hour
+        coeff_boiler: Objective coefficient of boiler gas input per hour
+        demand: Heat demand per hour (MWh_th)
+        c_chp: CHP parameters (config "chp" section)
+        c_boiler: Boiler parameters (config "boiler" section)
+        startup_cost: Cost per CHP start-up (EUR)
+        initial_status: CHP status before the first hour
+        must_run: Hours where the CHP has to run because of constraints
+            outside this model
+
+    Returns:
+        CHP status per hour (0.0 or 1.0)
+    """
+    options = _hourly_options(coeff_chp, coeff_boiler, demand, c_chp, c_boiler)
+    if must_run is not None:
+        options["off_ok"] = options["off_ok"] & ~must_run
+    on = np.asarray(status, dtype=float) >= 0.5
+    on = (on & options["on_ok"]) | ~options["off_ok"]
+    if startup_cost:
+        _repair_runs(on, options, startup_cost, initial_status)
+    return on.astype(float)
+
+
+def _repair_runs(on: np.ndarray, options: dict, startup_cost: float, initial_status: int) -> None:
+    """
+    Improve a commitment with a start-up cost in place.
+
+    Bridges "off" gaps that lose less than a start-up by running the CHP
+    through and switches off "on" runs that earn less than their start-up.
+    Hours where only one status is feasible keep it.
+    """
+    # Profit of the best "on" point over "off" per hour
+    gain = np.where(options["on_ok"], options["slope"] * options["g_on"], -np.inf)
+    gain = np.where(options["off_ok"], gain, np.inf)
+
+    # Bridge "off" gaps between two "on" hours (or the initial status)
+    for start, end in _runs(~on):
+        before = on[start - 1] if start > 0 else bool(initial_status)
+        if before and end < len(on) and -gain[start:end].sum() < startup_cost:
+            on[start:end] = True
+
+    # Drop "on" runs that do not pay for their start-up
+    for start, end in _runs(on):
+        before = on[start - 1] if start > 0 else bool(initial_status)
+        if not before and gain[start:end].sum() < startup_cost:
+            on[start:end] = False
+
+
+def _runs(mask: np.ndarray) -> list:
+    """(start, end) index pairs of the runs of True values in mask."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+class MeritOrderDispatch:
+    """Closed-form dispatch engine for the CHP + Boiler energy system."""
+
+    def __init__(self, data: pd.DataFrame, config: dict):
+        self.data = data
+        self.cfg = config
+        self.results = None
+        self.objective_value = None
+
+        self.c_chp = config["chp"]
+        self.c_boiler = config["boiler"]
+
+    def optimize(self) -> pd.DataFrame:
+        """Dispatch all hours and return the results DataFrame."""
+        if self.c_chp.get("startup_cost", 0.0):
+            raise ValueError(
+                "Merit-order dispatch needs independent hours; "
+                "remove chp.startup_cost or use ORToolsOptimizer.")
+
+        coeff_chp, coeff_boiler = objective_coefficients(self.data, self.cfg)
+        dispatch = merit_order_dispatch(
+            coeff_chp,
+            coeff_boiler,
+            self.data["demand_th"].values,
+            self.c_chp,
+            self.c_boiler,
+        )
+        self.objective_value = float(dispatch["profit"].sum())
+
+        chp_gas = dispatch["chp_gas"]
+        boiler_gas = dispatch["boiler_gas"]
+        self.results = pd.DataFrame(
+            {
+                "chp_gas_in": chp_gas,
+                "chp_el_out": chp_gas * self.c_chp["eta_el"],
+                "chp_heat_out": chp_gas * self.c_chp["eta_th"],
+                "chp_status": dispatch["chp_status"],
+                "boiler_gas_in": boiler_gas,
+                "boiler_heat_out": boiler_gas * self.c_boiler["eta_th"],
+            },
+            index=self.data.index,
+        )
+        print(f"Merit-order dispatch. Profit: {self.objective_value:,.2f} EUR")
+        return self.results
+
+    def verify(self, rel_tol: float = 1e-4) -> dict:
+        """
+        Check the dispatch objective against the OR-Tools MILP.
+
+        Args:
+            rel_tol: Relative objective tolerance (default matches the
+                MIP gap SCIP closes by default)
+
+        Returns:
+            Dictionary with both objectives, their difference and a match flag
+        """
+        from .ortools_model import ORToolsOptimizer
+
+        if self.objective_value is None:
+            self.optimize()
+
+        milp = ORToolsOptimizer(self.data, self.cfg)
+        milp.optimize()
+        if milp.objective_value is None:
+            raise ValueError("MILP reference solve did not reach optimality.")
+
+        diff = abs(self.objective_value - milp.objective_value)
+        scale = max(abs(milp.objective_value), 1.0)
+        check = {
+            "dispatch_objective": self.objective_value,
+            "milp_objective": milp.objective_value,
+            "difference": diff,
+            "match": diff <= rel_tol * scale,
+        }
+        print(f"Dispatch vs MILP objective difference: {diff:,.6f} EUR "
+              f"({'match' if check['match'] else 'MISMATCH'})")
+        return check
+
+    def get_results(self) -> pd.DataFrame:
+        """Return the results DataFrame."""
+        return self.results
@@ -3,130 +3,772 @@ OR-Tools based Energy System Optimizer
 CHP + Boiler model using Google OR-Tools
 """
 
-from ortools.linear_solver import pywraplp
+from ortools.linear_solver import linear_solver_pb2, pywraplp
+from ortools.linear_solver.python import model_builder_helper as mbh
+import scipy.sparse as sp
 import pandas as pd
 import numpy as np
+import logging
 import os
+import time
+
+from .dispatch import (
+    commitment_mode, commitment_settings, heuristic_dispatch, objective_coefficients,
+    presolve_status, repair_commitment,
+)
+from ..utils import instrumentation
+from ..utils.cache import RESULT_CACHE_VERSION, fingerprint, lookup_result, save_result
+from ..utils.export import export_settings, open_export, run_export, write_lp
+from ..utils.instrumentation import phase
+from ..utils.solver_options import (
+    active_options, scip_parameters, solver_options, stop_gap, stop_time,
+)
+from ..utils.telemetry import SolveMonitor, early_stop_rules, relative_gap, telemetry_settings
+
+logger = logging.getLogger(__name__)
+
+# pywraplp result status -> name for the instrumentation records
+STATUS_NAMES = {
+    pywraplp.Solver.OPTIMAL: "optimal",
+    pywraplp.Solver.FEASIBLE: "feasible",
+    pywraplp.Solver.INFEASIBLE: "infeasible",
+    pywraplp.Solver.UNBOUNDED: "unbounded",
+    pywraplp.Solver.ABNORMAL: "abnormal",
+    pywraplp.Solver.MODEL_INVALID: "model_invalid",
+    pywraplp.Solver.NOT_SOLVED: "not_solved",
+}
+
+# Backends that use a hint and the objective cutoff row
+MIP_SOLVERS = ("SCIP", "CBC")
+
+
+def _is_constant(item) -> bool:
+    """Whether a model entry was fixed by the presolve (a float, not a variable)."""
+    return not isinstance(item, pywraplp.Variable)
+
+
+def _value(item) -> float:
+    """Solution value of a variable or fixed entry."""
+    return float(item) if _is_constant(item) else item.solution_value()
 
 
 class ORToolsOptimizer:
     """OR-Tools optimizer for CHP + Boiler energy system."""
 
-    def __init__(self, data: pd.DataFrame, config: dict):
+    def __init__(self, data: pd.DataFrame, config: dict, initial_status: int = 0):
         self.data = data
         self.cfg = config
+        self.initial_status = initial_status
         self.solver = None
         self.results = None
+        self.objective_value = None
 
         self.c_chp = config["chp"]
         self.c_boiler = config["boiler"]
         self.c_eco = config["economics"]
+        self.startup_cost = self.c_chp.get("startup_cost", 0.0)
+        self.timings = {}
+        self.export_thread = None
+        self.solution_hint = None
+        self.from_cache = False
+        self.stop_reason = None
+        self.presolve_stats = None
+        self.heuristic = None
+        self.c_cutoff = None
+        self.relaxed = False
+        self.relaxation = None
+        self.solver_name = None
 
-    def optimize(self) -> pd.DataFrame:
-        """Run the full optimization workflow."""
-        self._build_model()
+    def optimize(self, use_cache: bool = True) -> pd.DataFrame:
+        """
+        Run the full optimization workflow.
+
+        Args:
+            use_cache: Return cached results for unchanged inputs (see the
+                "result_cache" config); False always builds and solves
+
+        Returns:
+            Results DataFrame, or None if no optimal solution was found
+        """
+        key = self._cache_key() if use_cache else None
+        cached = lookup_result(self.cfg, "ortools", key, self.data.index)
+        if cached is not None:
+            self.results, extra = cached
+            self.objective_value = extra["objective_value"]
+            self.from_cache = True
+            print(f"OR-Tools results loaded from cache. Profit: {self.objective_value:,.2f} EUR")
+            return self.results
+
+        with phase("ortools", "build", steps=len(self.data),
+                   build_mode=self.cfg["settings"].get("build_mode", "loop")) as record:
+            self._build_model()
+            if instrumentation.enabled():
+                record.update(self.model_size())
+        self.timings["build"] = record["wall_s"]
+
+        start = time.perf_counter()
         self._solve()
+        self.timings["solve"] = time.perf_counter() - start
+
+        if self.results is not None:
+            save_result(self.cfg, "ortools", key, self.results,
+                        {"objective_value": self.objective_value})
         return self.results
 
+    def _cache_key(self) -> str:
+        """Fingerprint of everything the solved results depend on."""
+        return fingerprint(
+            "ortools",
+            RESULT_CACHE_VERSION,
+            self.data,
+            {section: self.cfg[section] for section in ("chp", "boiler", "economics")},
+            self.cfg["data"]["co2_price"],
+            self.cfg["settings"]["solver"],
+            # Pick among equally good solutions differently
+            {k: self.cfg["settings"].get(k)
+             for k in ("build_mode", "presolve", "heuristic", "cutoff")},
+            self.initial_status,
+            early_stop_rules(self.cfg),
+            self._commitment_key(),
+            active_options(solver_options(self.cfg, len(self.data))),
+        )
+
+    def _commitment_key(self) -> dict:
+        """Relaxed-commitment settings the results depend on, or None for the MILP."""
+        if commitment_mode(self.cfg, len(self.data)) == "milp":
+            return None
+        return {"mode": "relaxed", "lp_solver": commitment_settings(self.cfg)["lp_solver"]}
+
     def _build_model(self) -> None:
-        """Build the OR-Tools optimization model."""
+        """
+        Build the OR-Tools optimization model.
+
+        In relaxed-commitment mode (see the "commitment" config) the CHP
+        status is continuous and the LP solver of that section is used.
+        """
+        T = len(self.data)
+        self.relaxed = commitment_mode(self.cfg, T) == "relaxed"
+
         # Setup solver
-        solver_name = self.cfg["settings"]["solver"]
+        if self.relaxed:
+            solver_name = commitment_settings(self.cfg)["lp_solver"]
+        else:
+            solver_name = self.cfg["settings"]["solver"]
         self.solver = pywraplp.Solver.CreateSolver(solver_name)
         if not self.solver:
             raise ValueError(f"{solver_name} not available.")
+        self.solver_name = solver_name
+        self.c_cutoff = None
 
-        T = len(self.data)
-
-        # Economics: Gas cost + CO2 tax
-        gas_cost_total = self.data["price_gas"].values + (
-            self.cfg["data"]["co2_price"] * self.c_eco["co2_intensity_gas"]
-        )
-        price_el = self.data["price_el"].values
+        coeff_chp, coeff_boiler = objective_coefficients(self.data, self.cfg)
         demand = self.data["demand_th"].values
+        fix = self._presolve(coeff_chp, coeff_boiler, demand)
+
+        build_mode = self.cfg["settings"].get("build_mode", "loop")
+        if build_mode == "array":
+            self._build_model_array(coeff_chp, coeff_boiler, demand, fix)
+        elif build_mode == "loop":
+            self._build_model_loop(coeff_chp, coeff_boiler, demand, fix)
+        else:
+            raise ValueError(f"Unknown build_mode: {build_mode}")
+        print(f"OR-Tools model built: {T} time steps.")
+
+        # Export LP file
+        self._export_lp_file()
 
+    def _presolve(self, coeff_chp, coeff_boiler, demand) -> dict:
+        """
+        CHP status and variable bounds per hour for the build.
+
+        With settings.presolve, hours whose CHP status follows from demand
+        or margin are fixed (see presolve_status); they get no binary, and
+        hours with the CHP off get no variables or rows at all. Otherwise
+        every hour is free with the plain capacity bounds.
+        """
+        T = len(demand)
+        if not self.cfg["settings"].get("presolve", False):
+            self.presolve_stats = None
+            return {
+                "status": np.full(T, np.nan),
+                "chp_gas_lb": np.zeros(T),
+                "chp_gas_ub": np.full(T, float(self.c_chp["p_gas_max"])),
+                "boiler_gas_lb": np.zeros(T),
+                "boiler_gas_ub": np.full(T, float(self.c_boiler["p_gas_max"])),
+            }
+
+        with phase("ortools", "presolve", steps=T) as record:
+            fix = presolve_status(coeff_chp, coeff_boiler, demand,
+                                  self.c_chp, self.c_boiler, self.startup_cost)
+            status = fix["status"]
+            self.presolve_stats = {
+                "fixed_off": int((status == 0).sum()),
+                "fixed_on": int((status == 1).sum()),
+                "fixed_by_demand": fix["fixed_by_demand"],
+                "fixed_by_margin": fix["fixed_by_margin"],
+                "free": int(np.isnan(status).sum()),
+            }
+            record.update(self.presolve_stats)
+        stats = self.presolve_stats
+        print(f"Presolve fixed {T - stats['free']} of {T} CHP status binaries "
+              f"({stats['fixed_by_demand']} by demand, {stats['fixed_by_margin']} by margin; "
+              f"{stats['fixed_off']} off, {stats['fixed_on']} on).")
+        return fix
+
+    def _build_model_loop(self, coeff_chp, coeff_boiler, demand, fix) -> None:
+        """Build the model one time step at a time via the pywraplp API."""
+        T = len(demand)
+        status = fix["status"]
+        eta_boiler = self.c_boiler["eta_th"]
+
+        # Hours with a fixed status hold constants instead of variables;
+        # with the CHP off, the boiler covers the demand alone
         # Variables: CHP
         self.v_chp_gas = [
-            self.solver.NumVar(0, self.c_chp["p_gas_max"], f"chp_gas_{t}")
+            self.solver.NumVar(fix["chp_gas_lb"][t], fix["chp_gas_ub"][t], f"chp_gas_{t}")
+            if status[t] != 0 else 0.0
             for t in range(T)
         ]
+        status_var = self.solver.NumVar if self.relaxed else self.solver.IntVar
         self.v_chp_status = [
-            self.solver.IntVar(0, 1, f"chp_on_{t}")
+            status_var(0, 1, f"chp_on_{t}") if np.isnan(status[t]) else float(status[t])
             for t in range(T)
         ]
 
         # Variables: Boiler
         self.v_boiler_gas = [
-            self.solver.NumVar(0, self.c_boiler["p_gas_max"], f"bl_gas_{t}")
+            self.solver.NumVar(fix["boiler_gas_lb"][t], fix["boiler_gas_ub"][t], f"bl_gas_{t}")
+            if status[t] != 0 else demand[t] / eta_boiler
             for t in range(T)
         ]
 
+        # Variables: CHP start-ups (only with a start-up cost); a start-up
+        # between two fixed hours is a constant
+        self.v_chp_start = []
+        if self.startup_cost:
+            for t in range(T):
+                on = self.v_chp_status[t]
+                prev = self.v_chp_status[t - 1] if t > 0 else float(self.initial_status)
+                if _is_constant(on) and on == 0:
+                    self.v_chp_start.append(0.0)
+                elif _is_constant(on) and _is_constant(prev):
+                    self.v_chp_start.append(max(on - prev, 0.0))
+                else:
+                    self.v_chp_start.append(self.solver.NumVar(0, 1, f"chp_start_{t}"))
+
         objective = self.solver.Objective()
+        offset = 0.0
+        self.c_heat = []
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         for t in range(T):
-            # CHP min/max constraints (linked to status)
-            self.solver.Add(
-                self.v_chp_gas[t] <= self.c_chp["p_gas_max"] *
-                self.v_chp_status[t]
-            )
-            self.solver.Add(
-                self.v_chp_gas[t] >= self.c_chp["p_gas_min"] *
-                self.v_chp_status[t]
-            )
+            if np.isnan(status[t]):
+                # CHP min/max constraints (linked to status)
+                self.solver.Add(
+                    self.v_chp_gas[t] <= self.c_chp["p_gas_max"] *
+                    self.v_chp_status[t]
+                )
+                self.solver.Add(
+                    self.v_chp_gas[t] >= self.c_chp["p_gas_min"] *
+                    self.v_chp_status[t]
+                )
+
+            if debug and coeff_chp[t] > 0:
+                logger.debug("Time %d: CHP profitable with coeff %.2f", t, coeff_chp[t])
+
+            if status[t] == 0:
+                self.c_heat.append(None)
+                offset += coeff_boiler[t] * self.v_boiler_gas[t]
+                continue
 
             # Heat balance constraint
             q_chp = self.v_chp_gas[t] * self.c_chp["eta_th"]
-            q_boiler = self.v_boiler_gas[t] * self.c_boiler["eta_th"]
-            self.solver.Add(q_chp + q_boiler == demand[t])
-
-            # Objective coefficients
-            coeff_chp = (
-                (price_el[t] * self.c_chp["eta_el"])
-                - gas_cost_total[t]
-                - self.c_chp["marginal_cost"]
-            )
+            q_boiler = self.v_boiler_gas[t] * eta_boiler
+            self.c_heat.append(self.solver.Add(q_chp + q_boiler == demand[t]))
 
-            if coeff_chp > 0:
-                print(f"Time {t}: CHP profitable with coeff {coeff_chp:.2f}")
-            coeff_boiler = -gas_cost_total[t] - self.c_boiler["marginal_cost"]
+            objective.SetCoefficient(self.v_chp_gas[t], coeff_chp[t])
+            objective.SetCoefficient(self.v_boiler_gas[t], coeff_boiler[t])
 
-            objective.SetCoefficient(self.v_chp_gas[t], coeff_chp)
-            objective.SetCoefficient(self.v_boiler_gas[t], coeff_boiler)
+        # Start-up detection: start_t >= on_t - on_(t-1)
+        for t, v_start in enumerate(self.v_chp_start):
+            if _is_constant(v_start):
+                offset -= self.startup_cost * v_start
+                continue
+            prev = self.v_chp_status[t - 1] if t > 0 else self.initial_status
+            self.solver.Add(v_start >= self.v_chp_status[t] - prev)
+            objective.SetCoefficient(v_start, -self.startup_cost)
 
+        if offset:
+            objective.SetOffset(offset)
         objective.SetMaximization()
-        print(f"OR-Tools model built: {T} time steps.")
 
-        # Export LP file
-        self._export_lp_file()
+    def _build_model_array(self, coeff_chp, coeff_boiler, demand, fix) -> None:
+        """Build the model from NumPy arrays in a handful of bulk calls.
+
+        Produces the same LP as the loop build: columns are ordered
+        [chp_gas, chp_on, bl_gas, chp_start] and every time step contributes
+        the rows [max load, min load, heat balance], followed by the
+        start-up rows when a start-up cost is set. Hours with a fixed CHP
+        status drop the columns and rows the loop build leaves out. The
+        sparse model is assembled in a ModelBuilder helper and loaded into
+        the pywraplp solver, so solving and result extraction are shared
+        with the loop build.
+        """
+        T = len(demand)
+        p_max = self.c_chp["p_gas_max"]
+        p_min = self.c_chp["p_gas_min"]
+        eta_boiler = self.c_boiler["eta_th"]
+        status = fix["status"]
+        free = np.isnan(status)
+        on = status == 1
+        used = ~(status == 0)
+
+        # Column of every hour's variables (-1 = constant)
+        t_used = np.flatnonzero(used)
+        t_free = np.flatnonzero(free)
+        n_used, n_free = len(t_used), len(t_free)
+        col_gas = np.full(T, -1)
+        col_gas[t_used] = np.arange(n_used)
+        col_on = np.full(T, -1)
+        col_on[t_free] = n_used + np.arange(n_free)
+        col_bl = np.full(T, -1)
+        col_bl[t_used] = n_used + n_free + np.arange(n_used)
+        n_cols = 2 * n_used + n_free
+
+        # Rows of every hour: free 3, fixed on 1 (heat balance), fixed off 0
+        first_row = np.concatenate([[0], np.cumsum(3 * free + on)[:-1]])
+        heat_row = first_row + 2 * free
+        n_hour_rows = int((3 * free + on).sum())
+
+        # Column bounds and objective
+        var_lb = [fix["chp_gas_lb"][t_used], np.zeros(n_free), fix["boiler_gas_lb"][t_used]]
+        var_ub = [fix["chp_gas_ub"][t_used], np.ones(n_free), fix["boiler_gas_ub"][t_used]]
+        var_obj = [coeff_chp[t_used], np.zeros(n_free), coeff_boiler[t_used]]
+        offset = float(coeff_boiler[~used] @ (demand[~used] / eta_boiler))
+
+        # Constraint matrix in COO form
+        f, u = first_row[t_free], heat_row[t_used]
+        rows = [f, f, f + 1, f + 1, u, u]
+        cols = [col_gas[t_free], col_on[t_free], col_gas[t_free], col_on[t_free],
+                col_gas[t_used], col_bl[t_used]]
+        vals = [
+            np.ones(n_free), np.full(n_free, -p_max),
+            np.ones(n_free), np.full(n_free, -p_min),
+            np.full(n_used, self.c_chp["eta_th"]), np.full(n_used, eta_boiler),
+        ]
+
+        # Row bounds: gas <= p_max*on, gas >= p_min*on, heat == demand
+        row_lb = np.empty(n_hour_rows)
+        row_ub = np.empty(n_hour_rows)
+        row_lb[f], row_ub[f] = -np.inf, 0.0
+        row_lb[f + 1], row_ub[f + 1] = 0.0, np.inf
+        row_lb[u] = row_ub[u] = demand[t_used]
+
+        t_start = np.array([], dtype=int)
+        if self.startup_cost:
+            # A start-up needs a column unless on_t and on_(t-1) are fixed,
+            # or on_t is fixed off
+            prev_status = np.concatenate([[float(self.initial_status)], status[:-1]])
+            prev_free = np.isnan(prev_status)
+            has_start = free | (on & prev_free)
+            t_start = np.flatnonzero(has_start)
+            n_start = len(t_start)
+            # Decided start-ups: 1 where a fixed "on" follows a fixed "off"
+            start_fixed = np.where(on, np.clip(1.0 - np.nan_to_num(prev_status), 0.0, None), 0.0)
+            offset -= self.startup_cost * float(start_fixed[~has_start].sum())
+
+            # Start-up rows: start_t - on_t + on_(t-1) >= on_t - on_(t-1)
+            # with only the fixed statuses on the right-hand side
+            start_rows = n_hour_rows + np.arange(n_start)
+            col_start = n_cols + np.arange(n_start)
+            var_lb.append(np.zeros(n_start))
+            var_ub.append(np.ones(n_start))
+            var_obj.append(np.full(n_start, -self.startup_cost))
+            on_var = free[t_start]
+            prev_var = prev_free[t_start]
+            rows += [start_rows, start_rows[on_var], start_rows[prev_var]]
+            cols += [col_start, col_on[t_start[on_var]], col_on[t_start[prev_var] - 1]]
+            vals += [np.ones(n_start), np.full(int(on_var.sum()), -1.0),
+                     np.ones(int(prev_var.sum()))]
+            rhs = (np.where(on_var, 0.0, status[t_start])
+                   - np.where(prev_var, 0.0, prev_status[t_start]))
+            row_lb = np.concatenate([row_lb, rhs])
+            row_ub = np.concatenate([row_ub, np.full(n_start, np.inf)])
+            n_cols += n_start
+
+        matrix = sp.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(row_lb), n_cols),
+        )
+        var_lb = np.concatenate(var_lb)
+        var_ub = np.concatenate(var_ub)
+        var_obj = np.concatenate(var_obj)
+
+        helper = mbh.ModelBuilderHelper()
+        helper.fill_model_from_sparse_data(
+            var_lb, var_ub, var_obj, row_lb, row_ub, matrix
+        )
+        if not self.relaxed:
+            for i in col_on[t_free]:
+                helper.set_var_integrality(int(i), True)
+        if offset:
+            helper.set_objective_offset(offset)
+        helper.set_maximize(True)
+
+        named = self.cfg["settings"].get("variable_names", True)
+        if named:
+            names = (
+                [f"chp_gas_{i}" for i in t_used]
+                + [f"chp_on_{i}" for i in t_free]
+                + [f"bl_gas_{i}" for i in t_used]
+                + [f"chp_start_{i}" for i in t_start]
+            )
+            for i, name in enumerate(names):
+                helper.set_var_name(i, name)
+
+        proto = mbh.to_mpmodel_proto(helper)
+        if named:
+            error = self.solver.LoadModelFromProtoKeepNames(proto)
+        else:
+            error = self.solver.LoadModelFromProto(proto)
+        if error:
+            raise ValueError(f"Could not load array model: {error}")
 
-    def _export_lp_file(self) -> None:
-        """Export the model as LP file for debugging."""
-        try:
-            os.makedirs("results", exist_ok=True)
-            lp_text = self.solver.ExportModelAsLpFormat(False)
-            with open("results/ortools_model.lp", "w") as f:
-                f.write(lp_text)
-            print("Exported LP file: results/ortools_model.lp")
-        except Exception as e:
-            print(f"Could not export LP file: {e}")
-
-    def _solve(self) -> None:
-        """Solve the optimization problem."""
-        print(f"Solving with {self.cfg['settings']['solver']}...")
-        status = self.solver.Solve()
+        variables = self.solver.variables()
+        constraints = self.solver.constraints()
+        self.v_chp_gas = [variables[c] if c >= 0 else 0.0 for c in col_gas]
+        self.v_chp_status = [variables[c] if c >= 0 else float(s)
+                             for c, s in zip(col_on, status)]
+        self.v_boiler_gas = [variables[c] if c >= 0 else d / eta_boiler
+                             for c, d in zip(col_bl, demand)]
+        self.v_chp_start = []
+        if self.startup_cost:
+            starts = dict(zip(t_start, variables[n_cols - len(t_start):]))
+            self.v_chp_start = [starts.get(t, float(start_fixed[t])) for t in range(T)]
+        self.c_heat = [constraints[r] if used[t] else None for t, r in enumerate(heat_row)]
+
+        print(f"CHP profitable in {int((coeff_chp > 0).sum())} of {T} time steps.")
+
+    def _export_lp_file(self, filepath: str = "results/ortools_model.lp") -> None:
+        """Export the model as LP file for debugging (see the "export" config)."""
+        settings = export_settings(self.cfg)
+        if not settings["enabled"]:
+            return
+
+        # Snapshot the model first; the solver must not be read while solving
+        proto = linear_solver_pb2.MPModelProto()
+        self.solver.ExportModelToProto(proto)
+
+        def write() -> None:
+            f, path = open_export(filepath, settings["gzip"])
+            with f:
+                write_lp(proto, f, settings["max_rows"], settings["chunk_rows"])
+            print(f"Exported LP file: {path}")
+
+        self.export_thread = run_export(write, settings["background"])
+
+    def _apply_heuristic(self, hint: bool = True) -> None:
+        """
+        Give the solver a heuristic incumbent (see settings.heuristic).
+
+        The heuristic dispatch is passed as solution hint, and with
+        settings.cutoff an objective row requires the MILP to do at least
+        as well. pywraplp has no objective cutoff parameter for SCIP or
+        CBC, so the cutoff is a row; both prune nodes whose LP bound
+        falls below it. GLOP solves the LP and gets neither.
+
+        Args:
+            hint: Pass the dispatch as hint; False keeps a warm start
+                hint set by resolve()
+        """
+        self.heuristic = None
+        if self.c_cutoff is not None:
+            # Drop the cutoff of the last solve; the parameters may have changed
+            self.c_cutoff.SetLb(-self.solver.infinity())
+        settings = self.cfg["settings"]
+        if not settings.get("heuristic", False) or self.solver_name not in MIP_SOLVERS:
+            return
+
+        with phase("ortools", "heuristic", steps=len(self.data)) as record:
+            coeff_chp, coeff_boiler = objective_coefficients(self.data, self.cfg)
+            try:
+                dispatch = heuristic_dispatch(
+                    coeff_chp, coeff_boiler, self.data["demand_th"].values,
+                    self.c_chp, self.c_boiler, self.startup_cost, self.initial_status)
+            except ValueError as error:
+                print(f"No heuristic incumbent: {error}")
+                record["objective"] = None
+                return
+            if hint:
+                starts = list(dispatch["chp_start"]) if self.v_chp_start else []
+                self._set_hint(list(dispatch["chp_gas"]) + list(dispatch["chp_status"])
+                               + list(dispatch["boiler_gas"]) + starts)
+            if settings.get("cutoff", False):
+                self._set_cutoff(dispatch["profit"])
+            record["objective"] = dispatch["profit"]
+        self.heuristic = {"objective": dispatch["profit"], "time_s": record["wall_s"]}
+        self.timings["heuristic"] = record["wall_s"]
+        print(f"Heuristic incumbent: {dispatch['profit']:,.2f} EUR "
+              f"in {record['wall_s']:.3f} s.")
+
+    def _set_hint(self, values: list) -> None:
+        """Pass values for [chp_gas, chp_on, bl_gas, chp_start] as solution hint."""
+        entries = (self.v_chp_gas + self.v_chp_status
+                   + self.v_boiler_gas + self.v_chp_start)
+        hint = [(v, x) for v, x in zip(entries, values) if not _is_constant(v)]
+        self.solver.SetHint([v for v, _ in hint], [x for _, x in hint])
+
+    def _set_cutoff(self, value: float) -> None:
+        """Require an objective of at least value via a row over the objective terms."""
+        objective = self.solver.Objective()
+        if self.c_cutoff is None:
+            self.c_cutoff = self.solver.Constraint(-self.solver.infinity(),
+                                                   self.solver.infinity(), "objective_cutoff")
+        # Coefficients are copied on every solve, as update_parameters() changes them
+        for v in self.solver.variables():
+            self.c_cutoff.SetCoefficient(v, objective.GetCoefficient(v))
+        # Small slack so that rounding cannot cut off the heuristic itself
+        tolerance = 1e-6 * max(1.0, abs(value))
+        self.c_cutoff.SetLb(value - objective.offset() - tolerance)
+
+    def _solve(self, hinted: bool = False) -> None:
+        """
+        Solve the optimization problem.
+
+        Args:
+            hinted: A warm start hint is already set (see resolve())
+        """
+        solver_name = self.solver_name
+        settings = telemetry_settings(self.cfg)
+        options = solver_options(self.cfg, len(self.data))
+        params = self._solver_parameters(options)
+        self._apply_heuristic(hint=not hinted)
+        if self.relaxed:
+            # Undo the commitment fixed by the last repair
+            for v in self.v_chp_status:
+                if not _is_constant(v):
+                    v.SetBounds(0.0, 1.0)
+            print("Relaxed commitment: solving the LP relaxation.")
+        print(f"Solving with {solver_name}...")
+        if active_options(options):
+            print(f"Solver options: {active_options(options)}")
+        self.stop_reason = None
+        with phase("ortools", "solve", solver=solver_name, relaxed=self.relaxed,
+                   options=active_options(options)) as record:
+            if settings["enabled"]:
+                status = self._solve_monitored(settings, params, options)
+            else:
+                status = self.solver.Solve(params)
+            if status == pywraplp.Solver.FEASIBLE and self.stop_reason is None \
+                    and options["time_limit_s"] is not None:
+                self.stop_reason = "time_limit"
+            record["status"] = STATUS_NAMES.get(status, str(status))
+            if self.heuristic is not None:
+                record["heuristic_objective"] = self.heuristic["objective"]
+
+        if self.relaxed and status == pywraplp.Solver.OPTIMAL:
+            status = self._repair_relaxation()
+
+        if status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE) \
+                and self.heuristic is not None:
+            gap = relative_gap(self.heuristic["objective"], self.solver.Objective().Value())
+            self.heuristic["gap"] = gap
+            print(f"Heuristic incumbent gap to the final solution: {gap:.2%}")
 
         if status == pywraplp.Solver.OPTIMAL:
-            print(
-                f"Optimal. Profit: {self.solver.Objective().Value():,.2f} EUR")
-            self._extract_results()
+            self.objective_value = self.solver.Objective().Value()
+            print(f"Optimal. Profit: {self.objective_value:,.2f} EUR")
+        elif status == pywraplp.Solver.FEASIBLE and self.stop_reason is not None:
+            self.objective_value = self.solver.Objective().Value()
+            print(f"Stopped early ({self.stop_reason}). Profit: {self.objective_value:,.2f} EUR")
         else:
             print("No optimal solution found.")
+            return
+        with phase("ortools", "extract"):
+            self._extract_results()
+
+    def _solver_parameters(self, options: dict) -> pywraplp.MPSolverParameters:
+        """
+        Apply the "solver_options" config to the solver.
+
+        Time limit, threads and the SCIP-specific settings (absolute gap,
+        seed, emphasis) are set on the solver; the relative gap and
+        presolve go into the returned parameters. Options the backend
+        does not support are reported and skipped.
+
+        Args:
+            options: Options from solver_options()
+
+        Returns:
+            Parameters for Solve()
+        """
+        params = pywraplp.MPSolverParameters()
+        unsupported = []
+
+        limit = options["time_limit_s"]
+        self.solver.SetTimeLimit(int(limit * 1000) if limit is not None else 0)
+        # CBC accepts the thread count but is built without threads
+        if options["threads"] is not None and (self.solver_name == "CBC"
+                                               or not self.solver.SetNumThreads(int(options["threads"]))):
+            unsupported.append("threads")
+        if options["mip_rel_gap"] is not None:
+            if self.solver_name in MIP_SOLVERS:
+                params.SetDoubleParam(params.RELATIVE_MIP_GAP, float(options["mip_rel_gap"]))
+            else:
+                unsupported.append("mip_rel_gap")
+        if options["presolve"] is not None and self.solver_name == "CBC":
+            unsupported.append("presolve")
+        elif options["presolve"] is not None:
+            params.SetIntegerParam(
+                params.PRESOLVE, params.PRESOLVE_ON if options["presolve"] else params.PRESOLVE_OFF)
+
+        if self.solver_name == "SCIP":
+            specific = scip_parameters(options)
+            if specific:
+                self.solver.SetSolverSpecificParametersAsString(
+                    "\n".join(f"{name} = {value}" for name, value in specific.items()))
+        else:
+            unsupported += [key for key in ("mip_abs_gap", "seed", "emphasis")
+                            if options[key] is not None]
+
+        if unsupported:
+            print(f"Solver options not supported by {self.solver_name}: {', '.join(unsupported)}")
+        return params
+
+    def _repair_relaxation(self) -> int:
+        """
+        Turn the solved LP relaxation into an integer-feasible schedule.
+
+        The fractional CHP status is rounded and repaired (see
+        repair_commitment), fixed through the variable bounds, and the LP
+        is solved again for the best dispatch of that commitment. The
+        relaxation objective bounds the MILP optimum from above, so the
+        gap to it bounds the error of the schedule.
+
+        Returns:
+            pywraplp result status of the dispatch solve
+        """
+        bound = self.solver.Objective().Value()
+        fractional = np.array([_value(v) for v in self.v_chp_status])
+        coeff_chp, coeff_boiler = objective_coefficients(self.data, self.cfg)
+
+        with phase("ortools", "repair", steps=len(self.data)) as record:
+            status_on = repair_commitment(
+                fractional, coeff_chp, coeff_boiler, self.data["demand_th"].values,
+                self.c_chp, self.c_boiler, self.startup_cost, self.initial_status)
+            for v, x in zip(self.v_chp_status, status_on):
+                if not _is_constant(v):
+                    v.SetBounds(x, x)
+            status = self.solver.Solve()
+            record["status"] = STATUS_NAMES.get(status, str(status))
+            if status != pywraplp.Solver.OPTIMAL:
+                print("Repaired commitment could not be dispatched.")
+                return status
+
+            objective = self.solver.Objective().Value()
+            self.relaxation = {
+                "bound": bound,
+                "objective": objective,
+                "gap": relative_gap(objective, bound),
+                "fractional_hours": int(((fractional > 1e-6) & (fractional < 1 - 1e-6)).sum()),
+            }
+            record.update(self.relaxation)
+        print(f"Relaxed commitment: LP bound {bound:,.2f} EUR, repaired schedule "
+              f"{objective:,.2f} EUR (gap at most {self.relaxation['gap']:.3%}, "
+              f"{self.relaxation['fractional_hours']} fractional hours rounded).")
+        return status
+
+    def _solve_monitored(self, settings: dict, params: pywraplp.MPSolverParameters,
+                         options: dict) -> int:
+        """
+        Solve with the telemetry rules, recording progress.
+
+        pywraplp has no progress callbacks. By default the model is solved
+        once with the gap and time rules passed to the solver, and only the
+        final state is recorded. With telemetry.slice_s the solver instead
+        runs with a time limit that doubles every slice; the incumbent of
+        a slice is passed as hint to the next one, the tightest bound of
+        all slices is kept, and the early-stop rules are checked between
+        slices. This mode is approximate: each slice restarts the search,
+        so the total work and the recorded progress differ from an
+        unmonitored solve.
+
+        Args:
+            settings: "telemetry" settings
+            params: Solver parameters from _solver_parameters()
+            options: Options from solver_options()
+
+        Returns:
+            pywraplp result status of the last slice
+        """
+        monitor = SolveMonitor("ortools", settings, sense="max",
+                               solver=self.solver_name, steps=len(self.data))
+        if settings["gap"] is not None:
+            params.SetDoubleParam(params.RELATIVE_MIP_GAP,
+                                  stop_gap(settings["gap"], options["mip_rel_gap"]))
+        time_limit_s = stop_time(settings["time_limit_s"], options["time_limit_s"])
+        variables = self.solver.variables()
+        objective = self.solver.Objective()
+        slice_s = settings["slice_s"]
+        if slice_s is None and settings["stall_s"] is not None:
+            print("The stall rule needs telemetry.slice_s with OR-Tools; ignored.")
+        nodes = 0
+        if self.heuristic is not None:
+            # The heuristic is the first incumbent, available before the solve
+            monitor.update(incumbent=self.heuristic["objective"], source="heuristic")
+
+        while True:
+            limits = [] if slice_s is None else [slice_s, monitor.time_left()]
+            if time_limit_s is not None:
+                limits.append(time_limit_s - monitor.elapsed())
+            limits = [t for t in limits if t is not None]
+            self.solver.SetTimeLimit(max(int(min(limits) * 1000), 1) if limits else 0)
+            status = self.solver.Solve(params)
+            nodes += self.solver.nodes()
+            has_solution = status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE)
+            self.stop_reason = monitor.update(
+                incumbent=objective.Value() if has_solution else None,
+                bound=objective.BestBound() if has_solution else None,
+                nodes=nodes, status=STATUS_NAMES.get(status, str(status)),
+            )
+            if status not in (pywraplp.Solver.FEASIBLE, pywraplp.Solver.NOT_SOLVED) \
+                    or self.stop_reason is not None:
+                break
+            if time_limit_s is not None and monitor.elapsed() >= time_limit_s:
+                self.stop_reason = "time_limit"
+                break
+            if slice_s is None:
+                if status == pywraplp.Solver.FEASIBLE:
+                    self.stop_reason = "time_limit"
+                break
+            if has_solution:
+                self.solver.SetHint(variables, [v.solution_value() for v in variables])
+            slice_s *= 2
+
+        # Back to the configured time limit for later solves
+        limit = options["time_limit_s"]
+        self.solver.SetTimeLimit(int(limit * 1000) if limit is not None else 0)
+        monitor.finish(STATUS_NAMES.get(status, str(status)))
+        return status
+
+    def model_size(self) -> dict:
+        """Return the number of variables, constraints and nonzeros of the built model."""
+        proto = linear_solver_pb2.MPModelProto()
+        self.solver.ExportModelToProto(proto)
+        return {
+            "n_vars": self.solver.NumVariables(),
+            "n_cons": self.solver.NumConstraints(),
+            "n_nonzeros": sum(len(c.var_index) for c in proto.constraint),
+        }
 
     def _extract_results(self) -> None:
         """Extract solution values into a DataFrame."""
-        chp_gas = [v.solution_value() for v in self.v_chp_gas]
-        boiler_gas = [v.solution_value() for v in self.v_boiler_gas]
-        status = [v.solution_value() for v in self.v_chp_status]
+        chp_gas = [_value(v) for v in self.v_chp_gas]
+        boiler_gas = [_value(v) for v in self.v_boiler_gas]
+        status = [_value(v) for v in self.v_chp_status]
+        starts = [_value(v) for v in self.v_chp_start]
+
+        # Kept as warm start for resolve()
+        self.solution_hint = chp_gas + status + boiler_gas + starts
 
         self.results = pd.DataFrame(
             {
@@ -144,6 +786,92 @@ class ORToolsOptimizer:
         print("\n--- OR-Tools Results Summary ---")
         print(self.results.sum())
 
+    def update_parameters(
+        self,
+        price_el=None,
+        price_gas=None,
+        co2_price: float = None,
+        demand_th=None,
+    ) -> None:
+        """
+        Update prices and heat demand of the built model in place.
+
+        Objective coefficients and heat-balance right-hand sides are changed
+        on the existing solver, so resolve() skips the model build. With
+        settings.presolve the model is built again instead, as the fixed
+        hours depend on the new values.
+
+        Args:
+            price_el: New electricity prices, one per time step
+            price_gas: New gas prices, one per time step
+            co2_price: New CO2 price (EUR/t)
+            demand_th: New heat demand, one per time step
+        """
+        self._ensure_model()
+
+        data = self.data.copy()
+        for col, values in (("price_el", price_el), ("price_gas", price_gas),
+                            ("demand_th", demand_th)):
+            if values is not None:
+                values = np.asarray(values, dtype=float)
+                if len(values) != len(data):
+                    raise ValueError(
+                        f"{col} has {len(values)} values, model has {len(data)} time steps.")
+                data[col] = values
+        self.data = data
+
+        if co2_price is not None:
+            self.cfg = {**self.cfg, "data": {**self.cfg["data"], "co2_price": co2_price}}
+
+        if self.presolve_stats is not None:
+            # The fixed hours depend on prices and demand, so build again
+            self._build_model()
+            return
+
+        if price_el is not None or price_gas is not None or co2_price is not None:
+            coeff_chp, coeff_boiler = objective_coefficients(self.data, self.cfg)
+            objective = self.solver.Objective()
+            for v, c in zip(self.v_chp_gas, coeff_chp):
+                objective.SetCoefficient(v, c)
+            for v, c in zip(self.v_boiler_gas, coeff_boiler):
+                objective.SetCoefficient(v, c)
+
+        if demand_th is not None:
+            for ct, d in zip(self.c_heat, self.data["demand_th"].values):
+                ct.SetBounds(d, d)
+
+    def resolve(self, warm_start: bool = True) -> pd.DataFrame:
+        """
+        Re-solve the persistent model after update_parameters().
+
+        Args:
+            warm_start: Pass the previous solution to the solver as a hint
+
+        Returns:
+            Results DataFrame, or None if no optimal solution was found
+        """
+        self._ensure_model()
+
+        hinted = warm_start and self.solution_hint is not None
+        if hinted:
+            self._set_hint(self.solution_hint)
+
+        self.results = None
+        self.objective_value = None
+        self.from_cache = False
+        start = time.perf_counter()
+        self._solve(hinted=hinted)
+        self.timings["resolve"] = time.perf_counter() - start
+        return self.results
+
+    def _ensure_model(self) -> None:
+        """Build the model if optimize() returned cached results."""
+        if self.solver is not None:
+            return
+        if self.results is None:
+            raise ValueError("Model not built yet; call optimize() first.")
+        self._build_model()
+
     def get_results(self) -> pd.DataFrame:
         """Return the results DataFrame."""
         return self.results
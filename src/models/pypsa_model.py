@@ -3,9 +3,21 @@ PyPSA-based Energy System Optimizer
 CHP + Boiler model using PyPSA framework
 """
 
+import linopy
+import numpy as np
 import pypsa
 import pandas as pd
 
+from .dispatch import commitment_mode, commitment_settings, objective_coefficients, repair_commitment
+from ..utils import instrumentation
+from ..utils.cache import RESULT_CACHE_VERSION, fingerprint, lookup_result, save_result
+from ..utils.export import export_settings, open_export, run_export
+from ..utils.instrumentation import instrumented, phase
+from ..utils.solver_options import (
+    active_options, linopy_options, solver_options, stop_gap, stop_time,
+)
+from ..utils.telemetry import SolveMonitor, early_stop_rules, relative_gap, telemetry_settings
+
 
 class PyPSAOptimizer:
     """PyPSA optimizer for CHP + Boiler energy system."""
@@ -15,7 +27,15 @@ class PyPSAOptimizer:
         self.cfg = cfg
         self.network = None
         self.results = None
-
+        self.objective_value = None
+        self.export_thread = None
+        self.from_cache = False
+        self.stop_reason = None
+        self.relaxed = False
+        self.relaxation = None
+        self.status = None
+
+    @instrumented("pypsa", "build")
     def build_model(self) -> None:
         """Build the PyPSA network with all components."""
         self.network = pypsa.Network()
@@ -31,9 +51,7 @@ class PyPSAOptimizer:
         self.network.set_snapshots(self.data.index)
 
         # Gas cost including CO2 price
-        co2_price = self.cfg["data"]["co2_price"]
-        co2_intensity = self.cfg["economics"]["co2_intensity_gas"]
-        gas_cost_total = self.data["price_gas"] + (co2_price * co2_intensity)
+        gas_cost_total = self._gas_cost_total()
 
         # Gas supply generator
         self.network.add(
@@ -94,6 +112,12 @@ class PyPSAOptimizer:
             carrier="heat",
         )
 
+    def _gas_cost_total(self) -> pd.Series:
+        """Gas price plus CO2 cost per MWh of gas."""
+        co2_price = self.cfg["data"]["co2_price"]
+        co2_intensity = self.cfg["economics"]["co2_intensity_gas"]
+        return self.data["price_gas"] + (co2_price * co2_intensity)
+
     def add_custom_constraints(self) -> None:
         """Add custom constraints to the model (call after create_model)."""
         m = self.network.model
@@ -103,28 +127,360 @@ class PyPSAOptimizer:
         boiler_p = m["Link-p"].sel(name="Boiler")
         m.add_constraints(chp_p - boiler_p >= 0, name="CHP_gas_geq_Boiler_gas")
 
-    def solve(self, solver_name: str = "scip") -> None:
-        """Solve the optimization problem."""
-        # Create the optimization model
-        self.network.optimize.create_model()
+    def solve(self, solver_name: str = "scip", export_readable: bool = None,
+              use_cache: bool = True) -> None:
+        """
+        Solve the optimization problem.
+
+        In relaxed-commitment mode (see the "commitment" config) the CHP
+        commitment is linearized and solved with the LP solver of that
+        section instead of solver_name.
+
+        Args:
+            solver_name: Solver passed to linopy
+            export_readable: Write the readable model (None = "export" config)
+            use_cache: Return cached results for unchanged inputs (see the
+                "result_cache" config); False always builds and solves
+        """
+        self.relaxed = commitment_mode(self.cfg, len(self.data)) == "relaxed"
+        if self.relaxed:
+            solver_name = commitment_settings(self.cfg)["pypsa_lp_solver"]
+        key = self._cache_key(solver_name) if use_cache else None
+        cached = lookup_result(self.cfg, "pypsa", key, self.network.snapshots)
+        if cached is not None:
+            self.results, extra = cached
+            self.objective_value = extra["objective_value"]
+            self.from_cache = True
+            self.status = "ok"
+            print("PyPSA results loaded from cache")
+            return
+
+        self._create_model()
+
+        # Export readable model (opt-in, see the "export" config)
+        settings = export_settings(self.cfg)
+        if export_readable is None:
+            export_readable = settings["enabled"]
+        if export_readable:
+            # Snapshot the model first; the solve sanitizes it, assigns the
+            # solution and (relaxed mode) fixes the commitment
+            model = self.network.model.copy() if settings["background"] else None
+            self.export_thread = run_export(
+                lambda: self.export_readable_model(
+                    "results/pypsa_model_readable.txt",
+                    max_rows=settings["max_rows"],
+                    compress=settings["gzip"],
+                    model=model,
+                ),
+                settings["background"],
+            )
+
+        status = self._solve_model(solver_name)
+
+        if status == "ok":
+            save_result(self.cfg, "pypsa", key, self.results,
+                        {"objective_value": self.objective_value})
+
+    def _create_model(self) -> None:
+        """Create the linopy model with the custom constraints."""
+        with phase("pypsa", "create_model", steps=len(self.data)) as record:
+            self.network.optimize.create_model(linearized_unit_commitment=self.relaxed)
+            self.add_custom_constraints()
+            if instrumentation.enabled():
+                record.update(self.model_size())
+
+    def _solve_model(self, solver_name: str) -> str:
+        """Solve the linopy model, extract the results and return the solver status."""
+        settings = telemetry_settings(self.cfg)
+        options = linopy_options(solver_name, solver_options(self.cfg, len(self.data)))
+        if options:
+            print(f"Solver options: {options}")
+        self.stop_reason = None
+        if self.relaxed:
+            # Undo the commitment fixed by the last repair
+            self.network.model["Link-status"].unfix()
+        with phase("pypsa", "solve", solver=solver_name, relaxed=self.relaxed,
+                   options=options) as record:
+            if settings["enabled"] and solver_name == "highs":
+                status, condition = self._solve_monitored(settings, options)
+            else:
+                if settings["enabled"]:
+                    print(f"Solver telemetry needs HiGHS; solving with {solver_name} without it")
+                status, condition = self.network.optimize.solve_model(
+                    solver_name=solver_name, solver_options=options)
+            record["status"] = condition
+        if self.stop_reason is not None:
+            print(f"Stopped early ({self.stop_reason}).")
+        if self.relaxed and status == "ok":
+            status = self._repair_relaxation(solver_name, options)
+        with phase("pypsa", "extract"):
+            self._extract_results()
+        self.status = status
+        return status
+
+    def _repair_relaxation(self, solver_name: str, options: dict) -> str:
+        """
+        Turn the solved linearized commitment into an integer-feasible schedule.
 
-        # Add custom constraints
-        self.add_custom_constraints()
+        The fractional CHP status is rounded and repaired (see
+        repair_commitment), fixed in the linopy model, and the LP is
+        solved again for the best dispatch of that commitment. The
+        relaxation cost bounds the MILP optimum from below, so the gap to
+        it bounds the error of the schedule.
 
-        # Export readable model
-        self.export_readable_model("results/pypsa_model_readable.txt")
+        Args:
+            solver_name: LP solver passed to linopy
+            options: Solver options from linopy_options()
 
-        # Solve
-        self.network.optimize.solve_model(solver_name=solver_name)
-        self._extract_results()
+        Returns:
+            Solver status of the dispatch solve
+        """
+        m = self.network.model
+        bound = float(m.objective.value)
+        status_var = m["Link-status"]
+        fractional = status_var.solution.sel(name="CHP").values
+        coeff_chp, coeff_boiler = objective_coefficients(self.data, self.cfg)
+
+        demand = self.data["demand_th"].values
+
+        with phase("pypsa", "repair", steps=len(self.data)) as record:
+            # CHP_gas_geq_Boiler_gas: with the CHP off the boiler is off too
+            fixed = status_var.solution.copy()
+            fixed.loc[{"name": "CHP"}] = repair_commitment(
+                fractional, coeff_chp, coeff_boiler, demand,
+                self.cfg["chp"], self.cfg["boiler"], must_run=demand > 0)
+            status_var.fix(fixed)
+            status, condition = self.network.optimize.solve_model(
+                solver_name=solver_name, solver_options=options)
+            record["status"] = condition
+            if status != "ok":
+                print(f"Repaired commitment could not be dispatched ({condition}).")
+                return status
+
+            cost = float(m.objective.value)
+            self.relaxation = {
+                "bound": bound,
+                "objective": cost,
+                "gap": relative_gap(cost, bound),
+                "fractional_hours": int(((fractional > 1e-6) & (fractional < 1 - 1e-6)).sum()),
+            }
+            record.update(self.relaxation)
+        print(f"Relaxed commitment: LP bound {bound:,.2f} EUR cost, repaired schedule "
+              f"{cost:,.2f} EUR (gap at most {self.relaxation['gap']:.3%}, "
+              f"{self.relaxation['fractional_hours']} fractional hours rounded).")
+        return status
+
+    def _solve_monitored(self, settings: dict, options: dict) -> tuple:
+        """
+        Solve with HiGHS and record its progress through HiGHS callbacks.
+
+        linopy's solve_model() gives no access to the HiGHS instance before
+        it runs, so the solver is built with linopy's low-level API and the
+        results are assigned to the network as solve_model() would. The
+        gap and time rules of the "telemetry" config are passed to HiGHS
+        together with the "solver_options" ones (whichever stops first);
+        the stall rule sets the HiGHS time limit to zero from the callback,
+        which ends the solve with the incumbent ("time_limit" condition).
+
+        Args:
+            settings: "telemetry" settings
+            options: HiGHS options from linopy_options()
+
+        Returns:
+            Tuple of (status, condition) as from solve_model()
+        """
+        import highspy
 
-    def export_readable_model(self, filepath: str) -> None:
-        """Export the model in a human-readable format."""
         m = self.network.model
+        options = dict(options)
+        if settings["gap"] is not None:
+            options["mip_rel_gap"] = stop_gap(settings["gap"], options.get("mip_rel_gap"))
+        limit = stop_time(settings["time_limit_s"], options.get("time_limit"))
+        if limit is not None:
+            options["time_limit"] = limit
+        m.constraints.sanitize_zeros()
+        m.constraints.sanitize_infinities()
+        solver = linopy.solvers.Solver.from_name(
+            "highs", model=m, io_api="direct", options=options, set_names=False)
+        h = solver.solver_model
+        monitor = SolveMonitor("pypsa", settings, sense=m.sense, solver="highs",
+                               steps=len(self.data))
+        kinds = highspy.cb.HighsCallbackType
+
+        def callback(kind, message, data_out, data_in, user_data):
+            improving = kind == kinds.kCallbackMipImprovingSolution
+            reason = monitor.update(
+                incumbent=data_out.objective_function_value if improving else None,
+                bound=data_out.mip_dual_bound,
+                nodes=int(data_out.mip_node_count),
+            )
+            if reason is not None and self.stop_reason is None:
+                self.stop_reason = reason
+                h.setOptionValue("time_limit", 0.0)
+
+        h.setCallback(callback, None)
+        h.startCallback(kinds.kCallbackMipImprovingSolution)
+        h.startCallback(kinds.kCallbackMipInterrupt)
+        result = solver.solve()
+        status, condition = m.assign_result(result, solver)
+        monitor.update(bound=result.report.dual_bound if result.report else None)
+        monitor.finish(condition)
+
+        if status == "ok":
+            self.network.optimize.assign_solution()
+            self.network.optimize.assign_duals(False)
+            self.network.optimize.post_processing()
+        return status, condition
+
+    def model_size(self) -> dict:
+        """Return the number of variables, constraints and nonzeros of the linopy model."""
+        m = self.network.model
+        return {
+            "n_vars": int(m.nvars),
+            "n_cons": int(m.ncons),
+            "n_nonzeros": int(m.matrices.A.nnz),
+        }
+
+    def _cache_key(self, solver_name: str) -> str:
+        """Fingerprint of everything the solved results depend on."""
+        return fingerprint(
+            "pypsa",
+            RESULT_CACHE_VERSION,
+            self.data,
+            {section: self.cfg[section] for section in ("chp", "boiler", "economics")},
+            self.cfg["data"]["co2_price"],
+            solver_name,
+            early_stop_rules(self.cfg),
+            self.relaxed,
+            active_options(solver_options(self.cfg, len(self.data))),
+        )
+
+    def update_parameters(
+        self,
+        price_el=None,
+        price_gas=None,
+        co2_price: float = None,
+        demand_th=None,
+    ) -> None:
+        """
+        Update time-varying parameters of the built network and model.
+
+        The marginal costs of Gas_Supply and Market_Sale and the p_set of
+        Heat_Load are written to the network and, if the linopy model
+        exists, patched into its objective and heat balance, so resolve()
+        skips the network and model build.
+
+        Args:
+            price_el: New electricity prices, one per snapshot
+            price_gas: New gas prices, one per snapshot
+            co2_price: New CO2 price (EUR/t)
+            demand_th: New heat demand, one per snapshot
+        """
+        if self.network is None:
+            raise ValueError("Network not built yet; call build_model() first.")
+
+        data = self.data.copy()
+        for col, values in (("price_el", price_el), ("price_gas", price_gas),
+                            ("demand_th", demand_th)):
+            if values is not None:
+                values = np.asarray(values, dtype=float)
+                if len(values) != len(data):
+                    raise ValueError(
+                        f"{col} has {len(values)} values, network has {len(data)} snapshots.")
+                data[col] = values
+        self.data = data
+
+        if co2_price is not None:
+            self.cfg = {**self.cfg, "data": {**self.cfg["data"], "co2_price": co2_price}}
+
+        n = self.network
+        n.generators_t.marginal_cost["Gas_Supply"] = self._gas_cost_total()
+        n.generators_t.marginal_cost["Market_Sale"] = -self.data["price_el"]
+        n.loads_t.p_set["Heat_Load"] = self.data["demand_th"]
+
+        if n.model is not None:
+            self._update_objective()
+            if demand_th is not None:
+                # The heat bus balance has the heat load as right-hand side
+                balance = n.model.constraints["Bus-nodal_balance"]
+                rhs = balance.rhs.copy()
+                rhs.loc[{"name": "heat"}] = self.data["demand_th"].values
+                balance.rhs = rhs
+
+    def _update_objective(self) -> None:
+        """Write the current generator marginal costs into the objective."""
+        n = self.network
+        m = n.model
+        generators = ["Gas_Supply", "Market_Sale"]
+
+        labels = m["Generator-p"].labels.sel(name=generators).values.ravel()
+        costs = n.generators_t.marginal_cost[generators].mul(
+            n.snapshot_weightings.objective, axis=0
+        )
+        new_coeffs = pd.Series(costs.values.ravel(), index=labels)
+
+        data = m.objective.expression.data
+        term_vars = data["vars"].values
+        coeffs = data["coeffs"].values.copy()
+        in_objective = np.isin(term_vars, labels)
+        coeffs[in_objective] = new_coeffs.reindex(term_vars[in_objective]).values
+
+        # Generators without a term so far (zero cost at build time)
+        missing = np.setdiff1d(labels, term_vars)
+        term_vars = np.concatenate([term_vars, missing])
+        coeffs = np.concatenate([coeffs, new_coeffs.reindex(missing).values])
+
+        data = data.drop_vars(["coeffs", "vars"]).assign(
+            coeffs=("_term", coeffs), vars=("_term", term_vars)
+        )
+        m.objective = linopy.LinearExpression(data, m)
+
+    def resolve(self, solver_name: str = "scip") -> pd.DataFrame:
+        """
+        Re-solve the existing linopy model after update_parameters().
+
+        Args:
+            solver_name: Solver passed to linopy
+
+        Returns:
+            Results DataFrame
+        """
+        if self.network is None or (self.network.model is None and self.results is None):
+            raise ValueError("Model not created yet; call solve() first.")
+        if self.network.model is None:
+            # solve() returned cached results; the network holds the updates
+            self._create_model()
+
+        self.from_cache = False
+        self._solve_model(solver_name)
+        return self.results
+
+    def export_readable_model(
+        self, filepath: str, max_rows: int = 200, compress: bool = False,
+        model: linopy.Model = None,
+    ) -> None:
+        """
+        Export the model in a human-readable format.
+
+        Sections are written and flushed one at a time, and every variable
+        or constraint block is cut after max_rows rows.
+
+        Args:
+            filepath: Target path
+            max_rows: Rows printed per block (0 = no limit)
+            compress: Write gzip-compressed output
+            model: Model to export (None = the network's current model)
+        """
+        m = model if model is not None else self.network.model
+        f, filepath = open_export(filepath, compress)
+        display_rows = max_rows or max(
+            [m.variables[v].size for v in m.variables]
+            + [m.constraints[c].size for c in m.constraints]
+        )
 
-        print(m)
+        with f, linopy.options as options:
+            options.set_value(display_max_rows=display_rows)
 
-        with open(filepath, "w", encoding="utf-8") as f:
             # === PyPSA MODEL - HUMAN READABLE FORMAT ===
             f.write("PyPSA MODEL - Human Readable Format\n")
             f.write("\nOBJECTIVE FUNCTION\n")
@@ -231,6 +587,7 @@ class PyPSAOptimizer:
             },
             index=snaps,
         )
+        self.objective_value = float(self.network.model.objective.value)
 
         # Print summary
         print("\n--- PyPSA Results Summary ---")
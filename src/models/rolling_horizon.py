@@ -0,0 +1,204 @@
+"""
+Rolling-Horizon Wrapper
+Solves long horizons window by window with ORToolsOptimizer
+"""
+
+import time
+
+import pandas as pd
+
+from .dispatch import evaluate_objective
+from .ortools_model import ORToolsOptimizer
+from ..utils.config import override_section
+from ..utils.parallel import execution_settings, resolve_workers, run_parallel
+
+
+def resolve_window(rh_cfg: dict) -> tuple:
+    """
+    Resolve window, commit and overlap lengths from the config.
+
+    Any two of window_hours, commit_hours and overlap_hours define the
+    third (window = commit + overlap).
+
+    Args:
+        rh_cfg: The "rolling_horizon" config section
+
+    Returns:
+        Tuple of (window_hours, commit_hours, overlap_hours)
+    """
+    window = rh_cfg.get("window_hours")
+    commit = rh_cfg.get("commit_hours")
+    overlap = rh_cfg.get("overlap_hours")
+
+    if window is None:
+        if commit is None or overlap is None:
+            raise ValueError("rolling_horizon needs two of window_hours, "
+                             "commit_hours and overlap_hours.")
+        window = commit + overlap
+    elif commit is None:
+        commit = window - (overlap or 0)
+    if overlap is None:
+        overlap = window - commit
+
+    if commit <= 0 or overlap < 0 or window != commit + overlap:
+        raise ValueError(
+            f"Invalid rolling horizon: window={window}, commit={commit}, "
+            f"overlap={overlap} (need commit > 0 and window = commit + overlap)."
+        )
+    return window, commit, overlap
+
+
+def _solve_window(task: tuple, shared: dict) -> dict:
+    """Solve one independent window (runs inside a worker process)."""
+    start, end = task
+    optimizer = ORToolsOptimizer(shared["data"].iloc[start:end], shared["cfg"])
+    results = optimizer.optimize(use_cache=False)
+    if results is None:
+        raise RuntimeError("No optimal solution found.")
+    return {
+        "results": results,
+        "timings": optimizer.timings,
+        "objective_value": optimizer.objective_value,
+    }
+
+
+class RollingHorizonOptimizer:
+    """Rolling-horizon optimizer for multi-year CHP + Boiler runs."""
+
+    def __init__(self, data: pd.DataFrame, config: dict, initial_status: int = 0):
+        self.data = data
+        self.cfg = config
+        self.initial_status = initial_status
+        self.results = None
+        self.objective_value = None
+        self.window_stats = None
+
+        self.window, self.commit, self.overlap = resolve_window(
+            config.get("rolling_horizon", {})
+        )
+
+        # One LP export per window would dominate the run time
+        self.window_cfg = override_section(config, "export", enabled=False)
+
+    def windows(self) -> list:
+        """Return (start, end, n_commit) positions of all windows."""
+        T = len(self.data)
+        windows = []
+        start = 0
+        while start < T:
+            end = min(start + self.window, T)
+            n_commit = end - start if end == T else self.commit
+            windows.append((start, end, n_commit))
+            start += n_commit
+        return windows
+
+    def optimize(self) -> pd.DataFrame:
+        """Solve all windows and stitch the committed hours."""
+        windows = self.windows()
+        print(f"Rolling horizon: {len(self.data)} hours in {len(windows)} windows "
+              f"(window {self.window}h, commit {self.commit}h, overlap {self.overlap}h)")
+
+        workers = resolve_workers(execution_settings(self.cfg)["workers"])
+        if workers > 1 and self.cfg["chp"].get("startup_cost", 0.0):
+            print("Start-up costs couple the windows; solving them in sequence.")
+            workers = 1
+
+        if workers > 1:
+            committed, stats = self._optimize_parallel(windows, workers)
+        else:
+            committed, stats = self._optimize_serial(windows)
+
+        self.results = pd.concat(committed)
+        self.results.index = self.data.index
+        self.window_stats = pd.DataFrame(stats).set_index("window")
+
+        print("\n--- Rolling Horizon Window Timings ---")
+        print(self.window_stats[["hours", "committed", "build_s", "solve_s", "total_s"]].round(3))
+
+        self.objective_value = evaluate_objective(
+            self.results, self.data, self.cfg, self.initial_status
+        )
+        print(f"Stitched profit: {self.objective_value:,.2f} EUR")
+        return self.results
+
+    def _window_failed(self, k: int, start: int, end: int, reason: str) -> RuntimeError:
+        """Return the error for a window without a solution, naming its hours."""
+        return RuntimeError(
+            f"Window {k} (hours {start}-{end - 1}, {self.data.index[start]} - "
+            f"{self.data.index[end - 1]}) {reason}"
+        )
+
+    def _optimize_serial(self, windows: list) -> tuple:
+        """Solve windows in order, carrying the CHP state between them."""
+        status = self.initial_status
+        committed = []
+        stats = []
+        for k, (start, end, n_commit) in enumerate(windows):
+            window_data = self.data.iloc[start:end]
+            optimizer = ORToolsOptimizer(window_data, self.window_cfg, initial_status=status)
+
+            t0 = time.perf_counter()
+            # Per-window entries would evict the useful ones from the result cache
+            results = optimizer.optimize(use_cache=False)
+            if results is None:
+                raise self._window_failed(k, start, end, "has no optimal solution.")
+
+            part = results.iloc[:n_commit]
+            committed.append(part)
+            stats.append({
+                "window": k,
+                "start": window_data.index[0],
+                "end": window_data.index[-1],
+                "hours": end - start,
+                "committed": n_commit,
+                "initial_status": status,
+                "build_s": optimizer.timings.get("build"),
+                "solve_s": optimizer.timings.get("solve"),
+                "total_s": time.perf_counter() - t0,
+                "window_objective": optimizer.objective_value,
+            })
+
+            # Carry the CHP state of the last committed hour
+            status = int(round(part["chp_status"].iloc[-1]))
+            del optimizer, results
+
+        return committed, stats
+
+    def _optimize_parallel(self, windows: list, workers: int) -> tuple:
+        """Solve independent windows in a process pool."""
+        records = run_parallel(
+            _solve_window,
+            [(start, end) for start, end, _ in windows],
+            workers=workers,
+            shared={"data": self.data, "cfg": self.window_cfg},
+        )
+
+        # Same policy as the serial path: the first failed window ends the run
+        for k, ((start, end, _), record) in enumerate(zip(windows, records)):
+            if not record["ok"]:
+                reason = record["error"].splitlines()[0]
+                raise self._window_failed(k, start, end, f"failed: {reason}")
+
+        committed = []
+        stats = []
+        for k, ((start, end, n_commit), record) in enumerate(zip(windows, records)):
+            window = record["result"]
+            committed.append(window["results"].iloc[:n_commit])
+            stats.append({
+                "window": k,
+                "start": self.data.index[start],
+                "end": self.data.index[end - 1],
+                "hours": end - start,
+                "committed": n_commit,
+                "initial_status": None,
+                "build_s": window["timings"].get("build"),
+                "solve_s": window["timings"].get("solve"),
+                "total_s": record["elapsed"],
+                "window_objective": window["objective_value"],
+            })
+
+        return committed, stats
+
+    def get_results(self) -> pd.DataFrame:
+        """Return the results DataFrame."""
+        return self.results
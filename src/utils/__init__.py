@@ -1,4 +1,19 @@
-# Utility functions
-from .dataloader import load_config, process_energy_data
-from .plotting import plot_network, plot_results_comparison
-from .analysis import compare_results
+# Utility functions, imported on first access so that loading data does
+# not pull in the plotting stack
+import importlib
+
+_EXPORTS = {
+    "load_config": ".dataloader",
+    "process_energy_data": ".dataloader",
+    "plot_network": ".plotting",
+    "plot_results_comparison": ".plotting",
+    "compare_results": ".analysis",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
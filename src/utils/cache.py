@@ -0,0 +1,325 @@
+"""
+Data Cache Utilities
+Content fingerprints and a columnar on-disk store for time series
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .config import config_section
+from .instrumentation import phase
+
+
+# Defaults of the "cache" config section
+CACHE_DEFAULTS = {
+    "enabled": True,
+    "dir": "data/cache",
+}
+
+# Defaults of the "result_cache" config section
+RESULT_CACHE_DEFAULTS = {
+    "enabled": True,
+    "dir": "data/cache/results",
+    "max_mb": 100,  # Least recently used entries are evicted beyond this
+}
+
+# Bump when the optimizers change their results, so cached runs are re-solved
+RESULT_CACHE_VERSION = 2
+
+
+def cache_settings(cfg: dict) -> dict:
+    """Return the "cache" config section merged with the defaults."""
+    return config_section(cfg, "cache", CACHE_DEFAULTS)
+
+
+def result_cache_settings(cfg: dict) -> dict:
+    """Return the "result_cache" config section merged with the defaults."""
+    return config_section(cfg, "result_cache", RESULT_CACHE_DEFAULTS)
+
+
+def file_hash(filepath: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Return a SHA-256 hex digest of a DataFrame's values, index and columns."""
+    h = hashlib.sha256()
+    h.update(json.dumps([str(c) for c in df.columns]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def fingerprint(*parts) -> str:
+    """
+    Combine inputs into one SHA-256 fingerprint.
+
+    Args:
+        *parts: DataFrames, bytes or JSON-serializable values (config
+            sections, file hashes, version tags)
+
+    Returns:
+        Hex digest that changes whenever any part changes
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            h.update(frame_hash(part).encode())
+        elif isinstance(part, bytes):
+            h.update(part)
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _entry_dir(cache_dir: str, name: str, key: str) -> str:
+    return os.path.join(cache_dir, f"{name}-{key[:16]}")
+
+
+def save_frame(df: pd.DataFrame, cache_dir: str, name: str, key: str,
+               replace: bool = True, extra: dict = None) -> str:
+    """
+    Store a datetime-indexed DataFrame as one .npy file per column.
+
+    Args:
+        df: DataFrame with a DatetimeIndex and numeric columns
+        cache_dir: Cache root directory
+        name: Dataset name
+        key: Fingerprint of the inputs the frame was built from
+        replace: Remove older entries with the same name, so the cache
+            holds one version per dataset; otherwise an existing entry
+            for the key (e.g. from a concurrent writer) is kept
+        extra: JSON-serializable values stored in the entry's metadata
+
+    Returns:
+        Path of the cache entry
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    target = _entry_dir(cache_dir, name, key)
+
+    # Write to a temporary directory first so readers never see half an entry
+    tmp = tempfile.mkdtemp(prefix=f".{name}-", dir=cache_dir)
+    np.save(os.path.join(tmp, "index.npy"), df.index.values)
+    for i, col in enumerate(df.columns):
+        np.save(os.path.join(tmp, f"col{i}.npy"), df[col].to_numpy())
+    meta = {
+        "name": name,
+        "key": key,
+        "rows": len(df),
+        "columns": [str(c) for c in df.columns],
+        "index_name": df.index.name,
+        "sorted": bool(df.index.is_monotonic_increasing),
+        "extra": extra or {},
+    }
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    if replace:
+        for entry in os.listdir(cache_dir):
+            if entry.startswith(f"{name}-"):
+                shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        # Another writer stored the same key first; its entry is as good
+        if not os.path.isdir(target):
+            raise
+    return target
+
+
+def load_meta(cache_dir: str, name: str, key: str) -> dict:
+    """Return the metadata of a cache entry, or None if there is no entry for this key."""
+    meta_path = os.path.join(_entry_dir(cache_dir, name, key), "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    return meta if meta["key"] == key else None
+
+
+def find_meta(cache_dir: str, name: str) -> dict:
+    """
+    Return the metadata of the entry stored for a dataset under any key.
+
+    save_frame with replace=True keeps one entry per dataset, so this is
+    the latest version; None if there is none.
+    """
+    if not os.path.isdir(cache_dir):
+        return None
+    for entry in sorted(os.listdir(cache_dir)):
+        if entry.startswith(".") or entry.rsplit("-", 1)[0] != name:
+            continue
+        try:
+            with open(os.path.join(cache_dir, entry, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            # Entry being written or removed by another process
+            continue
+        if meta.get("name") == name:
+            return meta
+    return None
+
+
+def load_index(cache_dir: str, name: str, key: str) -> np.ndarray:
+    """
+    Memory-map the datetime index of a cache entry.
+
+    Args:
+        cache_dir: Cache root directory
+        name: Dataset name
+        key: Expected fingerprint
+
+    Returns:
+        Read-only datetime64 array, or None if there is no entry for this key
+    """
+    if load_meta(cache_dir, name, key) is None:
+        return None
+    return np.load(os.path.join(_entry_dir(cache_dir, name, key), "index.npy"),
+                   mmap_mode="r")
+
+
+def load_frame(cache_dir: str, name: str, key: str, ranges: list = None) -> pd.DataFrame:
+    """
+    Load a DataFrame stored with save_frame.
+
+    Columns are memory-mapped, so with ranges only the requested rows are
+    read from disk.
+
+    Args:
+        cache_dir: Cache root directory
+        name: Dataset name
+        key: Expected fingerprint
+        ranges: Optional list of (start, stop) row positions to read
+
+    Returns:
+        The cached DataFrame (or its selected rows), or None if there is
+        no entry for this key
+    """
+    meta = load_meta(cache_dir, name, key)
+    if meta is None:
+        return None
+    entry = _entry_dir(cache_dir, name, key)
+
+    def read(filename: str) -> np.ndarray:
+        values = np.load(os.path.join(entry, filename), mmap_mode="r")
+        if ranges is None:
+            return np.array(values)
+        return np.concatenate([values[start:stop] for start, stop in ranges]
+                              or [values[:0]])
+
+    index = pd.DatetimeIndex(read("index.npy"), name=meta["index_name"])
+    return pd.DataFrame(
+        {col: read(f"col{i}.npy") for i, col in enumerate(meta["columns"])},
+        index=index,
+    )
+
+
+def load_result(cfg: dict, name: str, key: str) -> tuple:
+    """
+    Look up solved results in the result cache.
+
+    Args:
+        cfg: Configuration dictionary (uses the "result_cache" section)
+        name: Backend name, e.g. "ortools"
+        key: Fingerprint of data, config and solver settings
+
+    Returns:
+        Tuple of (results DataFrame, stored extra values), or None on a
+        miss or with the cache disabled
+    """
+    settings = result_cache_settings(cfg)
+    if not settings["enabled"]:
+        return None
+    # Another process may evict the entry at any point; the metadata is
+    # read once, and a partly read entry counts as a miss
+    try:
+        meta = load_meta(settings["dir"], name, key)
+        results = load_frame(settings["dir"], name, key) if meta is not None else None
+    except OSError:
+        return None
+    if results is None:
+        return None
+    try:
+        # Mark as recently used for the eviction order
+        os.utime(os.path.join(_entry_dir(settings["dir"], name, key), "meta.json"))
+    except OSError:
+        pass
+    return results, meta.get("extra", {})
+
+
+def lookup_result(cfg: dict, name: str, key: str, index: pd.Index) -> tuple:
+    """
+    Look up an optimizer's results, recorded as its "cache_lookup" phase.
+
+    Args:
+        cfg: Configuration dictionary (uses the "result_cache" section)
+        name: Backend name, also the component of the phase record
+        key: Fingerprint of data, config and solver settings, or None to
+            skip the lookup (use_cache=False)
+        index: Index of the optimizer's data, given to the cached results
+
+    Returns:
+        Tuple of (results DataFrame, stored extra values), or None on a
+        miss, without a key or with the cache disabled
+    """
+    with phase(name, "cache_lookup", steps=len(index), enabled=key is not None) as record:
+        cached = load_result(cfg, name, key) if key is not None else None
+        record["hit"] = cached is not None
+    if cached is not None:
+        # The stored index loses its frequency
+        cached[0].index = index
+    return cached
+
+
+def save_result(cfg: dict, name: str, key: str, results: pd.DataFrame, extra: dict = None) -> None:
+    """
+    Store solved results in the result cache and evict old entries.
+
+    Args:
+        cfg: Configuration dictionary (uses the "result_cache" section)
+        name: Backend name, e.g. "ortools"
+        key: Fingerprint of data, config and solver settings (None = do
+            not store, see lookup_result)
+        results: Results DataFrame with a DatetimeIndex
+        extra: JSON-serializable values such as the objective value
+    """
+    settings = result_cache_settings(cfg)
+    if key is None or not settings["enabled"]:
+        return
+    save_frame(results, settings["dir"], name, key, replace=False, extra=extra)
+    _evict(settings["dir"], settings["max_mb"] * 1024 * 1024)
+
+
+def _evict(cache_dir: str, max_bytes: float) -> None:
+    """Remove least recently used entries until the directory fits in max_bytes."""
+    entries = []
+    for entry in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, entry)
+        meta_path = os.path.join(path, "meta.json")
+        if entry.startswith("."):
+            continue
+        try:
+            size = sum(e.stat().st_size for e in os.scandir(path))
+            entries.append((os.path.getmtime(meta_path), size, path))
+        except OSError:
+            # Entry being written or removed by another process
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
@@ -0,0 +1,42 @@
+"""
+Config Section Utilities
+Access to optional config sections with their defaults filled in
+"""
+
+import copy
+
+
+def config_section(cfg: dict, name: str, defaults: dict) -> dict:
+    """
+    Return a config section merged with its defaults.
+
+    Every optional section (e.g. "cache", "telemetry") has an
+    X_DEFAULTS dict next to the code that uses it; a missing or empty
+    section gives the defaults.
+
+    Args:
+        cfg: Configuration dictionary
+        name: Section name, e.g. "export"
+        defaults: Default values of the section
+
+    Returns:
+        New dictionary with the defaults overridden by the configured values
+    """
+    return {**defaults, **(cfg.get(name) or {})}
+
+
+def override_section(cfg: dict, name: str, **values) -> dict:
+    """
+    Return a deep copy of the config with some values of a section replaced.
+
+    Args:
+        cfg: Configuration dictionary (not modified)
+        name: Section name, e.g. "export"
+        **values: Values to set in that section
+
+    Returns:
+        The modified copy
+    """
+    cfg = copy.deepcopy(cfg)
+    cfg[name] = {**(cfg.get(name) or {}), **values}
+    return cfg
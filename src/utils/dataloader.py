@@ -2,9 +2,35 @@
 Data Loading and Configuration Utilities
 """
 
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
 import pandas as pd
 import yaml
 
+from .cache import (
+    cache_settings, file_hash, find_meta, fingerprint, load_frame, load_index, load_meta,
+    save_frame
+)
+from .instrumentation import instrumented
+from .prices import format_summary, parse_price_csv, read_price_csv
+from .projection import DemandProjection
+
+
+# Bump when process_energy_data changes, so cached results are rebuilt
+PROCESSING_VERSION = 2
+
+INTERIM_1YEAR = "data/interim/data_1year_strict.csv"
+INTERIM_5YEAR = "data/interim/data_5year_synthetic.csv"
+
+# Raw price files (config key -> column) and the file in the cache directory
+# that records how far each of them has been ingested
+PRICE_SOURCES = {"electricity_price": "price_el", "gas_price": "price_gas"}
+INGEST_STATE_FILE = "ingest_state.json"
+
 
 def load_config(config_path: str = "config/model_config.yaml") -> dict:
     """Load configuration from YAML file."""
@@ -12,10 +38,14 @@ def load_config(config_path: str = "config/model_config.yaml") -> dict:
         return yaml.safe_load(f)
 
 
+@instrumented("dataloader")
 def load_data(filepath: str, cfg: dict) -> pd.DataFrame:
     """
     Load and filter data based on configuration.
 
+    With the cache enabled, only the months/days selected in the settings
+    are read from disk; the filters below then apply to that window.
+
     Args:
         filepath: Path to the CSV data file
         cfg: Configuration dictionary
@@ -24,24 +54,25 @@ def load_data(filepath: str, cfg: dict) -> pd.DataFrame:
         Filtered DataFrame
     """
     print(f"Loading data from {filepath}...")
-    df = pd.read_csv(filepath, parse_dates=["datetime"], index_col="datetime")
+    target_months = cfg["settings"].get("month", [])
+    if target_months and not isinstance(target_months, list):
+        target_months = [target_months]
+    target_day = cfg["settings"].get("day")
+    target_hour = cfg["settings"].get("hour")
+
+    df = read_interim(filepath, cfg, months=target_months, day=target_day)
 
     # Filter by month if specified
-    target_months = cfg["settings"].get("month", [])
     if target_months:
-        if not isinstance(target_months, list):
-            target_months = [target_months]
         print(f"Filtering for Month(s): {target_months}...")
         df = df[df.index.month.isin(target_months)]
 
     # Filter by day if specified
-    target_day = cfg["settings"].get("day")
     if target_day is not None:
         print(f"Filtering for Day: {target_day}...")
         df = df[df.index.day == target_day]
 
     # Filter by hour if specified
-    target_hour = cfg["settings"].get("hour")
     if target_hour is not None:
         print(f"Filtering for Hour: {target_hour}...")
         df = df[df.index.hour == target_hour]
@@ -54,6 +85,91 @@ def load_data(filepath: str, cfg: dict) -> pd.DataFrame:
     return df
 
 
+def time_ranges(index: np.ndarray, months: list = None, day: int = None) -> list:
+    """
+    Find the row ranges of a sorted datetime index that match a month/day filter.
+
+    Each (year, month[, day]) window is located by binary search, so only
+    the index is touched and the cost scales with the number of windows.
+
+    Args:
+        index: Sorted datetime64 array (may be memory-mapped)
+        months: Months to keep (None or empty = all)
+        day: Day of month to keep (None = all)
+
+    Returns:
+        List of (start, stop) row positions, or None when nothing is filtered
+    """
+    if not months and day is None:
+        return None
+    if len(index) == 0:
+        return []
+
+    first = pd.Timestamp(index[0])
+    last = pd.Timestamp(index[-1])
+    ranges = []
+    for year in range(first.year, last.year + 1):
+        for month in sorted(months or range(1, 13)):
+            month_start = pd.Timestamp(year=year, month=month, day=1)
+            if day is None:
+                start, stop = month_start, month_start + pd.DateOffset(months=1)
+            elif day <= month_start.days_in_month:
+                start = month_start + pd.Timedelta(days=day - 1)
+                stop = start + pd.Timedelta(days=1)
+            else:
+                continue
+            lo, hi = np.searchsorted(index, [np.datetime64(start), np.datetime64(stop)])
+            if hi > lo:
+                ranges.append((int(lo), int(hi)))
+    return ranges
+
+
+def read_interim(filepath: str, cfg: dict, months: list = None, day: int = None) -> pd.DataFrame:
+    """
+    Read an interim CSV dataset, through the columnar cache if enabled.
+
+    The cache entry is keyed by path, size and modification time of the
+    CSV, so a warm load does not read the file at all. When these change,
+    the content is hashed: an unchanged file (e.g. touched or copied back)
+    re-keys the stored entry, a changed one is parsed again. From the
+    cache, only the rows in the requested months/day are read.
+
+    Args:
+        filepath: Path to the CSV data file
+        cfg: Configuration dictionary
+        months: Months to read (None or empty = all)
+        day: Day of month to read (None = all)
+
+    Returns:
+        DataFrame indexed by datetime (unfiltered without the cache)
+    """
+    cache = cache_settings(cfg)
+    if not cache["enabled"]:
+        return pd.read_csv(filepath, parse_dates=["datetime"], index_col="datetime")
+
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    stat = os.stat(filepath)
+    key = fingerprint(os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+    meta = load_meta(cache["dir"], name, key)
+    if meta is None:
+        content_hash = file_hash(filepath)
+        previous = find_meta(cache["dir"], name)
+        if previous is not None and previous["extra"].get("content_hash") == content_hash:
+            df = load_frame(cache["dir"], name, previous["key"])
+        else:
+            df = pd.read_csv(filepath, parse_dates=["datetime"], index_col="datetime")
+            print(f"Cached {filepath} in {cache['dir']}")
+        save_frame(df, cache["dir"], name, key, extra={"content_hash": content_hash})
+        meta = load_meta(cache["dir"], name, key)
+
+    # Range lookups need a sorted index; otherwise read everything
+    if not meta.get("sorted"):
+        return load_frame(cache["dir"], name, key)
+    index = load_index(cache["dir"], name, key)
+    return load_frame(cache["dir"], name, key, ranges=time_ranges(index, months, day))
+
+
+@instrumented("dataloader")
 def process_energy_data(cfg: dict) -> tuple:
     """
     Process raw energy data files into clean datasets.
@@ -64,28 +180,27 @@ def process_energy_data(cfg: dict) -> tuple:
     Returns:
         Tuple of (1-year dataset, 5-year synthetic dataset)
     """
-
-    def load_price_csv(filepath, col_name):
-        """Load and clean price CSV file."""
-        df = pd.read_csv(
-            filepath,
-            sep=";",
-            usecols=[1, 2],
-            names=["datetime", col_name],
-            header=None,
-            skiprows=1,
-            decimal=",",
-            parse_dates=["datetime"],
-            dayfirst=True,
-        )
-        df = df.drop_duplicates(subset="datetime").set_index(
-            "datetime").sort_index()
-        df = df.resample("h").asfreq()
-        return df
+    cache = cache_settings(cfg)
+    if cache["enabled"]:
+        raw_files = [cfg["data"][k] for k in ("electricity_price", "gas_price", "heat_demand")]
+        key = fingerprint(PROCESSING_VERSION, [file_hash(path) for path in raw_files])
+        dataset_1y = load_frame(cache["dir"], "processed_1year", key)
+        dataset_5y = load_frame(cache["dir"], "processed_5year", key)
+        state = _load_ingest_state(cache["dir"])
+        if (dataset_1y is not None and dataset_5y is not None
+                and state is not None and state["key"] == key):
+            print("Raw data unchanged, processed datasets loaded from cache")
+            if not os.path.exists(INTERIM_1YEAR):
+                dataset_1y.to_csv(INTERIM_1YEAR, index=True)
+            if not os.path.exists(INTERIM_5YEAR):
+                dataset_5y.to_csv(INTERIM_5YEAR, index=True)
+            return dataset_1y, dataset_5y
 
     # Load price data
-    strom = load_price_csv(cfg["data"]["electricity_price"], "price_el")
-    gas = load_price_csv(cfg["data"]["gas_price"], "price_gas")
+    strom, strom_summary = parse_price_csv(cfg["data"]["electricity_price"], "price_el")
+    gas, gas_summary = parse_price_csv(cfg["data"]["gas_price"], "price_gas")
+    print(format_summary(cfg["data"]["electricity_price"], strom_summary))
+    print(format_summary(cfg["data"]["gas_price"], gas_summary))
 
     # Load heat demand
     waerme = pd.read_excel(
@@ -107,7 +222,7 @@ def process_energy_data(cfg: dict) -> tuple:
     dataset_1y = dataset_1y.ffill().bfill()
 
     # Save 1-year dataset
-    dataset_1y.to_csv("data/interim/data_1year_strict.csv", index=True)
+    dataset_1y.to_csv(INTERIM_1YEAR, index=True)
     print(f"Saved 'data_1year_strict.csv' with shape {dataset_1y.shape}")
 
     # Create 5-year synthetic dataset
@@ -115,36 +230,197 @@ def process_energy_data(cfg: dict) -> tuple:
     dataset_5y = pd.DataFrame(index=full_range)
     dataset_5y = dataset_5y.join(strom).join(gas)
 
-    # Time features for mapping
-    dataset_5y["month"] = dataset_5y.index.month
-    dataset_5y["day"] = dataset_5y.index.day
-    dataset_5y["hour"] = dataset_5y.index.hour
-
-    waerme_source = waerme.copy()
-    waerme_source["month"] = waerme_source.index.month
-    waerme_source["day"] = waerme_source.index.day
-    waerme_source["hour"] = waerme_source.index.hour
-
-    # Merge heat demand
-    dataset_5y_reset = dataset_5y.reset_index()
-    merged = pd.merge(
-        dataset_5y_reset,
-        waerme_source[["month", "day", "hour", "demand_th"]],
-        on=["month", "day", "hour"],
-        how="left",
-    )
-    merged = merged.set_index("datetime")
-    merged = merged.drop(columns=["month", "day", "hour"])
-    merged = merged.ffill().bfill()
+    # Project the one-year heat demand onto the full price horizon
+    projection = DemandProjection(waerme["demand_th"])
+    dataset_5y["demand_th"] = projection.project(dataset_5y.index)
+    merged = dataset_5y.ffill().bfill()
 
     # Save 5-year dataset
-    merged.to_csv("data/interim/data_5year_synthetic.csv", index=True)
+    merged.to_csv(INTERIM_5YEAR, index=True)
     print(f"Saved 'data_5year_synthetic.csv'")
 
+    if cache["enabled"]:
+        save_frame(dataset_1y, cache["dir"], "processed_1year", key)
+        save_frame(merged, cache["dir"], "processed_5year", key)
+        sources = {}
+        for source, series in (("electricity_price", strom), ("gas_price", gas)):
+            path = cfg["data"][source]
+            offset = os.path.getsize(path)
+            sources[source] = {
+                "offset": offset,
+                "tail_hash": _tail_hash(path, offset),
+                "last": str(series.index[-1]),
+            }
+        _save_ingest_state(cache["dir"], {"key": key, "sources": sources})
+
     return dataset_1y, merged
 
 
+@instrumented("dataloader")
+def append_price_data(cfg: dict) -> tuple:
+    """
+    Extend the processed datasets with rows appended to the raw price files.
+
+    Only the bytes after the offsets recorded by the previous run are
+    parsed. New rows must continue after the last ingested timestamp;
+    re-published older rows are ignored (as in the full run, the first
+    value wins) and gaps are reported and forward-filled. The result is
+    the same as a full process_energy_data run on the extended files.
+
+    Args:
+        cfg: Configuration dictionary with data paths
+
+    Returns:
+        Tuple of (1-year dataset, 5-year synthetic dataset)
+    """
+    cache = cache_settings(cfg)
+    if not cache["enabled"]:
+        raise ValueError("Append mode needs the cache (cache.enabled: true).")
+    state = _load_ingest_state(cache["dir"])
+    if state is None:
+        raise ValueError("No ingestion state found; run process_energy_data first.")
+    dataset_1y = load_frame(cache["dir"], "processed_1year", state["key"])
+    dataset_5y = load_frame(cache["dir"], "processed_5year", state["key"])
+    if dataset_1y is None or dataset_5y is None:
+        raise ValueError("Processed datasets not in cache; run process_energy_data first.")
+
+    # Parse only the new bytes of each price file
+    updates = {}
+    for source, col in PRICE_SOURCES.items():
+        path = cfg["data"][source]
+        entry = state["sources"][source]
+        offset = entry["offset"]
+        if os.path.getsize(path) < offset or _tail_hash(path, offset) != entry["tail_hash"]:
+            raise ValueError(
+                f"{path} was modified before the last ingested row; "
+                "run process_energy_data for a full rebuild.")
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        # Leave a partially written last line for the next run
+        chunk = chunk[:chunk.rfind(b"\n") + 1]
+        if not chunk.strip():
+            continue
+
+        last = pd.Timestamp(entry["last"])
+        new = read_price_csv(io.BytesIO(chunk), col, skiprows=0)[col]
+        n_old = int((new.index <= last).sum())
+        if n_old:
+            print(f"{path}: ignored {n_old} rows at or before {last} (already ingested)")
+        new = new[new.index > last]
+        if not new.empty:
+            if new.index[0] > last + pd.Timedelta(hours=1):
+                print(f"{path}: gap from {last} to {new.index[0]}, forward-filled")
+            new = new.reindex(pd.date_range(last + pd.Timedelta(hours=1), new.index[-1],
+                                            freq="h", name=dataset_5y.index.name))
+            updates[col] = (last, new)
+            entry["last"] = str(new.index[-1])
+        entry["offset"] = offset + len(chunk)
+        entry["tail_hash"] = _tail_hash(path, entry["offset"])
+        print(f"{path}: {len(chunk)} new bytes, {len(new)} new hours")
+
+    raw_files = [cfg["data"][k] for k in ("electricity_price", "gas_price", "heat_demand")]
+    key = fingerprint(PROCESSING_VERSION, [file_hash(path) for path in raw_files])
+    state["key"] = key
+
+    if updates:
+        # Extend the 5-year index and project the heat demand onto the new hours
+        n_before = len(dataset_5y)
+        new_index = dataset_5y.index
+        for _, new in updates.values():
+            new_index = new_index.union(new.index)
+        dataset_5y = dataset_5y.reindex(new_index)
+        projection = DemandProjection(dataset_1y["demand_th"])
+        dataset_5y.iloc[n_before:, dataset_5y.columns.get_loc("demand_th")] = (
+            projection.project(dataset_5y.index[n_before:]))
+
+        dataset_5y, start_5y = _apply_price_updates(dataset_5y, updates)
+        dataset_1y, start_1y = _apply_price_updates(dataset_1y, updates)
+
+        _rewrite_csv_tail(INTERIM_5YEAR, dataset_5y, start_5y, n_before - start_5y)
+        print(f"Appended {len(dataset_5y) - n_before} hours to 'data_5year_synthetic.csv'")
+        if start_1y < len(dataset_1y):
+            dataset_1y.to_csv(INTERIM_1YEAR, index=True)
+            print(f"Updated 'data_1year_strict.csv' from {dataset_1y.index[start_1y]}")
+
+    save_frame(dataset_1y, cache["dir"], "processed_1year", key)
+    save_frame(dataset_5y, cache["dir"], "processed_5year", key)
+    _save_ingest_state(cache["dir"], state)
+    return dataset_1y, dataset_5y
+
+
+def _apply_price_updates(frame: pd.DataFrame, updates: dict) -> tuple:
+    """
+    Overwrite price columns after their last ingested hour and re-fill gaps.
+
+    Returns:
+        Tuple of (updated frame, position of the first changed row)
+    """
+    start = len(frame)
+    for col, (last, new) in updates.items():
+        pos = int(frame.index.searchsorted(last, side="right"))
+        if pos < len(frame):
+            frame.iloc[pos:, frame.columns.get_loc(col)] = new.reindex(frame.index[pos:]).to_numpy()
+            start = min(start, pos)
+    return frame.ffill().bfill(), start
+
+
+def _rewrite_csv_tail(filepath: str, frame: pd.DataFrame, start: int, n_replace: int) -> None:
+    """Replace the last n_replace rows of a CSV with the rows of frame from start on."""
+    with open(filepath, "r+b") as f:
+        if n_replace:
+            # Cut after the (n_replace + 1)-th newline from the end
+            pos = f.seek(0, os.SEEK_END)
+            count = 0
+            while pos > 0 and count <= n_replace:
+                step = min(1 << 16, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step)
+                idx = len(buf)
+                while count <= n_replace:
+                    idx = buf.rfind(b"\n", 0, idx)
+                    if idx < 0:
+                        break
+                    count += 1
+                    if count == n_replace + 1:
+                        f.truncate(pos + idx + 1)
+            if count <= n_replace:
+                raise ValueError(f"{filepath} has fewer rows than the processed store.")
+        f.seek(0, os.SEEK_END)
+        f.write(frame.iloc[start:].to_csv(header=False).encode())
+
+
+def _tail_hash(filepath: str, offset: int, size: int = 4096) -> str:
+    """Return the SHA-256 of the size bytes before offset (detects rewritten files)."""
+    with open(filepath, "rb") as f:
+        f.seek(max(offset - size, 0))
+        return hashlib.sha256(f.read(min(offset, size))).hexdigest()
+
+
+def _load_ingest_state(cache_dir: str) -> dict:
+    path = os.path.join(cache_dir, INGEST_STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_ingest_state(cache_dir: str, state: dict) -> None:
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = os.path.join(cache_dir, INGEST_STATE_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, os.path.join(cache_dir, INGEST_STATE_FILE))
+
+
 if __name__ == "__main__":
+    import sys
+
     cfg = load_config()
-    dfs = process_energy_data(cfg)
+    if "--append" in sys.argv:
+        dfs = append_price_data(cfg)
+    else:
+        dfs = process_energy_data(cfg)
     print(dfs[0].head())
@@ -0,0 +1,160 @@
+"""
+Model Export Utilities
+Streaming, size-bounded debug exports that stay off the solve path
+"""
+
+import gzip
+import math
+import os
+import threading
+
+from .config import config_section
+
+
+# Defaults of the "export" config section
+EXPORT_DEFAULTS = {
+    "enabled": False,    # Debug exports are opt-in
+    "background": True,  # Write in a background thread
+    "max_rows": 200,     # Rows per block (0 = no limit)
+    "chunk_rows": 5000,  # Lines buffered per write
+    "gzip": False,       # Compress output files
+}
+
+
+def export_settings(cfg: dict) -> dict:
+    """Return the "export" config section merged with the defaults."""
+    return config_section(cfg, "export", EXPORT_DEFAULTS)
+
+
+def open_export(filepath: str, compress: bool = False) -> tuple:
+    """
+    Open an export file for writing text.
+
+    Args:
+        filepath: Target path
+        compress: Write gzip-compressed output (".gz" is appended)
+
+    Returns:
+        Tuple of (file handle, actual path)
+    """
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    if compress:
+        if not filepath.endswith(".gz"):
+            filepath += ".gz"
+        return gzip.open(filepath, "wt", encoding="utf-8"), filepath
+    return open(filepath, "w", encoding="utf-8"), filepath
+
+
+def _run_guarded(func) -> None:
+    """Run an export and report instead of raising (debug output only)."""
+    try:
+        func()
+    except Exception as e:
+        print(f"Model export failed: {e}")
+
+
+def run_export(func, background: bool = True):
+    """
+    Run an export function now or in a background thread.
+
+    Args:
+        func: Callable without arguments that writes the export
+        background: Run in a separate (non-daemon) thread
+
+    Returns:
+        The started thread, or None for a synchronous export
+    """
+    if not background:
+        _run_guarded(func)
+        return None
+    thread = threading.Thread(target=_run_guarded, args=(func,), name="model-export")
+    thread.start()
+    return thread
+
+
+def _fmt_bound(value: float) -> str:
+    """Format a bound for the LP format."""
+    if math.isinf(value):
+        return "+inf" if value > 0 else "-inf"
+    return f"{value:.12g}"
+
+
+def _write_block(f, lines, n_total: int, max_rows: int, chunk_rows: int) -> None:
+    """Write lines in chunks, stopping after max_rows (0 = all)."""
+    buffer = []
+    n_written = 0
+    for line in lines:
+        if max_rows and n_written >= max_rows:
+            break
+        buffer.append(line)
+        n_written += 1
+        if len(buffer) >= chunk_rows:
+            f.writelines(buffer)
+            buffer = []
+    f.writelines(buffer)
+    if n_written < n_total:
+        f.write(f"\\ ... {n_total - n_written} more rows omitted (export.max_rows)\n")
+    f.flush()
+
+
+def write_lp(proto, f, max_rows: int = 0, chunk_rows: int = 5000) -> None:
+    """
+    Stream an MPModelProto to a file in LP format.
+
+    Each block (objective, constraints, bounds, integers) is generated
+    lazily and written chunk by chunk. With max_rows > 0 every block is
+    cut after that many rows, which keeps the file small but no longer
+    a complete model.
+
+    Args:
+        proto: linear_solver_pb2.MPModelProto to export
+        f: Open text file handle
+        max_rows: Row limit per block (0 = no limit)
+        chunk_rows: Number of lines buffered per write
+    """
+    names = [v.name or f"x{i}" for i, v in enumerate(proto.variable)]
+    objective = [(i, v.objective_coefficient)
+                 for i, v in enumerate(proto.variable) if v.objective_coefficient]
+    integers = [names[i] for i, v in enumerate(proto.variable) if v.is_integer]
+
+    def terms(indices, coeffs) -> str:
+        return " ".join(f"{c:+.12g} {names[i]}" for i, c in zip(indices, coeffs))
+
+    def constraint_lines():
+        for k, ct in enumerate(proto.constraint):
+            expr = terms(ct.var_index, ct.coefficient)
+            name = ct.name or f"c{k}"
+            lb, ub = ct.lower_bound, ct.upper_bound
+            if lb == ub:
+                yield f" {name}: {expr} = {_fmt_bound(lb)}\n"
+            elif math.isinf(lb):
+                yield f" {name}: {expr} <= {_fmt_bound(ub)}\n"
+            elif math.isinf(ub):
+                yield f" {name}: {expr} >= {_fmt_bound(lb)}\n"
+            else:
+                yield f" {name}: {_fmt_bound(lb)} <= {expr} <= {_fmt_bound(ub)}\n"
+
+    f.write(f"\\ Variables: {len(names)}, Constraints: {len(proto.constraint)}\n")
+    f.write("Maximize\n" if proto.maximize else "Minimize\n")
+    f.write(" obj:\n")
+    if proto.objective_offset:
+        # Constant term, so the exported objective equals the solved one
+        f.write(f"  {proto.objective_offset:+.12g}\n")
+    _write_block(f, (f"  {c:+.12g} {names[i]}\n" for i, c in objective),
+                 len(objective), max_rows, chunk_rows)
+
+    f.write("Subject To\n")
+    _write_block(f, constraint_lines(), len(proto.constraint), max_rows, chunk_rows)
+
+    f.write("Bounds\n")
+    _write_block(
+        f,
+        (f" {_fmt_bound(v.lower_bound)} <= {names[i]} <= {_fmt_bound(v.upper_bound)}\n"
+         for i, v in enumerate(proto.variable)),
+        len(names), max_rows, chunk_rows,
+    )
+
+    if integers:
+        f.write("Generals\n")
+        _write_block(f, (f" {n}\n" for n in integers), len(integers), max_rows, chunk_rows)
+    f.write("End\n")
@@ -0,0 +1,168 @@
+"""
+Instrumentation Utilities
+Per-phase timing, memory and model-size records sent to a pluggable sink
+"""
+
+import contextlib
+import datetime
+import functools
+import json
+import logging
+import os
+import resource
+import threading
+import time
+
+from .config import config_section
+
+
+# Defaults of the "instrumentation" config section
+INSTRUMENTATION_DEFAULTS = {
+    "enabled": False,
+    "path": "results/instrumentation.jsonl",  # JSON Lines file of phase records
+    "log_level": "WARNING",  # DEBUG shows per-hour diagnostics
+}
+
+
+def instrumentation_settings(cfg: dict) -> dict:
+    """Return the "instrumentation" config section merged with the defaults."""
+    return config_section(cfg, "instrumentation", INSTRUMENTATION_DEFAULTS)
+
+
+class NullSink:
+    """Discards all records (the default)."""
+
+    enabled = False
+
+    def emit(self, record: dict) -> None:
+        pass
+
+
+class MemorySink:
+    """Keeps records in a list, e.g. for benchmarks and notebooks."""
+
+    enabled = True
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record: dict) -> None:
+        self.records.append(record)
+
+
+class JsonlSink:
+    """
+    Appends one JSON object per line to a file.
+
+    The file is opened for every record, so worker processes started
+    after the sink was set can write to the same file.
+    """
+
+    enabled = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def emit(self, record: dict) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+
+_sink = NullSink()
+
+
+def set_sink(sink) -> None:
+    """Send all following records to sink (an object with emit(record))."""
+    global _sink
+    _sink = sink if sink is not None else NullSink()
+
+
+def get_sink():
+    """Return the current sink."""
+    return _sink
+
+
+def enabled() -> bool:
+    """Whether records are collected, so callers can skip costly fields."""
+    return getattr(_sink, "enabled", True)
+
+
+def configure(cfg: dict, path: str = None, log_level: str = None) -> None:
+    """
+    Set up the sink and log level from the "instrumentation" config.
+
+    Args:
+        cfg: Configuration dictionary
+        path: JSON Lines file overriding the config (enables the sink)
+        log_level: Log level of the "src" loggers overriding the config
+    """
+    settings = instrumentation_settings(cfg)
+    if path or settings["enabled"]:
+        set_sink(JsonlSink(path or settings["path"]))
+
+    logger = logging.getLogger("src")
+    logger.setLevel((log_level or settings["log_level"]).upper())
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+
+
+def process_peak_rss_mb() -> float:
+    """Peak resident set size of this process since it started, in MB."""
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextlib.contextmanager
+def phase(component: str, name: str, **fields):
+    """
+    Measure one phase and emit its record to the sink.
+
+    The record holds wall and CPU time, the peak RSS of the process so far
+    ("process_peak_rss_mb", which covers earlier phases too), how far the
+    phase raised that peak ("peak_rss_growth_mb", 0 for a phase that
+    stayed below an earlier peak) and any fields passed here or added to
+    the yielded dict inside the block (e.g. n_vars, n_cons, n_nonzeros,
+    status). An exception is recorded in "error" and re-raised.
+
+    Args:
+        component: Emitting component, e.g. "ortools" or "dataloader"
+        name: Phase name, e.g. "build" or "solve"
+        **fields: Extra JSON-serializable fields
+
+    Yields:
+        The record dict; "wall_s" etc. are filled in on exit
+    """
+    record = {"component": component, "phase": name, **fields}
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    peak = process_peak_rss_mb()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["wall_s"] = time.perf_counter() - wall
+        record["cpu_s"] = time.process_time() - cpu
+        if enabled():
+            record["process_peak_rss_mb"] = process_peak_rss_mb()
+            record["peak_rss_growth_mb"] = record["process_peak_rss_mb"] - peak
+            record["pid"] = os.getpid()
+            record["timestamp"] = datetime.datetime.now().isoformat(timespec="milliseconds")
+            _sink.emit(record)
+
+
+def instrumented(component: str, name: str = None):
+    """Decorator that runs a function inside phase(component, name or function name)."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(component, name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,159 @@
+"""
+Parallel Execution Utilities
+Runs independent windows or scenarios in a process pool
+"""
+
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .config import config_section
+
+
+# Defaults of the "execution" config section
+EXECUTION_DEFAULTS = {
+    "workers": 1,  # Worker processes (0 = all cores)
+    "backends_concurrent": True,  # main.py solves the backends in parallel processes
+}
+
+
+# Data shared with every task of a worker process (set by the initializer)
+_WORKER_SHARED = {}
+
+
+def execution_settings(cfg: dict) -> dict:
+    """Return the "execution" config section merged with the defaults."""
+    return config_section(cfg, "execution", EXECUTION_DEFAULTS)
+
+
+def _init_worker(shared: dict) -> None:
+    """Store the shared inputs once per worker process."""
+    _WORKER_SHARED.clear()
+    _WORKER_SHARED.update(shared)
+
+
+def _run_task(func, index: int, task, shared: dict) -> dict:
+    """Run one task and turn any exception into a failure record."""
+    start = time.perf_counter()
+    try:
+        result = func(task, shared)
+        error = None
+    except Exception as e:
+        result = None
+        error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+    return {
+        "index": index,
+        "ok": error is None,
+        "result": result,
+        "error": error,
+        "elapsed": time.perf_counter() - start,
+        "pid": os.getpid(),
+    }
+
+
+def _run_pooled_task(func, index: int, task) -> dict:
+    """Entry point inside a worker process."""
+    return _run_task(func, index, task, _WORKER_SHARED)
+
+
+def resolve_workers(workers: int = None) -> int:
+    """
+    Resolve the configured worker count.
+
+    Args:
+        workers: Requested number of processes (None or 0 = all cores)
+
+    Returns:
+        Number of worker processes to use (at least 1)
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def iter_parallel(func, tasks: list, workers: int = None, shared: dict = None,
+                  mp_context: str = None):
+    """
+    Run func(task, shared) for every task in a process pool and yield the
+    result records as the tasks finish.
+
+    The shared dictionary (input data, config) is sent to each worker once
+    instead of with every task. Solvers must be created inside func, since
+    they cannot be pickled. A failing task does not stop the others; it is
+    reported with ok=False and its error message.
+
+    Args:
+        func: Module-level function taking (task, shared)
+        tasks: List of picklable task descriptions
+        workers: Number of worker processes (None or 0 = all cores)
+        shared: Inputs shared by all tasks
+        mp_context: Start method of the worker processes, e.g. "spawn"
+            for solvers that cannot share a process with libraries this
+            process has loaded; the tasks then always run in a pool
+
+    Yields:
+        Result records in completion order, each with the keys index, ok,
+        result, error, elapsed and pid (index is the task position)
+    """
+    shared = shared or {}
+    workers = min(resolve_workers(workers), max(len(tasks), 1))
+
+    # No pool overhead for serial runs
+    if workers == 1 and mp_context is None:
+        for i, task in enumerate(tasks):
+            yield _run_task(func, i, task, shared)
+        return
+
+    print(f"Running {len(tasks)} tasks on {workers} worker processes...")
+    context = multiprocessing.get_context(mp_context) if mp_context else None
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(shared,)
+    ) as pool:
+        futures = {
+            pool.submit(_run_pooled_task, func, i, task): i
+            for i, task in enumerate(tasks)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                # Worker crashed or the result could not be sent back
+                yield {
+                    "index": i,
+                    "ok": False,
+                    "result": None,
+                    "error": f"{type(e).__name__}: {e}",
+                    "elapsed": None,
+                    "pid": None,
+                }
+
+
+def run_parallel(func, tasks: list, workers: int = None, shared: dict = None,
+                 mp_context: str = None) -> list:
+    """
+    Run func(task, shared) for every task in a process pool.
+
+    Same as iter_parallel, but waits for all tasks.
+
+    Args:
+        func: Module-level function taking (task, shared)
+        tasks: List of picklable task descriptions
+        workers: Number of worker processes (None or 0 = all cores)
+        shared: Inputs shared by all tasks
+        mp_context: Start method of the worker processes (see iter_parallel)
+
+    Returns:
+        List of result records in task order, each with the keys
+        index, ok, result, error, elapsed and pid
+    """
+    records = [None] * len(tasks)
+    for record in iter_parallel(func, tasks, workers, shared, mp_context):
+        records[record["index"]] = record
+
+    n_failed = sum(not r["ok"] for r in records)
+    if n_failed:
+        print(f"{n_failed} of {len(tasks)} tasks failed.")
+    return records
@@ -0,0 +1,267 @@
+"""
+Pipeline Utilities
+Stage DAG that skips stages whose inputs have not changed
+"""
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from .cache import cache_settings, fingerprint, load_frame, save_frame
+
+
+# Bump when the stage bookkeeping changes, so every stage runs again
+PIPELINE_VERSION = 1
+
+
+class Stage:
+    """One step of a pipeline: a function with declared inputs, parameters and outputs."""
+
+    def __init__(self, name: str, func, inputs: tuple = (), kwargs: dict = None,
+                 key=None, outputs: tuple = (), process: bool = False):
+        """
+        Define a stage.
+
+        Args:
+            name: Unique stage name
+            func: Function called as func(*input_values, **kwargs); must be
+                a module-level function for process stages
+            inputs: Names of the stages whose values are passed to func
+            kwargs: Keyword arguments of func
+            key: JSON-serializable values the result depends on besides
+                the inputs (defaults to kwargs); only these are fingerprinted
+            outputs: Files written by the stage; a missing file reruns it
+            process: Run in a worker process (for long solves), otherwise
+                in the main process
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.kwargs = kwargs or {}
+        self.key = self.kwargs if key is None else key
+        self.outputs = tuple(outputs)
+        self.process = process
+
+
+def _call(func, args: list, kwargs: dict):
+    """Entry point of a stage inside a worker process."""
+    return func(*args, **kwargs)
+
+
+class Pipeline:
+    """
+    Stage DAG with fingerprint-based skipping.
+
+    A stage's fingerprint combines its name, its key and the fingerprints
+    of its inputs, so it is known before anything runs and changes
+    whenever anything upstream changes. Stages whose fingerprint matches
+    the last successful run (and whose output files exist) are skipped;
+    their values are read back from the cache only if a stage that does
+    run needs them. Stage values must be None, a dict (stored as JSON) or
+    a DataFrame with a DatetimeIndex (stored with save_frame).
+    """
+
+    def __init__(self, cfg: dict, stages: list):
+        """
+        Args:
+            cfg: Configuration dictionary (uses the "cache" section)
+            stages: Stages in any order
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            for name in stage.inputs:
+                if name not in self.stages:
+                    raise ValueError(f"Stage {stage.name!r} depends on unknown stage {name!r}")
+        settings = cache_settings(cfg)
+        self.enabled = settings["enabled"]
+        self.dir = os.path.join(settings["dir"], "pipeline")
+        self.state_path = os.path.join(self.dir, "state.json")
+
+    def _order(self, targets: list = None) -> list:
+        """Targets and all their ancestors in dependency order."""
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through {name!r}")
+            visiting.add(name)
+            for dep in self.stages[name].inputs:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in targets if targets is not None else self.stages:
+            visit(name)
+        return order
+
+    def _load_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save_state(self, state: dict) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def _store(self, name: str, key: str, value) -> str:
+        """Persist a stage value; return its kind for the state file."""
+        if value is None:
+            return "none"
+        if isinstance(value, pd.DataFrame):
+            save_frame(value, self.dir, name, key)
+            return "frame"
+        if isinstance(value, dict):
+            os.makedirs(self.dir, exist_ok=True)
+            with open(os.path.join(self.dir, f"{name}.json"), "w") as f:
+                json.dump(value, f, indent=2, default=float)
+            return "json"
+        raise TypeError(f"Stage {name!r} returned an unsupported {type(value).__name__}")
+
+    def _load(self, name: str, entry: dict):
+        """Read a stored stage value back."""
+        if entry["kind"] == "frame":
+            return load_frame(self.dir, name, entry["key"])
+        if entry["kind"] == "json":
+            with open(os.path.join(self.dir, f"{name}.json")) as f:
+                return json.load(f)
+        return None
+
+    def _is_current(self, name: str, key: str, state: dict) -> bool:
+        """Whether a stage's last successful run matches the fingerprint."""
+        entry = state.get(name)
+        if entry is None or entry["key"] != key:
+            return False
+        if not all(os.path.exists(path) for path in self.stages[name].outputs):
+            return False
+        if entry["kind"] == "frame":
+            return os.path.isdir(os.path.join(self.dir, f"{name}-{key[:16]}"))
+        if entry["kind"] == "json":
+            return os.path.exists(os.path.join(self.dir, f"{name}.json"))
+        return True
+
+    def run(self, targets: list = None, force: bool = False, workers: int = None) -> dict:
+        """
+        Run the stages needed for the targets.
+
+        Process stages are submitted as soon as their inputs are ready and
+        run concurrently; main-process stages run while they are busy.
+        A failing stage does not stop independent stages; stages that
+        depend on it are reported as blocked.
+
+        Args:
+            targets: Stage names to bring up to date (None = all stages)
+            force: Run every stage regardless of fingerprints
+            workers: Maximum number of worker processes (None = one per
+                process stage, 0 = run process stages in the main process)
+
+        Returns:
+            Dictionary of stage name -> status ("cached", "ran", "failed"
+            or "blocked")
+        """
+        order = self._order(targets)
+        keys = {}
+        for name in order:
+            stage = self.stages[name]
+            keys[name] = fingerprint(PIPELINE_VERSION, name, stage.key,
+                                     [keys[dep] for dep in stage.inputs])
+
+        state = self._load_state()
+        force = force or not self.enabled
+        status = {name: "cached" for name in order
+                  if not force and self._is_current(name, keys[name], state)}
+        pending = [name for name in order if name not in status]
+        values = {}
+
+        def value(name):
+            if name not in values:
+                values[name] = self._load(name, state[name])
+            return values[name]
+
+        def finish(name, result, error, elapsed):
+            if error is None:
+                try:
+                    kind = self._store(name, keys[name], result)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            if error is not None:
+                status[name] = "failed"
+                print(f"Stage {name} failed: {error}")
+                return
+            values[name] = result
+            state[name] = {"key": keys[name], "kind": kind}
+            self._save_state(state)
+            status[name] = "ran"
+            print(f"Stage {name} finished in {elapsed:.2f} s")
+
+        n_process = sum(self.stages[name].process for name in pending)
+        workers = n_process if workers is None else min(workers, n_process)
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        running = {}
+        start_all = time.perf_counter()
+        try:
+            while pending or running:
+                # Hand out every stage whose inputs are done, process stages first
+                ready = [name for name in pending
+                         if all(status.get(dep) in ("cached", "ran") for dep in self.stages[name].inputs)]
+                blocked = [name for name in pending if name not in ready and any(
+                    status.get(dep) in ("failed", "blocked") for dep in self.stages[name].inputs)]
+                for name in blocked:
+                    status[name] = "blocked"
+                    pending.remove(name)
+                ready.sort(key=lambda name: not (self.stages[name].process and pool))
+
+                ran_inline = False
+                for name in ready:
+                    stage = self.stages[name]
+                    pending.remove(name)
+                    try:
+                        args = [value(dep) for dep in stage.inputs]
+                    except Exception as e:
+                        finish(name, None, f"cannot load inputs: {e}", 0.0)
+                        continue
+                    if stage.process and pool is not None:
+                        future = pool.submit(_call, stage.func, args, stage.kwargs)
+                        running[future] = (name, time.perf_counter())
+                        continue
+
+                    start = time.perf_counter()
+                    try:
+                        result, error = stage.func(*args, **stage.kwargs), None
+                    except Exception as e:
+                        result, error = None, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+                    finish(name, result, error, time.perf_counter() - start)
+                    # Collect finished workers before the next main-process stage
+                    ran_inline = True
+                    break
+
+                if not running:
+                    continue
+                # Only poll if main-process work may be left, otherwise block
+                done, _ = wait(running, timeout=0 if ran_inline else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, start = running.pop(future)
+                    try:
+                        result, error = future.result(), None
+                    except Exception as e:
+                        result, error = None, f"{type(e).__name__}: {e}"
+                    finish(name, result, error, time.perf_counter() - start)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        counts = {s: sum(v == s for v in status.values()) for s in ("ran", "cached", "failed", "blocked")}
+        print(f"Pipeline: {counts['ran']} ran, {counts['cached']} cached, "
+              f"{counts['failed']} failed, {counts['blocked']} blocked "
+              f"in {time.perf_counter() - start_all:.2f} s")
+        return {name: status[name] for name in order}
@@ -6,14 +6,18 @@ import matplotlib.pyplot as plt
 import networkx as nx
 import pandas as pd
 
+from .instrumentation import instrumented
 
-def plot_network(network, save_path: str = "results/network_diagram.png") -> None:
+
+@instrumented("plotting")
+def plot_network(network, save_path: str = "results/network_diagram.png", dpi: int = 150) -> None:
     """
     Plot the PyPSA network as a graph using networkx.
 
     Args:
         network: PyPSA Network object
         save_path: Path to save the diagram
+        dpi: Resolution of the saved image
     """
     n = network
     G = nx.DiGraph()
@@ -115,15 +119,17 @@ def plot_network(network, save_path: str = "results/network_diagram.png") -> Non
     ax.legend(handles=legend_elements, loc='upper left')
     plt.title("PyPSA Network: CHP + Boiler System", fontsize=14)
     plt.tight_layout()
-    plt.savefig(save_path, dpi=150)
+    plt.savefig(save_path, dpi=dpi)
     print(f"Network diagram saved to: {save_path}")
     plt.show()
 
 
+@instrumented("plotting")
 def plot_results_comparison(
     results_ortools: pd.DataFrame,
     results_pypsa: pd.DataFrame,
-    save_path: str = "results/comparison.png"
+    save_path: str = "results/comparison.png",
+    dpi: int = 150
 ) -> None:
     """
     Plot comparison of OR-Tools vs PyPSA results.
@@ -132,6 +138,7 @@ def plot_results_comparison(
         results_ortools: OR-Tools optimization results
         results_pypsa: PyPSA optimization results
         save_path: Path to save the plot
+        dpi: Resolution of the saved image
     """
     fig, axes = plt.subplots(3, 1, figsize=(14, 10), sharex=True)
 
@@ -162,12 +169,14 @@ def plot_results_comparison(
     axes[2].set_xlabel("Time")
 
     plt.tight_layout()
-    plt.savefig(save_path, dpi=150)
+    plt.savefig(save_path, dpi=dpi)
     print(f"Comparison plot saved to: {save_path}")
     plt.show()
 
 
-def plot_daily_profile(results: pd.DataFrame, title: str = "Daily Profile", save_path: str = None) -> None:
+@instrumented("plotting")
+def plot_daily_profile(results: pd.DataFrame, title: str = "Daily Profile", save_path: str = None,
+                       dpi: int = 150) -> None:
     """Plot daily average profile of results."""
     daily = results.groupby(results.index.hour).mean()
 
@@ -179,15 +188,17 @@ def plot_daily_profile(results: pd.DataFrame, title: str = "Daily Profile", save
     plt.tight_layout()
 
     if save_path:
-        plt.savefig(save_path, dpi=150)
+        plt.savefig(save_path, dpi=dpi)
         print(f"Daily profile saved to: {save_path}")
     plt.show()
 
 
+@instrumented("plotting")
 def plot_results_timeseries(
     results: pd.DataFrame,
     model_name: str = "Model",
-    save_path: str = None
+    save_path: str = None,
+    dpi: int = 150
 ) -> None:
     """
     Plot timeseries of optimization results.
@@ -196,6 +207,7 @@ def plot_results_timeseries(
         results: Optimization results DataFrame
         model_name: Name of the model for title
         save_path: Path to save the plot (optional)
+        dpi: Resolution of the saved image
     """
     fig, axes = plt.subplots(3, 1, figsize=(14, 10), sharex=True)
 
@@ -237,18 +249,20 @@ def plot_results_timeseries(
     plt.tight_layout()
 
     if save_path:
-        plt.savefig(save_path, dpi=150)
+        plt.savefig(save_path, dpi=dpi)
         print(f"Timeseries plot saved to: {save_path}")
     plt.show()
 
 
-def plot_energy_balance(results: pd.DataFrame, save_path: str = None) -> None:
+@instrumented("plotting")
+def plot_energy_balance(results: pd.DataFrame, save_path: str = None, dpi: int = 150) -> None:
     """
     Plot energy balance summary (bar chart of totals).
 
     Args:
         results: Optimization results DataFrame
         save_path: Path to save the plot (optional)
+        dpi: Resolution of the saved image
     """
     totals = results[["chp_gas_in", "chp_heat_out", "chp_el_out",
                       "boiler_gas_in", "boiler_heat_out"]].sum()
@@ -270,6 +284,6 @@ def plot_energy_balance(results: pd.DataFrame, save_path: str = None) -> None:
     plt.tight_layout()
 
     if save_path:
-        plt.savefig(save_path, dpi=150)
+        plt.savefig(save_path, dpi=dpi)
         print(f"Energy balance plot saved to: {save_path}")
     plt.show()
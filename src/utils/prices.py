@@ -0,0 +1,168 @@
+"""
+Raw Price Parser
+Reader for the exchange price CSV exports with fixed formats
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pa_compute
+import pyarrow.csv as pa_csv
+
+
+# Line layout: "<published>;<datetime>;<price>" with both timestamps in
+# TIMESTAMP_FORMAT and the price with a decimal comma
+TIMESTAMP_FORMAT = "%d.%m.%Y %H:%M:%S"
+COLUMNS = ["published", "datetime", "price"]
+# Publication times repeat, so they are read as text and parsed once per value
+_COLUMN_TYPES = {"published": pa.string(), "datetime": pa.timestamp("s"),
+                 "price": pa.float64()}
+
+# Resolution pandas itself uses for parsed timestamps (ns before 3.0, us after)
+_INDEX_UNIT = pd.to_datetime(["01.01.2000 00:00:00"], format=TIMESTAMP_FORMAT).unit
+
+
+def _read_table(source, skiprows: int, column_types: dict) -> pa.Table:
+    """Read the three columns with pyarrow's CSV reader."""
+    return pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(column_names=COLUMNS, skip_rows=skiprows),
+        parse_options=pa_csv.ParseOptions(delimiter=";"),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types, timestamp_parsers=[TIMESTAMP_FORMAT],
+            decimal_point=","),
+    )
+
+
+def _read_rows(source, skiprows: int) -> tuple:
+    """
+    Parse the published and datetime timestamps and the prices.
+
+    A value pyarrow cannot convert is located again on the text columns
+    and reported with its row number.
+    """
+    if hasattr(source, "read"):
+        # File-like objects are read once, for the retry on errors as well
+        data = source.read()
+        source = data.encode() if isinstance(data, str) else data
+        reopen = lambda: pa.BufferReader(source)  # noqa: E731
+    else:
+        reopen = lambda: source  # noqa: E731
+    try:
+        table = _read_table(reopen(), skiprows, _COLUMN_TYPES)
+        encoded = table["published"].combine_chunks().dictionary_encode()
+        published = pa_compute.strptime(encoded.dictionary, format=TIMESTAMP_FORMAT, unit="s")
+    except pa.ArrowInvalid as error:
+        text = _read_table(reopen(), skiprows, dict.fromkeys(COLUMNS, pa.string())).to_pandas()
+        for col in COLUMNS[:2]:
+            parsed = pd.to_datetime(text[col], format=TIMESTAMP_FORMAT, errors="coerce")
+            _invalid_row(parsed.isna().values, skiprows,
+                         f"{col} does not match {TIMESTAMP_FORMAT!r}")
+        price = text["price"].str.replace(",", ".", regex=False)
+        invalid = (pd.to_numeric(price, errors="coerce").isna()
+                   | text["price"].str.contains(".", regex=False))
+        _invalid_row(invalid.values, skiprows, "price is not a number with decimal comma")
+        raise ValueError(str(error)) from None
+    return (published.to_numpy()[encoded.indices.to_numpy()],
+            table["datetime"].to_numpy(), table["price"].to_numpy())
+
+
+def _invalid_row(mask: np.ndarray, skiprows: int, what: str) -> None:
+    """Raise for the first row flagged in mask."""
+    if mask.any():
+        raise ValueError(f"Row {skiprows + int(np.argmax(mask)) + 1}: {what}")
+
+
+def parse_price_csv(source, col_name: str, skiprows: int = 1, keep: str = "first") -> tuple:
+    """
+    Parse an exchange price CSV into an hourly series and a data summary.
+
+    Timestamps are read with the fixed TIMESTAMP_FORMAT (no format
+    inference) by pyarrow's CSV reader; malformed rows raise with their
+    row number.
+
+    Args:
+        source: File path or file-like object
+        col_name: Name of the price column
+        skiprows: Number of leading lines to skip
+        keep: Which row wins for a duplicated timestamp: "first" (file
+            order) or "latest" (most recent publication time)
+
+    Returns:
+        Tuple of (hourly DataFrame indexed by datetime with gaps as NaN,
+        summary dict with row count, time and publication ranges,
+        duplicates and gaps)
+    """
+    if keep not in ("first", "latest"):
+        raise ValueError(f"keep must be 'first' or 'latest', not {keep!r}")
+
+    published, timestamps, prices = _read_rows(source, skiprows)
+
+    # Sort by timestamp with the winning row first among equal timestamps
+    # (the exports are in order, so "first" usually needs no sort)
+    if keep == "latest":
+        # Later rows win between equal publication times
+        order = np.lexsort((-np.arange(len(timestamps)), -published.astype(np.int64), timestamps))
+        timestamps, prices = timestamps[order], prices[order]
+    elif (timestamps[1:] < timestamps[:-1]).any():
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, prices = timestamps[order], prices[order]
+    repeated = pd.Series(timestamps).duplicated().values
+    # Every duplicate follows the row that wins, so its price is carried forward
+    winning_price = pd.Series(np.where(repeated, np.nan, prices)).ffill().values
+    conflicting = repeated & (prices != winning_price)
+    duplicate_timestamps = pd.unique(timestamps[repeated])
+    timestamps, prices = timestamps[~repeated], prices[~repeated]
+
+    # Hourly grid from the first to the last full hour; off-hour rows drop out
+    if len(timestamps):
+        first = timestamps[0].astype("datetime64[h]")
+        offset = (timestamps - first).astype(np.int64)
+        on_hour = offset % 3600 == 0
+        values = np.full(offset[-1] // 3600 + 1, np.nan)
+        values[offset[on_hour] // 3600] = prices[on_hour]
+        index = pd.date_range(first, periods=len(values), freq="h", unit=_INDEX_UNIT,
+                              name="datetime")
+    else:
+        values = np.array([])
+        index = pd.DatetimeIndex([], dtype=f"datetime64[{_INDEX_UNIT}]", name="datetime")
+    df = pd.DataFrame({col_name: values}, index=index)
+
+    # A gap starts at every missing hour that does not follow another one
+    missing = np.isnan(values)
+    gap_start = missing & ~np.concatenate(([False], missing[:-1]))
+    summary = {
+        "rows": int(len(published)),
+        "first": str(index[0]) if len(index) else None,
+        "last": str(index[-1]) if len(index) else None,
+        "published": ([str(pd.Timestamp(published.min())), str(pd.Timestamp(published.max()))]
+                      if len(published) else None),
+        "duplicates": int(repeated.sum()),
+        "conflicting_duplicates": int(conflicting.sum()),
+        "duplicate_timestamps": [str(pd.Timestamp(t)) for t in duplicate_timestamps],
+        "missing_hours": int(missing.sum()),
+        "gaps": [str(t) for t in index[gap_start]],
+    }
+    return df, summary
+
+
+def read_price_csv(source, col_name: str, skiprows: int = 1) -> pd.DataFrame:
+    """
+    Load and clean a raw exchange price CSV.
+
+    Args:
+        source: File path or file-like object
+        col_name: Name of the price column
+        skiprows: Number of leading lines to skip
+
+    Returns:
+        Hourly DataFrame indexed by datetime (gaps as NaN)
+    """
+    return parse_price_csv(source, col_name, skiprows)[0]
+
+
+def format_summary(name: str, summary: dict) -> str:
+    """One-line description of a parse_price_csv summary."""
+    return (f"{name}: {summary['rows']} rows from {summary['first']} to {summary['last']}, "
+            f"{summary['duplicates']} duplicates ({summary['conflicting_duplicates']} conflicting), "
+            f"{summary['missing_hours']} missing hours in {len(summary['gaps'])} gaps")
@@ -0,0 +1,91 @@
+"""
+Demand Projection Utilities
+Maps a one-year heat demand profile onto arbitrary time indices
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class DemandProjection:
+    """(month, day, hour) lookup table built from a one-year hourly profile."""
+
+    def __init__(self, profile: pd.Series):
+        """
+        Build the lookup table.
+
+        The profile uses naive local timestamps, so DST shows up as one
+        missing hour in spring and a repeated hour in autumn. Both are
+        resolved in the table: a missing slot takes the value of the
+        previous hour (cyclically, so a missing Jan 1 00:00 uses Dec 31
+        23:00) and a repeated hour keeps its first value. If the profile
+        year has no Feb 29, the leap day reuses Feb 28 hour by hour.
+
+        Args:
+            profile: Hourly demand with a DatetimeIndex covering one year
+        """
+        profile = profile[~profile.index.duplicated(keep="first")].dropna()
+        idx = profile.index
+
+        table = np.full((12, 31, 24), np.nan)
+        table[idx.month - 1, idx.day - 1, idx.hour] = profile.to_numpy(dtype=float)
+
+        if np.isnan(table[1, 28]).all():
+            table[1, 28] = table[1, 27]
+
+        # Forward-fill gaps in chronological order over the valid calendar
+        # slots only (Feb 30 etc. never occur in a target index)
+        flat = table.reshape(-1)
+        slots = np.flatnonzero(self._calendar_mask().reshape(-1))
+        values = pd.Series(flat[slots])
+        if values.isna().all():
+            raise ValueError("Demand profile has no values.")
+        values = values.ffill()
+        values = values.fillna(values.iloc[-1])
+        flat[slots] = values.to_numpy()
+        self.table = table
+
+    @staticmethod
+    def _calendar_mask() -> np.ndarray:
+        """Boolean (12, 31, 24) mask of the slots that exist in a leap year."""
+        days_in_month = np.array([31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        mask = np.arange(31)[None, :] < days_in_month[:, None]
+        return np.repeat(mask[:, :, None], 24, axis=2)
+
+    def project(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Look up the demand for every timestamp of a target index.
+
+        Args:
+            index: Target DatetimeIndex (naive local time, any frequency)
+
+        Returns:
+            Array of demand values aligned with the index
+        """
+        index = pd.DatetimeIndex(index)
+        return self.table[index.month - 1, index.day - 1, index.hour]
+
+    def iter_chunks(self, start, end, freq: str = "h", chunk_size: int = 8760):
+        """
+        Generate the projected demand for a horizon chunk by chunk.
+
+        Only one chunk of timestamps and values exists at a time, so
+        arbitrarily long horizons can be streamed.
+
+        Args:
+            start: First timestamp of the horizon
+            end: Last timestamp of the horizon (inclusive)
+            freq: Time step of the horizon
+            chunk_size: Number of time steps per chunk
+
+        Yields:
+            pd.Series of demand values indexed by datetime
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        step = pd.tseries.frequencies.to_offset(freq)
+        while start <= end:
+            chunk = pd.date_range(start, periods=chunk_size, freq=step, name="datetime")
+            chunk = chunk[chunk <= end]
+            yield pd.Series(self.project(chunk), index=chunk, name="demand_th")
+            start = chunk[-1] + step
@@ -0,0 +1,199 @@
+"""
+Scenario Sweep Utilities
+Batch runs of CO2 price, fuel price and technical parameter variations
+"""
+
+import copy
+import itertools
+import os
+import time
+
+import pandas as pd
+
+from .analysis import calculate_kpis
+from .config import override_section
+from .parallel import execution_settings, run_parallel
+from ..models.dispatch import MeritOrderDispatch, evaluate_objective
+
+
+# Scenario parameters that scale an input time series
+SCALE_PARAMS = {
+    "price_el_scale": "price_el",
+    "price_gas_scale": "price_gas",
+    "demand_scale": "demand_th",
+}
+
+
+def expand_scenarios(sweep_cfg: dict) -> list:
+    """
+    Expand the sweep config into a list of override dictionaries.
+
+    Args:
+        sweep_cfg: The "sweep" config section with a "grid" (parameter ->
+            list of values, expanded as a Cartesian product) and/or
+            "scenarios" (explicit list of override dictionaries)
+
+    Returns:
+        List of override dictionaries, grid scenarios first
+    """
+    scenarios = []
+    grid = sweep_cfg.get("grid") or {}
+    if grid:
+        keys = list(grid)
+        values = [v if isinstance(v, list) else [v] for v in grid.values()]
+        for combo in itertools.product(*values):
+            scenarios.append(dict(zip(keys, combo)))
+
+    scenarios.extend(dict(s) for s in sweep_cfg.get("scenarios") or [])
+    return scenarios
+
+
+def apply_overrides(data: pd.DataFrame, cfg: dict, overrides: dict) -> tuple:
+    """
+    Apply one scenario's overrides to the input data and config.
+
+    Supported keys are "co2_price", the scale factors in SCALE_PARAMS and
+    dotted config paths such as "chp.eta_el" or "boiler.marginal_cost".
+
+    Args:
+        data: Input DataFrame (not modified)
+        cfg: Configuration dictionary (not modified)
+        overrides: Parameter overrides of the scenario
+
+    Returns:
+        Tuple of (scenario data, scenario config)
+    """
+    cfg = copy.deepcopy(cfg)
+    scaled = {}
+    for key, value in overrides.items():
+        if key in SCALE_PARAMS:
+            scaled[SCALE_PARAMS[key]] = value
+        elif key == "co2_price":
+            cfg["data"]["co2_price"] = value
+        elif "." in key and isinstance(cfg.get(key.split(".", 1)[0]), dict):
+            section, param = key.split(".", 1)
+            cfg[section][param] = value
+        else:
+            raise KeyError(f"Unknown scenario parameter: {key}")
+
+    if scaled:
+        data = data.copy()
+        for col, factor in scaled.items():
+            data[col] = data[col] * factor
+    return data, cfg
+
+
+def _run_scenario(task: tuple, shared: dict) -> dict:
+    """Solve one scenario with one backend (runs inside a worker process)."""
+    _, backend, overrides = task
+    data, cfg = apply_overrides(shared["data"], shared["cfg"], overrides)
+
+    # Solvers are imported on first use, once per worker process. One-off
+    # scenarios bypass the result cache, where they would evict useful entries.
+    start = time.perf_counter()
+    if backend == "ortools":
+        from ..models.ortools_model import ORToolsOptimizer
+
+        results = ORToolsOptimizer(data, cfg).optimize(use_cache=False)
+    elif backend == "merit_order":
+        results = MeritOrderDispatch(data, cfg).optimize()
+    elif backend == "cpsat":
+        from ..models.cpsat_model import CPSATOptimizer
+
+        results = CPSATOptimizer(data, cfg).optimize(use_cache=False)
+    elif backend == "pypsa":
+        from ..models.pypsa_model import PyPSAOptimizer
+
+        optimizer = PyPSAOptimizer(data, cfg)
+        optimizer.build_model()
+        optimizer.solve(
+            solver_name=cfg["settings"].get("solver", "scip").lower(),
+            export_readable=False,
+            use_cache=False,
+        )
+        if optimizer.status != "ok":
+            raise RuntimeError(f"PyPSA solve failed (status {optimizer.status}).")
+        results = optimizer.get_results()
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+    elapsed = time.perf_counter() - start
+
+    if results is None:
+        raise RuntimeError("No optimal solution found.")
+
+    return {
+        "profit_eur": evaluate_objective(results, data, cfg),
+        "solve_s": elapsed,
+        **calculate_kpis(results, cfg),
+    }
+
+
+def run_sweep(data: pd.DataFrame, cfg: dict, sweep_cfg: dict = None) -> pd.DataFrame:
+    """
+    Run all scenarios of a sweep on the already loaded data.
+
+    Args:
+        data: Filtered input DataFrame shared by all scenarios
+        cfg: Base configuration dictionary
+        sweep_cfg: Sweep definition (defaults to the "sweep" config section)
+
+    Returns:
+        DataFrame indexed by (scenario, backend) with the overrides,
+        profit, solve time and KPIs of every run
+    """
+    sweep_cfg = sweep_cfg if sweep_cfg is not None else cfg.get("sweep", {})
+    scenarios = expand_scenarios(sweep_cfg)
+    if not scenarios:
+        raise ValueError("Sweep has no scenarios; set sweep.grid or sweep.scenarios.")
+    backends = sweep_cfg.get("backends", ["ortools"])
+
+    # No debug exports from inside the sweep
+    base_cfg = override_section(cfg, "export", enabled=False)
+
+    tasks = [(i, backend, overrides)
+             for i, overrides in enumerate(scenarios) for backend in backends]
+    print(f"Scenario sweep: {len(scenarios)} scenarios x {len(backends)} backends")
+    # OR-Tools and HiGHS cannot be loaded into one process, so PyPSA runs in
+    # freshly spawned workers of its own
+    records = [None] * len(tasks)
+    for spawn in (False, True):
+        positions = [k for k, task in enumerate(tasks) if (task[1] == "pypsa") == spawn]
+        if not positions:
+            continue
+        group = run_parallel(
+            _run_scenario,
+            [tasks[k] for k in positions],
+            workers=execution_settings(cfg)["workers"],
+            shared={"data": data, "cfg": base_cfg},
+            mp_context="spawn" if spawn else None,
+        )
+        for k, record in zip(positions, group):
+            records[k] = record
+
+    rows = []
+    for (i, backend, overrides), record in zip(tasks, records):
+        row = {"scenario": i, "backend": backend, **overrides, "ok": record["ok"]}
+        if record["ok"]:
+            row.update(record["result"])
+        else:
+            row["error"] = record["error"].splitlines()[0]
+        rows.append(row)
+    store = pd.DataFrame(rows).set_index(["scenario", "backend"])
+
+    output = sweep_cfg.get("output")
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        store.to_csv(output)
+        print(f"Sweep results saved to: {output}")
+
+    print("\n--- Scenario Sweep Summary ---")
+    print(store.drop(columns=["error"], errors="ignore").round(2))
+    return store
+
+
+if __name__ == "__main__":
+    from .dataloader import load_config, load_data
+
+    cfg = load_config()
+    df = load_data("data/interim/data_1year_strict.csv", cfg)
+    run_sweep(df, cfg)
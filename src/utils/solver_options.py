@@ -0,0 +1,191 @@
+"""
+Solver Options
+Time limit, MIP gap, threads, seed, presolve and emphasis for all backends
+"""
+
+from .config import config_section
+
+
+# Defaults of the "solver_options" config section (None = solver default)
+SOLVER_OPTIONS_DEFAULTS = {
+    "time_limit_s": None,  # Return the best solution found after this many seconds
+    "mip_rel_gap": None,  # Stop once the relative MIP gap is at most this
+    "mip_abs_gap": None,  # Stop once the absolute MIP gap is at most this (EUR)
+    "threads": None,  # Solver threads
+    "seed": None,  # Random seed
+    "presolve": None,  # False turns the solver's presolve off
+    "emphasis": None,  # "feasibility" or "optimality"
+    "presets": [],  # Overrides by horizon length, see solver_options()
+}
+
+OPTION_KEYS = [key for key in SOLVER_OPTIONS_DEFAULTS if key != "presets"]
+
+EMPHASIS = ("feasibility", "optimality")
+
+# SCIP parameters approximating its emphasis settings, which pywraplp
+# cannot select directly
+SCIP_EMPHASIS = {
+    # Fewer cut rounds, more frequent primal heuristics
+    "feasibility": {
+        "separating/maxrounds": 1,
+        "separating/maxroundsroot": 5,
+        "heuristics/feaspump/freq": 5,
+        "heuristics/rins/freq": 5,
+    },
+    # No stall limit on root cuts, no diving-type primal heuristics
+    "optimality": {
+        "separating/maxstallroundsroot": -1,
+        "heuristics/feaspump/freq": -1,
+        "heuristics/rens/freq": -1,
+    },
+}
+
+# HiGHS mip_heuristic_effort per emphasis (HiGHS default 0.05)
+HIGHS_HEURISTIC_EFFORT = {"feasibility": 0.3, "optimality": 0.0}
+
+
+def solver_options(cfg: dict, steps: int) -> dict:
+    """
+    Solver options for a horizon of the given length.
+
+    The values of the "solver_options" config section apply to every
+    solve. Each entry of its "presets" list has a max_hours limit (None =
+    no limit) and option overrides; the first preset with steps <=
+    max_hours is applied on top, so e.g. year-long runs can use a looser
+    gap and a time limit.
+
+    Args:
+        cfg: Configuration dictionary
+        steps: Number of time steps of the horizon
+
+    Returns:
+        Dictionary with every key of OPTION_KEYS (None = solver default)
+    """
+    section = config_section(cfg, "solver_options", SOLVER_OPTIONS_DEFAULTS)
+    options = {key: section[key] for key in OPTION_KEYS}
+    for preset in section["presets"] or []:
+        max_hours = preset.get("max_hours")
+        if max_hours is None or steps <= max_hours:
+            unknown = set(preset) - set(OPTION_KEYS) - {"max_hours"}
+            if unknown:
+                raise KeyError(f"Unknown solver option in preset: {sorted(unknown)}")
+            options.update({k: v for k, v in preset.items() if k != "max_hours"})
+            break
+
+    if options["emphasis"] is not None and options["emphasis"] not in EMPHASIS:
+        raise ValueError(f"Unknown solver emphasis: {options['emphasis']}")
+    return options
+
+
+def stop_gap(telemetry_gap: float, option_gap: float) -> float:
+    """
+    Relative gap for a solve with both the telemetry gap rule and mip_rel_gap.
+
+    Either rule ends the solve, so the looser gap applies; without
+    mip_rel_gap the telemetry gap is passed unchanged.
+
+    Args:
+        telemetry_gap: "gap" of the "telemetry" config (None = no rule)
+        option_gap: mip_rel_gap from solver_options() (None = not set)
+
+    Returns:
+        Relative gap, or None if neither is set
+    """
+    if option_gap is None:
+        return telemetry_gap
+    if telemetry_gap is None:
+        return float(option_gap)
+    return max(float(telemetry_gap), float(option_gap))
+
+
+def stop_time(telemetry_limit: float, option_limit: float) -> float:
+    """
+    Time limit for a solve with both the telemetry time rule and time_limit_s.
+
+    Either limit ends the solve, so the tighter one applies.
+
+    Args:
+        telemetry_limit: "time_limit_s" of the "telemetry" config (None = no rule)
+        option_limit: time_limit_s from solver_options() (None = not set)
+
+    Returns:
+        Time limit in seconds, or None if neither is set
+    """
+    limits = [float(t) for t in (telemetry_limit, option_limit) if t is not None]
+    return min(limits) if limits else None
+
+
+def active_options(options: dict) -> dict:
+    """Options that differ from the solver defaults, for cache keys and logs."""
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def scip_parameters(options: dict) -> dict:
+    """
+    SCIP parameters for the options pywraplp has no generic setting for.
+
+    Args:
+        options: Options from solver_options()
+
+    Returns:
+        Dictionary of SCIP parameter name -> value
+    """
+    params = {}
+    if options["emphasis"] is not None:
+        params.update(SCIP_EMPHASIS[options["emphasis"]])
+    if options["mip_abs_gap"] is not None:
+        params["limits/absgap"] = options["mip_abs_gap"]
+    if options["seed"] is not None:
+        params["randomization/randomseedshift"] = int(options["seed"])
+    return params
+
+
+def linopy_options(solver_name: str, options: dict) -> dict:
+    """
+    Solver options passed through linopy (PyPSA).
+
+    Args:
+        solver_name: linopy solver name
+        options: Options from solver_options()
+
+    Returns:
+        Dictionary of solver-specific options; empty for solvers without
+        a mapping
+    """
+    if solver_name == "highs":
+        mapping = {
+            "time_limit_s": ("time_limit", float),
+            "mip_rel_gap": ("mip_rel_gap", float),
+            "mip_abs_gap": ("mip_abs_gap", float),
+            "threads": ("threads", int),
+            "seed": ("random_seed", int),
+            "presolve": ("presolve", lambda on: "on" if on else "off"),
+        }
+        result = {name: convert(options[key]) for key, (name, convert) in mapping.items()
+                  if options[key] is not None}
+        if options["emphasis"] is not None:
+            result["mip_heuristic_effort"] = HIGHS_HEURISTIC_EFFORT[options["emphasis"]]
+        return result
+
+    if solver_name == "scip":
+        result = {}
+        if options["time_limit_s"] is not None:
+            result["limits/time"] = float(options["time_limit_s"])
+        if options["mip_rel_gap"] is not None:
+            result["limits/gap"] = float(options["mip_rel_gap"])
+        if options["mip_abs_gap"] is not None:
+            result["limits/absgap"] = float(options["mip_abs_gap"])
+        if options["threads"] is not None:
+            result["parallel/maxnthreads"] = int(options["threads"])
+        if options["seed"] is not None:
+            result["randomization/randomseedshift"] = int(options["seed"])
+        if options["presolve"] is False:
+            result["setPresolve"] = "off"
+        if options["emphasis"] is not None:
+            # linopy selects SCIP's own emphasis settings
+            result["setEmphasis"] = options["emphasis"]
+        return result
+
+    if active_options(options):
+        print(f"Solver options are not mapped for {solver_name}; using its defaults.")
+    return {}
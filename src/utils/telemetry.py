@@ -0,0 +1,183 @@
+"""
+Solver Telemetry
+Progress records of MIP solves (incumbent, bound, gap) and early-stop rules
+"""
+
+import datetime
+import math
+import os
+import time
+import uuid
+
+from .config import config_section
+from .instrumentation import JsonlSink
+
+
+# Defaults of the "telemetry" config section
+TELEMETRY_DEFAULTS = {
+    "enabled": False,
+    "path": "results/solver_telemetry.jsonl",  # JSON Lines file of progress records
+    "interval_s": 1.0,  # Seconds between progress records (new incumbents are always written)
+    "slice_s": None,  # OR-Tools: first time slice, doubled after every slice (None = one solve)
+    "gap": None,  # Stop once the relative gap is at most this (e.g. 0.01)
+    "stall_s": None,  # Stop after this many seconds without a better incumbent
+    "time_limit_s": None,  # Stop after this many seconds in total
+}
+
+# Settings that change which solution is returned
+EARLY_STOP_RULES = ("gap", "stall_s", "time_limit_s")
+
+
+def telemetry_settings(cfg: dict) -> dict:
+    """Return the "telemetry" config section merged with the defaults."""
+    return config_section(cfg, "telemetry", TELEMETRY_DEFAULTS)
+
+
+def early_stop_rules(cfg: dict) -> dict:
+    """Return the active early-stop rules for cache keys, or None if there are none."""
+    settings = telemetry_settings(cfg)
+    rules = {rule: settings[rule] for rule in EARLY_STOP_RULES if settings[rule] is not None}
+    return rules if settings["enabled"] and rules else None
+
+
+def relative_gap(incumbent: float, bound: float) -> float:
+    """
+    Relative distance between incumbent and best bound.
+
+    Args:
+        incumbent: Objective of the best solution found
+        bound: Best proven bound on the objective
+
+    Returns:
+        |bound - incumbent| / |incumbent|, or None while either is unknown
+    """
+    if incumbent is None or bound is None or not math.isfinite(bound):
+        return None
+    return abs(bound - incumbent) / max(abs(incumbent), 1e-10)
+
+
+class SolveMonitor:
+    """
+    Records the progress of one solve and applies the early-stop rules.
+
+    The solver integration reports incumbents, bounds and node counts
+    with update() (from a callback or between time slices) and stops
+    the solver when it returns a reason. Records go to a JSON Lines
+    file; each holds the run id, the elapsed time, the best incumbent
+    and bound so far, their gap and the node count.
+    """
+
+    def __init__(self, component: str, settings: dict, sense: str = "max", **fields):
+        """
+        Args:
+            component: Emitting component, e.g. "ortools" or "pypsa"
+            settings: "telemetry" settings (see telemetry_settings)
+            sense: "max" or "min", the direction of improvement
+            **fields: Extra JSON-serializable fields of every record
+        """
+        self.component = component
+        self.settings = settings
+        self.maximize = sense == "max"
+        self.fields = fields
+        self.sink = JsonlSink(settings["path"])
+        self.run = uuid.uuid4().hex[:12]
+
+        self.start = time.perf_counter()
+        self.last_improvement = self.start
+        self.last_emit = None
+        self.incumbent = None
+        self.bound = None
+        self.nodes = None
+        self.stop_reason = None
+
+    def elapsed(self) -> float:
+        """Seconds since the monitor was created."""
+        return time.perf_counter() - self.start
+
+    def gap(self) -> float:
+        """Relative gap of the best incumbent and bound so far."""
+        return relative_gap(self.incumbent, self.bound)
+
+    def _improves(self, value: float, reference: float) -> bool:
+        tolerance = 1e-9 * max(1.0, abs(reference))
+        return value > reference + tolerance if self.maximize else value < reference - tolerance
+
+    def update(self, incumbent: float = None, bound: float = None, nodes: int = None,
+               **fields) -> str:
+        """
+        Report solver progress and check the early-stop rules.
+
+        Args:
+            incumbent: Objective of the solver's current best solution
+            bound: Solver's current best bound (non-finite values are ignored)
+            nodes: Branch-and-bound nodes explored so far
+            **fields: Extra fields of the record, e.g. status
+
+        Returns:
+            The stop reason ("gap", "stall" or "time_limit"), or None to
+            continue
+        """
+        now = time.perf_counter()
+        improved = incumbent is not None and (
+            self.incumbent is None or self._improves(incumbent, self.incumbent))
+        if improved:
+            self.incumbent = incumbent
+            self.last_improvement = now
+        if bound is not None and math.isfinite(bound):
+            # Every bound is valid, keep the tightest one
+            if self.bound is None or self._improves(self.bound, bound):
+                self.bound = bound
+        if nodes is not None:
+            self.nodes = nodes
+
+        stopped = False
+        if self.stop_reason is None:
+            self.stop_reason = self._check(now)
+            stopped = self.stop_reason is not None
+        if (improved or fields or stopped or self.last_emit is None
+                or now - self.last_emit >= self.settings["interval_s"]):
+            self._emit(now, "incumbent" if improved else "progress", **fields)
+        return self.stop_reason
+
+    def _check(self, now: float) -> str:
+        gap = self.gap()
+        if self.settings["gap"] is not None and gap is not None and gap <= self.settings["gap"]:
+            return "gap"
+        if self.settings["stall_s"] is not None and self.incumbent is not None \
+                and now - self.last_improvement >= self.settings["stall_s"]:
+            return "stall"
+        if self.settings["time_limit_s"] is not None and now - self.start >= self.settings["time_limit_s"]:
+            return "time_limit"
+        return None
+
+    def time_left(self) -> float:
+        """Seconds until the stall or time rule stops the solve, or None without such a rule."""
+        now = time.perf_counter()
+        limits = []
+        if self.settings["stall_s"] is not None and self.incumbent is not None:
+            limits.append(self.last_improvement + self.settings["stall_s"] - now)
+        if self.settings["time_limit_s"] is not None:
+            limits.append(self.start + self.settings["time_limit_s"] - now)
+        return max(min(limits), 0.0) if limits else None
+
+    def finish(self, status: str) -> None:
+        """Write the final record of the solve."""
+        self._emit(time.perf_counter(), "end", status=status)
+
+    def _emit(self, now: float, event: str, **fields) -> None:
+        self.last_emit = now
+        self.sink.emit({
+            "component": self.component,
+            "run": self.run,
+            "event": event,
+            "elapsed_s": now - self.start,
+            "incumbent": self.incumbent,
+            "bound": self.bound,
+            "gap": self.gap(),
+            "nodes": self.nodes,
+            "stop": self.stop_reason,
+            **self.fields,
+            **fields,
+            "pid": os.getpid(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        })
@@ -0,0 +1,59 @@
+"""
+Shared fixtures: the project config with caches in a temporary directory
+and a summer week of the interim data, also with three days of zero power
+prices.
+"""
+
+import copy
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from src.utils.dataloader import INTERIM_1YEAR, load_config
+
+_CONFIG = load_config(os.path.join(ROOT, "config/model_config.yaml"))
+
+
+@pytest.fixture(autouse=True)
+def project_root(monkeypatch):
+    """Run every test from the project root, where the config paths point."""
+    monkeypatch.chdir(ROOT)
+
+
+@pytest.fixture
+def cfg(tmp_path) -> dict:
+    """Project config with caches under tmp_path and all file output off."""
+    cfg = copy.deepcopy(_CONFIG)
+    cfg["cache"]["dir"] = str(tmp_path / "cache")
+    cfg["result_cache"]["dir"] = str(tmp_path / "cache" / "results")
+    cfg["settings"]["month"] = [7]
+    cfg["instrumentation"]["enabled"] = False
+    cfg["telemetry"]["enabled"] = False
+    cfg["export"]["enabled"] = False
+    cfg["execution"]["workers"] = 1
+    return cfg
+
+
+@pytest.fixture(scope="session")
+def year() -> pd.DataFrame:
+    """The one-year interim data set."""
+    return pd.read_csv(os.path.join(ROOT, INTERIM_1YEAR), index_col=0, parse_dates=True)
+
+
+@pytest.fixture
+def week(year) -> pd.DataFrame:
+    """First week of July (the PyPSA model is feasible in summer only)."""
+    return year[year.index.month == 7].iloc[:168].copy()
+
+
+@pytest.fixture
+def data(week):
+    """Week without power revenue for three days, so commitment matters."""
+    data = week.copy()
+    data.iloc[:72, data.columns.get_loc("price_el")] = 0.0
+    return data
@@ -0,0 +1,60 @@
+"""
+Runs HiGHS solves in a fresh interpreter. highspy and the HiGHS bundled
+with OR-Tools cannot be loaded into one process, so functions passed to
+run_isolated() must live in modules that do not import OR-Tools.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def run_isolated(func, *args):
+    """Run func(*args) in a spawned process and return its result."""
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(func, *args).result()
+
+
+def highs_objective(path: str) -> float:
+    """Solve an LP file with HiGHS and return the objective value."""
+    import highspy
+
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.readModel(path)
+    h.run()
+    return h.getInfo().objective_function_value
+
+
+def pypsa_exports(data, cfg, directory: str, max_rows: int) -> dict:
+    """
+    Readable PyPSA model exports, written under directory.
+
+    Returns the texts of the built model with max_rows and without a row
+    limit ("capped", "complete"), of the background export started by a
+    HiGHS solve ("background", same "export" config) and of the solved
+    model ("solved").
+    """
+    from src.models.pypsa_model import PyPSAOptimizer
+
+    # solve() writes its export to results/ under the working directory
+    os.chdir(directory)
+    built = PyPSAOptimizer(data, cfg)
+    built.build_model()
+    built._create_model()
+    built.export_readable_model("capped.txt", max_rows=max_rows)
+    built.export_readable_model("complete.txt", max_rows=0)
+
+    solved = PyPSAOptimizer(data, cfg)
+    solved.build_model()
+    solved.solve(solver_name="highs", use_cache=False)
+    solved.export_thread.join()
+    solved.export_readable_model("solved.txt", max_rows=0)
+
+    paths = {"capped": "capped.txt", "complete": "complete.txt",
+             "background": "results/pypsa_model_readable.txt", "solved": "solved.txt"}
+    texts = {}
+    for name, path in paths.items():
+        with open(path, encoding="utf-8") as f:
+            texts[name] = f.read()
+    return texts
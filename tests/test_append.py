@@ -0,0 +1,93 @@
+"""Append mode for new raw price rows."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils import dataloader
+from src.utils.dataloader import append_price_data, process_energy_data
+
+
+def write_lines(path, lines: list) -> None:
+    with open(path, "wb") as f:
+        f.writelines(lines)
+
+
+def append_lines(path, lines: list) -> None:
+    with open(path, "ab") as f:
+        f.writelines(lines)
+
+
+@pytest.fixture
+def raw(cfg, tmp_path) -> dict:
+    """Raw price files without their last rows, and the rows held back."""
+    held_back = {}
+    for source, n_tail in (("electricity_price", 1500), ("gas_price", 700)):
+        with open(cfg["data"][source], "rb") as f:
+            lines = f.readlines()
+        path = tmp_path / os.path.basename(cfg["data"][source])
+        write_lines(path, lines[:-n_tail])
+        cfg["data"][source] = str(path)
+        held_back[source] = lines[-n_tail:]
+    return held_back
+
+
+def use_output_dir(cfg, monkeypatch, directory) -> None:
+    """Point the interim CSVs and the cache of a run into one directory."""
+    os.makedirs(directory, exist_ok=True)
+    monkeypatch.setattr(dataloader, "INTERIM_1YEAR", str(directory / "data_1year.csv"))
+    monkeypatch.setattr(dataloader, "INTERIM_5YEAR", str(directory / "data_5year.csv"))
+    cfg["cache"]["dir"] = str(directory / "cache")
+
+
+def assert_same_output(directory_a, directory_b, result_a, result_b) -> None:
+    for a, b in zip(result_a, result_b):
+        pd.testing.assert_frame_equal(a, b, check_freq=False)
+    for name in ("data_1year.csv", "data_5year.csv"):
+        with open(directory_a / name, "rb") as fa, open(directory_b / name, "rb") as fb:
+            assert fa.read() == fb.read(), name
+
+
+def test_append_equals_full_reprocess(cfg, raw, tmp_path, monkeypatch):
+    use_output_dir(cfg, monkeypatch, tmp_path / "append")
+    process_energy_data(cfg)
+
+    # New rows in two batches, the first ending in a partially written line
+    for source, lines in raw.items():
+        half = len(lines) // 2
+        append_lines(cfg["data"][source], lines[:half] + [lines[half][:10]])
+    append_price_data(cfg)
+    for source, lines in raw.items():
+        half = len(lines) // 2
+        append_lines(cfg["data"][source], [lines[half][10:]] + lines[half + 1:])
+    appended = append_price_data(cfg)
+
+    use_output_dir(cfg, monkeypatch, tmp_path / "full")
+    full = process_energy_data(cfg)
+    assert_same_output(tmp_path / "append", tmp_path / "full", appended, full)
+
+
+def test_append_without_new_rows_keeps_datasets(cfg, raw, tmp_path, monkeypatch):
+    use_output_dir(cfg, monkeypatch, tmp_path / "append")
+    processed = process_energy_data(cfg)
+    appended = append_price_data(cfg)
+    for a, b in zip(appended, processed):
+        pd.testing.assert_frame_equal(a, b, check_freq=False)
+
+
+def test_rewritten_file_needs_full_run(cfg, raw, tmp_path, monkeypatch):
+    use_output_dir(cfg, monkeypatch, tmp_path / "append")
+    process_energy_data(cfg)
+
+    path = cfg["data"]["gas_price"]
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    write_lines(path, lines[:-1] + [lines[-1].replace(b";", b";9", 1)] + raw["gas_price"])
+    with pytest.raises(ValueError, match="modified before the last ingested row"):
+        append_price_data(cfg)
+
+
+def test_append_needs_a_processed_state(cfg, tmp_path):
+    with pytest.raises(ValueError, match="run process_energy_data first"):
+        append_price_data(cfg)
@@ -0,0 +1,78 @@
+"""Fingerprints and the columnar on-disk cache."""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.cache import find_meta, fingerprint, load_frame, load_meta, save_frame
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    index = pd.date_range("2026-07-01", periods=48, freq="h", name="datetime")
+    return pd.DataFrame({"price_el": np.arange(48.0), "demand_th": np.linspace(1, 5, 48)},
+                        index=index)
+
+
+def test_fingerprint_tracks_content(frame):
+    key = fingerprint("v1", frame, {"a": 1, "b": 2})
+    assert fingerprint("v1", frame.copy(), {"b": 2, "a": 1}) == key
+
+    changed = frame.copy()
+    changed.iloc[3, 0] += 1e-9
+    assert fingerprint("v1", changed, {"a": 1, "b": 2}) != key
+    assert fingerprint("v2", frame, {"a": 1, "b": 2}) != key
+    assert fingerprint("v1", frame, {"a": 1, "b": 3}) != key
+
+
+def test_round_trip_and_row_ranges(frame, tmp_path):
+    save_frame(frame, str(tmp_path), "interim", "k" * 64)
+
+    loaded = load_frame(str(tmp_path), "interim", "k" * 64)
+    pd.testing.assert_frame_equal(loaded, frame, check_freq=False)
+    part = load_frame(str(tmp_path), "interim", "k" * 64, ranges=[(0, 5), (40, 48)])
+    pd.testing.assert_frame_equal(part, pd.concat([frame.iloc[:5], frame.iloc[40:]]))
+    assert load_frame(str(tmp_path), "interim", "k" * 64, ranges=[]).empty
+
+
+def test_other_key_is_a_miss(frame, tmp_path):
+    save_frame(frame, str(tmp_path), "interim", "a" * 64)
+    assert load_frame(str(tmp_path), "interim", "b" * 64) is None
+    # Same entry directory (first 16 characters), different key
+    assert load_meta(str(tmp_path), "interim", "a" * 16 + "b" * 48) is None
+
+
+def test_replace_keeps_one_entry_per_dataset(frame, tmp_path):
+    save_frame(frame, str(tmp_path), "interim", "a" * 64, extra={"content_hash": "x"})
+    save_frame(frame * 2, str(tmp_path), "interim", "b" * 64, extra={"content_hash": "y"})
+    save_frame(frame, str(tmp_path), "interim_5y", "c" * 64)
+
+    assert load_frame(str(tmp_path), "interim", "a" * 64) is None
+    meta = find_meta(str(tmp_path), "interim")
+    assert meta["key"] == "b" * 64
+    assert meta["extra"] == {"content_hash": "y"}
+    assert find_meta(str(tmp_path), "prices") is None
+
+
+def test_concurrent_writers_of_one_key(frame, tmp_path):
+    errors = []
+
+    def write():
+        try:
+            save_frame(frame, str(tmp_path), "results", "k" * 64, replace=False)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == [f"results-{'k' * 16}"]
+    loaded = load_frame(str(tmp_path), "results", "k" * 64)
+    pd.testing.assert_frame_equal(loaded, frame, check_freq=False)
@@ -0,0 +1,87 @@
+"""Relaxed commitment: LP relaxation, repair and the LP/MILP routing."""
+
+import numpy as np
+import pytest
+
+from src.models.dispatch import (
+    commitment_mode, evaluate_objective, objective_coefficients, repair_commitment,
+)
+from src.models.ortools_model import ORToolsOptimizer
+
+
+def test_commitment_mode():
+    assert commitment_mode({}, 8760) == "milp"
+    assert commitment_mode({"commitment": {"mode": "relaxed"}}, 24) == "relaxed"
+    auto = {"commitment": {"mode": "auto", "relax_above_hours": 168}}
+    assert commitment_mode(auto, 168) == "milp"
+    assert commitment_mode(auto, 169) == "relaxed"
+    with pytest.raises(ValueError, match="Unknown commitment mode"):
+        commitment_mode({"commitment": {"mode": "lp"}}, 24)
+
+
+def test_repair_commitment_is_feasible(cfg):
+    # Demand forces hour 0 off and hour 1 on whatever the relaxation says
+    demand = np.array([0.3, 17.0, 5.0, 5.0, 5.0])
+    coeff_chp = np.array([0.0, 0.0, 20.0, -100.0, 20.0])
+    coeff_boiler = np.full(5, -50.0)
+    fractional = np.array([0.9, 0.1, 0.7, 0.2, 0.5])
+
+    status = repair_commitment(fractional, coeff_chp, coeff_boiler, demand,
+                               cfg["chp"], cfg["boiler"])
+    np.testing.assert_array_equal(status, [0.0, 1.0, 1.0, 0.0, 1.0])
+
+    must_run = np.array([False, False, False, True, False])
+    status = repair_commitment(fractional, coeff_chp, coeff_boiler, demand,
+                               cfg["chp"], cfg["boiler"], must_run=must_run)
+    assert status[3] == 1.0
+
+
+def test_repair_bridges_short_gaps(cfg):
+    demand = np.full(5, 5.0)
+    coeff_chp = np.array([20.0, 20.0, -30.0, 20.0, 20.0])
+    coeff_boiler = np.full(5, -50.0)
+    rounded = np.array([1.0, 1.0, 0.0, 1.0, 1.0])
+    args = (coeff_chp, coeff_boiler, demand, cfg["chp"], cfg["boiler"])
+
+    np.testing.assert_array_equal(repair_commitment(rounded, *args), rounded)
+    np.testing.assert_array_equal(repair_commitment(rounded, *args, startup_cost=100.0),
+                                  np.ones(5))
+
+
+@pytest.mark.parametrize("startup_cost", [0.0, 50.0])
+def test_relaxed_schedule_is_bounded_by_the_milp(data, cfg, startup_cost):
+    cfg["chp"]["startup_cost"] = startup_cost
+    milp = ORToolsOptimizer(data, cfg)
+    milp.optimize(use_cache=False)
+
+    cfg["commitment"] = {"mode": "relaxed"}
+    relaxed = ORToolsOptimizer(data, cfg)
+    results = relaxed.optimize(use_cache=False)
+
+    assert relaxed.relaxed and relaxed.solver_name == "CLP"
+    assert set(np.unique(results["chp_status"])) <= {0.0, 1.0}
+    tolerance = 1e-6 * abs(milp.objective_value)
+    assert relaxed.objective_value <= milp.objective_value + tolerance
+    assert relaxed.relaxation["bound"] >= milp.objective_value - tolerance
+    assert relaxed.relaxation["objective"] == relaxed.objective_value
+    assert relaxed.objective_value == pytest.approx(evaluate_objective(results, data, cfg))
+
+
+def test_auto_mode_routes_by_horizon(week, cfg):
+    cfg["commitment"] = {"mode": "auto", "relax_above_hours": 100}
+    long = ORToolsOptimizer(week, cfg)
+    long.optimize(use_cache=False)
+    short = ORToolsOptimizer(week.iloc[:100], cfg)
+    short.optimize(use_cache=False)
+
+    assert long.relaxed and long.relaxation is not None
+    assert not short.relaxed and short.relaxation is None
+    assert short.solver_name == cfg["settings"]["solver"]
+
+
+def test_relaxed_mode_is_part_of_the_cache_key(week, cfg):
+    ORToolsOptimizer(week, cfg).optimize()
+    cfg["commitment"] = {"mode": "relaxed"}
+    relaxed = ORToolsOptimizer(week, cfg)
+    relaxed.optimize()
+    assert not relaxed.from_cache and relaxed.relaxation is not None
@@ -0,0 +1,22 @@
+"""Config sections with defaults."""
+
+from src.utils.config import config_section, override_section
+
+DEFAULTS = {"enabled": False, "dir": "data/cache"}
+
+
+def test_config_section():
+    assert config_section({}, "cache", DEFAULTS) == DEFAULTS
+    assert config_section({"cache": None}, "cache", DEFAULTS) == DEFAULTS
+    assert config_section({"cache": {"enabled": True}}, "cache", DEFAULTS) \
+        == {"enabled": True, "dir": "data/cache"}
+    assert DEFAULTS == {"enabled": False, "dir": "data/cache"}
+
+
+def test_override_section_copies():
+    cfg = {"export": {"enabled": True, "gzip": True}, "chp": {"p_gas_max": 2.5}}
+    changed = override_section(cfg, "export", enabled=False)
+    assert changed["export"] == {"enabled": False, "gzip": True}
+    assert cfg["export"]["enabled"]
+    assert changed["chp"] is not cfg["chp"]
+    assert override_section({}, "telemetry", enabled=True) == {"telemetry": {"enabled": True}}
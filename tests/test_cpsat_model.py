@@ -0,0 +1,64 @@
+"""CP-SAT backend on the integer-scaled gas grid."""
+
+import pytest
+
+from src.models.cpsat_model import CPSATOptimizer
+from src.models.dispatch import evaluate_objective
+from src.models.ortools_model import ORToolsOptimizer
+
+
+@pytest.fixture
+def cfg(cfg):
+    cfg["cpsat"] = {}
+    cfg["solver_options"] = {"threads": 2}
+    return cfg
+
+
+@pytest.mark.parametrize("resolution", [0.001, 0.25])
+@pytest.mark.parametrize("startup_cost", [0.0, 10.0])
+def test_objective_within_the_scaling_error_bound(data, cfg, resolution, startup_cost):
+    cfg["chp"]["startup_cost"] = startup_cost
+    cfg["cpsat"]["resolution"] = resolution
+    milp = ORToolsOptimizer(data, cfg)
+    milp.optimize(use_cache=False)
+    optimizer = CPSATOptimizer(data, cfg)
+    results = optimizer.optimize(use_cache=False)
+
+    bound = optimizer.discretization["scaling_error_bound"]
+    # The schedule is feasible in the continuous model, so never better than the MILP
+    assert optimizer.objective_value <= milp.objective_value + 1e-6
+    assert optimizer.objective_value >= milp.objective_value - bound
+    assert optimizer.objective_value == pytest.approx(evaluate_objective(results, data, cfg))
+
+
+def test_discretization_error_is_bounded(data, cfg):
+    cfg["cpsat"]["resolution"] = 0.25
+    optimizer = CPSATOptimizer(data, cfg)
+    optimizer.optimize(use_cache=False)
+
+    discretization = optimizer.discretization
+    assert discretization["resolution"] == 0.25
+    # Re-optimizing the gas flows for the grid's commitment can only gain
+    assert 0.0 <= discretization["error"] <= discretization["scaling_error_bound"]
+    assert discretization["discrete_objective"] + discretization["error"] \
+        == pytest.approx(optimizer.objective_value)
+
+
+def test_infeasible_grid_raises(week, cfg):
+    # Beyond the boiler the CHP needs 2.2 MWh gas: 3 steps of 1 MWh, above its maximum
+    data = week.iloc[:24].copy()
+    data.iloc[5, data.columns.get_loc("demand_th")] = 17.0
+    cfg["cpsat"]["resolution"] = 1.0
+    with pytest.raises(ValueError, match="grid in 1 hours"):
+        CPSATOptimizer(data, cfg).optimize(use_cache=False)
+
+
+def test_cached_results_keep_the_discretization(data, cfg):
+    first = CPSATOptimizer(data, cfg)
+    first.optimize()
+    second = CPSATOptimizer(data, cfg)
+    second.optimize()
+
+    assert second.from_cache
+    assert second.objective_value == first.objective_value
+    assert second.discretization == first.discretization
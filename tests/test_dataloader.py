@@ -0,0 +1,81 @@
+"""Interim data loading through the columnar cache."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import dataloader
+from src.utils.dataloader import INTERIM_1YEAR, load_data, read_interim, time_ranges
+
+
+@pytest.mark.parametrize("settings", [
+    {"month": [7]},
+    {"month": [2, 12], "day": 14},
+    {"month": 3, "hour": 8},
+    {"day": 31},
+    {"month": []},
+])
+def test_cached_load_matches_csv_load(cfg, settings):
+    cfg["settings"] = {**cfg["settings"], "month": None, **settings}
+    cached = load_data(INTERIM_1YEAR, cfg)
+    load_data(INTERIM_1YEAR, cfg)  # warm
+    cfg["cache"]["enabled"] = False
+    pd.testing.assert_frame_equal(load_data(INTERIM_1YEAR, cfg), cached, check_freq=False)
+
+
+def test_time_ranges_match_mask(year):
+    index = year.index.values
+    for months, day in (([1, 7], None), ([2], 29), (None, 1), ([12], 31)):
+        mask = np.ones(len(year), dtype=bool)
+        if months:
+            mask &= year.index.month.isin(months)
+        if day is not None:
+            mask &= year.index.day == day
+        rows = [i for start, stop in time_ranges(index, months, day) for i in range(start, stop)]
+        assert rows == list(np.flatnonzero(mask))
+    assert time_ranges(index) is None
+
+
+@pytest.fixture
+def counted(monkeypatch) -> dict:
+    """Count content hashes and CSV parses in read_interim."""
+    counts = {"hash": 0, "parse": 0}
+    file_hash, read_csv = dataloader.file_hash, pd.read_csv
+
+    def counting_hash(*args, **kwargs):
+        counts["hash"] += 1
+        return file_hash(*args, **kwargs)
+
+    def counting_read_csv(*args, **kwargs):
+        counts["parse"] += 1
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(dataloader, "file_hash", counting_hash)
+    monkeypatch.setattr(dataloader.pd, "read_csv", counting_read_csv)
+    return counts
+
+
+def test_interim_cache_keys_on_file_stat(week, cfg, tmp_path, counted):
+    path = str(tmp_path / "data_week.csv")
+    week.to_csv(path)
+
+    read_interim(path, cfg)
+    assert counted == {"hash": 1, "parse": 1}
+
+    # Warm load: stat only
+    read_interim(path, cfg)
+    assert counted == {"hash": 1, "parse": 1}
+
+    # Touched, same content: hashed once and re-keyed without parsing
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    pd.testing.assert_frame_equal(read_interim(path, cfg), week, check_freq=False)
+    assert counted == {"hash": 2, "parse": 1}
+
+    # Changed content: parsed again
+    changed = week.assign(demand_th=week["demand_th"] + 1.0)
+    changed.to_csv(path)
+    pd.testing.assert_frame_equal(read_interim(path, cfg), changed, check_freq=False)
+    assert counted == {"hash": 3, "parse": 2}
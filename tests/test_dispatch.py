@@ -0,0 +1,38 @@
+"""Closed-form merit-order dispatch."""
+
+import numpy as np
+import pytest
+
+from src.models.dispatch import MeritOrderDispatch, evaluate_objective
+
+
+def test_verify_matches_milp(week, cfg):
+    check = MeritOrderDispatch(week, cfg).verify()
+    assert check["match"]
+    assert check["dispatch_objective"] == pytest.approx(check["milp_objective"], rel=1e-4)
+
+
+def test_dispatch_meets_demand_within_limits(week, cfg):
+    results = MeritOrderDispatch(week, cfg).optimize()
+    chp, boiler = cfg["chp"], cfg["boiler"]
+
+    heat = results["chp_heat_out"] + results["boiler_heat_out"]
+    np.testing.assert_allclose(heat.values, week["demand_th"].values, atol=1e-9)
+
+    on = results["chp_status"] > 0.5
+    assert (results.loc[on, "chp_gas_in"] >= chp["p_gas_min"] - 1e-9).all()
+    assert (results["chp_gas_in"] <= chp["p_gas_max"] + 1e-9).all()
+    assert (results.loc[~on, "chp_gas_in"] == 0).all()
+    assert (results["boiler_gas_in"] <= boiler["p_gas_max"] + 1e-9).all()
+
+
+def test_objective_matches_evaluated_schedule(week, cfg):
+    dispatch = MeritOrderDispatch(week, cfg)
+    results = dispatch.optimize()
+    assert dispatch.objective_value == pytest.approx(evaluate_objective(results, week, cfg))
+
+
+def test_startup_cost_is_rejected(week, cfg):
+    cfg["chp"]["startup_cost"] = 100.0
+    with pytest.raises(ValueError, match="independent hours"):
+        MeritOrderDispatch(week, cfg).optimize()
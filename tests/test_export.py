@@ -0,0 +1,98 @@
+"""Debug model exports."""
+
+import gzip
+import io
+
+import pytest
+from ortools.linear_solver import linear_solver_pb2
+
+from isolated import highs_objective, pypsa_exports, run_isolated
+from src.models.ortools_model import ORToolsOptimizer
+from src.utils.export import open_export, run_export, write_lp
+
+
+def built_model(data, cfg) -> tuple:
+    """
+    Solved optimizer with the presolve on. Without power revenue in the
+    first three days of the data fixture the CHP is fixed off there, and
+    the boiler cost of those hours becomes an objective offset.
+    """
+    cfg["settings"]["presolve"] = True
+    cfg["chp"]["startup_cost"] = 10.0
+    optimizer = ORToolsOptimizer(data, cfg)
+    optimizer.optimize(use_cache=False)
+    proto = linear_solver_pb2.MPModelProto()
+    optimizer.solver.ExportModelToProto(proto)
+    return optimizer, proto
+
+
+def test_complete_lp_file_solves_to_same_objective(data, cfg, tmp_path):
+    optimizer, proto = built_model(data, cfg)
+    assert proto.objective_offset != 0
+
+    path = tmp_path / "model.lp"
+    with open(path, "w") as f:
+        write_lp(proto, f, max_rows=0, chunk_rows=7)
+
+    objective = run_isolated(highs_objective, str(path))
+    assert objective == pytest.approx(optimizer.objective_value, rel=1e-7)
+
+
+def test_max_rows_cuts_every_block(data, cfg):
+    _, proto = built_model(data, cfg)
+    f = io.StringIO()
+    write_lp(proto, f, max_rows=5)
+    text = f.getvalue()
+
+    assert text.count("more rows omitted (export.max_rows)") == 4
+    assert text.rstrip().endswith("End")
+
+
+def test_background_export_writes_gzip(data, cfg, tmp_path):
+    optimizer, _ = built_model(data, cfg)
+    optimizer.cfg["export"].update(enabled=True, background=True, gzip=True, max_rows=0)
+    optimizer._export_lp_file(str(tmp_path / "model.lp"))
+
+    assert optimizer.export_thread is not None
+    optimizer.export_thread.join()
+    with gzip.open(tmp_path / "model.lp.gz", "rt") as f:
+        assert f.read().rstrip().endswith("End")
+
+
+def _block_rows(text: str, heading: str) -> int:
+    """Number of printed rows in the block under "--- heading"."""
+    block = text.split(f"--- {heading}", 1)[1].split("\n\n", 1)[0]
+    return sum(line.startswith("[") for line in block.splitlines())
+
+
+def test_readable_pypsa_export(data, cfg, tmp_path):
+    days = data.iloc[:72]
+    cfg["export"].update(enabled=True, background=True, gzip=False, max_rows=0)
+    texts = run_isolated(pypsa_exports, days, cfg, str(tmp_path), 5)
+
+    # display_max_rows cuts every block; max_rows=0 prints all rows
+    for heading in ("Link-status [BINARY]", "CHP_gas_geq_Boiler_gas"):
+        assert _block_rows(texts["complete"], heading) == len(days)
+        assert 0 < _block_rows(texts["capped"], heading) <= 5
+    assert "\t\t..." in texts["capped"] and "\t\t..." not in texts["complete"]
+
+    # The background export shows the model as built, not as solved
+    assert texts["background"] == texts["complete"]
+    assert texts["solved"] != texts["complete"]
+    assert "Value: None" in texts["background"] and "Value: None" not in texts["solved"]
+
+
+def test_open_export_appends_gz_suffix(tmp_path):
+    f, path = open_export(str(tmp_path / "sub" / "out.txt"), compress=True)
+    with f:
+        f.write("x")
+    assert path.endswith("out.txt.gz")
+
+
+def test_failed_export_is_reported_not_raised(capsys):
+    def fail():
+        raise OSError("disk full")
+
+    assert run_export(fail, background=False) is None
+    run_export(fail, background=True).join()
+    assert capsys.readouterr().out.count("Model export failed: disk full") == 2
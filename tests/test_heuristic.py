@@ -0,0 +1,109 @@
+"""Heuristic incumbent and objective cutoff of the MILP."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models import ortools_model
+from src.models.dispatch import evaluate_objective, heuristic_dispatch, objective_coefficients
+from src.models.ortools_model import ORToolsOptimizer
+
+
+def _heuristic(data, cfg, startup_cost):
+    coeff_chp, coeff_boiler = objective_coefficients(data, cfg)
+    return heuristic_dispatch(coeff_chp, coeff_boiler, data["demand_th"].values,
+                              cfg["chp"], cfg["boiler"], startup_cost)
+
+
+def _milp_objective(data, cfg) -> float:
+    optimizer = ORToolsOptimizer(data, cfg)
+    optimizer.optimize(use_cache=False)
+    return optimizer.objective_value
+
+
+@pytest.mark.parametrize("startup_cost", [0.0, 10.0, 50.0])
+def test_heuristic_is_feasible_and_bounded_by_the_milp(data, cfg, startup_cost):
+    cfg["chp"]["startup_cost"] = startup_cost
+    dispatch = _heuristic(data, cfg, startup_cost)
+    chp, boiler = cfg["chp"], cfg["boiler"]
+
+    heat = dispatch["chp_gas"] * chp["eta_th"] + dispatch["boiler_gas"] * boiler["eta_th"]
+    np.testing.assert_allclose(heat, data["demand_th"].values, atol=1e-9)
+    on = dispatch["chp_status"] > 0.5
+    assert (dispatch["chp_gas"][on] >= chp["p_gas_min"] - 1e-9).all()
+    assert (dispatch["chp_gas"] <= chp["p_gas_max"] + 1e-9).all()
+    assert (dispatch["chp_gas"][~on] == 0).all()
+    assert (dispatch["boiler_gas"] <= boiler["p_gas_max"] + 1e-9).all()
+
+    results = pd.DataFrame({"chp_gas_in": dispatch["chp_gas"],
+                            "boiler_gas_in": dispatch["boiler_gas"],
+                            "chp_status": dispatch["chp_status"]}, index=data.index)
+    assert dispatch["profit"] == pytest.approx(evaluate_objective(results, data, cfg))
+
+    milp = _milp_objective(data, cfg)
+    assert dispatch["profit"] <= milp + 1e-6 * abs(milp)
+    if not startup_cost:
+        assert dispatch["profit"] == pytest.approx(milp, rel=1e-7)
+
+
+def test_repair_improves_the_merit_order(data, cfg):
+    plain = _heuristic(data, cfg, startup_cost=0.0)
+    repaired = _heuristic(data, cfg, startup_cost=50.0)
+    plain_profit = plain["profit"] - 50.0 * plain["chp_start"].sum()
+    assert repaired["chp_start"].sum() < plain["chp_start"].sum()
+    assert repaired["profit"] > plain_profit
+
+
+@pytest.mark.parametrize("solver", ["SCIP", "CBC"])
+@pytest.mark.parametrize("cutoff", [False, True])
+def test_incumbent_keeps_the_optimum(data, cfg, solver, cutoff):
+    cfg["settings"]["solver"] = solver
+    cfg["chp"]["startup_cost"] = 10.0
+    expected = _milp_objective(data, cfg)
+
+    cfg["settings"]["heuristic"] = True
+    cfg["settings"]["cutoff"] = cutoff
+    optimizer = ORToolsOptimizer(data, cfg)
+    optimizer.optimize(use_cache=False)
+
+    assert optimizer.objective_value == pytest.approx(expected, rel=1e-7)
+    assert optimizer.heuristic["objective"] <= optimizer.objective_value + 1e-6
+    assert optimizer.heuristic["gap"] >= 0.0
+    assert (optimizer.c_cutoff is not None) == cutoff
+
+
+def test_cutoff_follows_updated_parameters(data, cfg, week):
+    cfg["chp"]["startup_cost"] = 10.0
+    cfg["settings"]["heuristic"] = True
+    cfg["settings"]["cutoff"] = True
+    optimizer = ORToolsOptimizer(week, cfg)
+    optimizer.optimize(use_cache=False)
+
+    # A stale cutoff from the week would make the changed model infeasible
+    optimizer.update_parameters(price_el=data["price_el"])
+    optimizer.resolve()
+    assert optimizer.objective_value == pytest.approx(_milp_objective(data, cfg), rel=1e-7)
+
+
+def _fail(*args, **kwargs):
+    raise ValueError("no dispatch")
+
+
+@pytest.mark.parametrize("second_run", ["fails", "disabled"])
+def test_stale_cutoff_is_dropped(data, cfg, week, monkeypatch, second_run):
+    cfg["chp"]["startup_cost"] = 10.0
+    cfg["settings"]["heuristic"] = True
+    cfg["settings"]["cutoff"] = True
+    optimizer = ORToolsOptimizer(week, cfg)
+    optimizer.optimize(use_cache=False)
+
+    # The cutoff of the week is above the optimum of the changed data
+    if second_run == "fails":
+        monkeypatch.setattr(ortools_model, "heuristic_dispatch", _fail)
+    else:
+        cfg["settings"]["heuristic"] = False
+    optimizer.update_parameters(price_el=data["price_el"])
+    optimizer.resolve()
+    assert optimizer.heuristic is None
+    cfg["settings"]["heuristic"] = False
+    assert optimizer.objective_value == pytest.approx(_milp_objective(data, cfg), rel=1e-7)
@@ -0,0 +1,91 @@
+"""Per-phase instrumentation records."""
+
+import json
+
+import pytest
+
+from src.models.ortools_model import ORToolsOptimizer
+from src.utils import instrumentation
+from src.utils.instrumentation import JsonlSink, MemorySink, configure, instrumented, phase
+
+
+@pytest.fixture
+def sink():
+    """Collect records in memory for one test."""
+    sink = MemorySink()
+    instrumentation.set_sink(sink)
+    yield sink
+    instrumentation.set_sink(None)
+
+
+def test_phase_record_fields(sink):
+    with phase("test", "build", steps=24) as record:
+        record["n_vars"] = 72
+
+    (emitted,) = sink.records
+    assert emitted is record
+    assert {"component": "test", "phase": "build", "steps": 24, "n_vars": 72}.items() \
+        <= emitted.items()
+    assert {"wall_s", "cpu_s", "process_peak_rss_mb", "peak_rss_growth_mb", "pid",
+            "timestamp"} <= emitted.keys()
+
+
+def test_peak_rss_growth_is_per_phase(sink, monkeypatch):
+    # Process peak at the start and end of each phase
+    peaks = iter([100.0, 350.0, 350.0, 350.0])
+    monkeypatch.setattr(instrumentation, "process_peak_rss_mb", lambda: next(peaks))
+    with phase("test", "allocate"):
+        pass
+    with phase("test", "idle"):
+        pass
+
+    allocate, idle = sink.records
+    assert (allocate["process_peak_rss_mb"], allocate["peak_rss_growth_mb"]) == (350.0, 250.0)
+    # The process peak still includes the earlier phase
+    assert (idle["process_peak_rss_mb"], idle["peak_rss_growth_mb"]) == (350.0, 0.0)
+
+
+def test_error_is_recorded_and_raised(sink):
+    @instrumented("test")
+    def load():
+        raise FileNotFoundError("data.csv")
+
+    with pytest.raises(FileNotFoundError):
+        load()
+    assert sink.records[0]["phase"] == "load"
+    assert sink.records[0]["error"] == "FileNotFoundError: data.csv"
+
+
+def test_null_sink_still_times_the_phase():
+    assert not instrumentation.enabled()
+    with phase("test", "solve") as record:
+        pass
+    assert "wall_s" in record and "pid" not in record
+
+
+def test_optimizer_phases(sink, week, cfg):
+    ORToolsOptimizer(week, cfg).optimize()
+    ORToolsOptimizer(week, cfg).optimize()
+
+    phases = [(r["component"], r["phase"]) for r in sink.records]
+    assert phases == [("ortools", "cache_lookup"), ("ortools", "build"),
+                      ("ortools", "solve"), ("ortools", "extract"), ("ortools", "cache_lookup")]
+    build = sink.records[1]
+    assert build["steps"] == len(week)
+    assert build["n_vars"] == 3 * len(week)
+    assert [r["hit"] for r in sink.records if r["phase"] == "cache_lookup"] == [False, True]
+
+
+def test_jsonl_sink_from_config(cfg, tmp_path):
+    path = tmp_path / "metrics" / "phases.jsonl"
+    try:
+        configure(cfg, path=str(path))
+        assert isinstance(instrumentation.get_sink(), JsonlSink)
+        for name in ("load", "solve"):
+            with phase("test", name):
+                pass
+    finally:
+        instrumentation.set_sink(None)
+
+    with open(path) as f:
+        assert [json.loads(line)["phase"] for line in f] == ["load", "solve"]
@@ -0,0 +1,68 @@
+"""Command line entry point."""
+
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+import yaml
+
+from isolated import run_isolated
+from src import main
+
+
+def solve(cfg, tmp_path, monkeypatch, *argv) -> dict:
+    """Run 'python -m src solve' with cfg; return the results CSVs by backend."""
+    results_dir = tmp_path / "results"
+    monkeypatch.setattr(main, "RESULTS_DIR", str(results_dir))
+    config_path = tmp_path / "config.yaml"
+    with open(config_path, "w") as f:
+        yaml.safe_dump(cfg, f)
+
+    main.main(["--config", str(config_path), *argv])
+    return {name.rsplit("_results", 1)[0]: pd.read_csv(results_dir / name, index_col=0)
+            for name in os.listdir(results_dir) if name.endswith("_results.csv")}
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_backends_solve_in_worker_processes(cfg, tmp_path, monkeypatch, concurrent):
+    cfg["execution"]["backends_concurrent"] = concurrent
+    results = solve(cfg, tmp_path, monkeypatch,
+                    "solve", "--backend", "ortools", "merit_order", "--no-plot")
+
+    assert sorted(results) == ["merit_order", "ortools"]
+    assert len(results["ortools"]) == 31 * 24
+    pd.testing.assert_frame_equal(results["merit_order"], results["ortools"], atol=2e-3)
+
+
+def test_cli_imports_no_heavy_library():
+    code = ("import sys; from src import main; main.build_parser().format_help(); "
+            "print(','.join(m for m in ('pandas', 'numpy', 'ortools', 'pypsa', 'matplotlib') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True).stdout
+    assert out.strip() == ""
+
+
+def test_help_lists_commands():
+    out = subprocess.run([sys.executable, "-m", "src", "--help"], check=True,
+                         capture_output=True, text=True).stdout
+    for command in ("load", "solve", "compare", "plot", "sweep"):
+        assert command in out
+
+
+def test_script_runs_from_any_directory(tmp_path):
+    script = os.path.join(main.PROJECT_ROOT, "src", "main.py")
+    out = subprocess.run([sys.executable, script, "load"], cwd=tmp_path, check=True,
+                         capture_output=True, text=True).stdout
+    assert "Data loaded" in out and "OPTIMIZATION COMPLETE" in out
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_pypsa_solve_raises(year, cfg):
+    # The heat demand of a January week cannot be met in the PyPSA model
+    data = year[year.index.month == 1].iloc[:168].copy()
+    cfg["settings"]["solver"] = "highs"
+    with pytest.raises(RuntimeError, match="PyPSA solve failed"):
+        run_isolated(main.solve_stage, data, "pypsa", cfg)
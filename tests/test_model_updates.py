@@ -0,0 +1,69 @@
+"""Persistent-model updates and warm-started re-solves of ORToolsOptimizer."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.ortools_model import ORToolsOptimizer
+
+
+def fresh_objective(data, cfg) -> float:
+    """Objective of a model built from scratch."""
+    optimizer = ORToolsOptimizer(data, cfg)
+    optimizer.optimize(use_cache=False)
+    return optimizer.objective_value
+
+
+def updated_data(week) -> pd.DataFrame:
+    """Week with shifted prices and a scaled demand."""
+    data = week.copy()
+    data["price_el"] = data["price_el"] * 1.5
+    data["price_gas"] = data["price_gas"] + 5.0
+    data["demand_th"] = data["demand_th"] * 0.9
+    return data
+
+
+@pytest.mark.parametrize("warm_start", [True, False])
+@pytest.mark.parametrize("presolve", [False, True])
+def test_resolve_matches_rebuilt_model(week, cfg, warm_start, presolve):
+    cfg["settings"]["presolve"] = presolve
+    cfg["chp"]["startup_cost"] = 150.0
+    optimizer = ORToolsOptimizer(week, cfg)
+    optimizer.optimize(use_cache=False)
+
+    data = updated_data(week)
+    optimizer.update_parameters(price_el=data["price_el"], price_gas=data["price_gas"],
+                                demand_th=data["demand_th"])
+    optimizer.resolve(warm_start=warm_start)
+
+    assert optimizer.objective_value == pytest.approx(fresh_objective(data, cfg), rel=1e-6)
+
+
+def test_co2_price_update(week, cfg):
+    optimizer = ORToolsOptimizer(week, cfg)
+    optimizer.optimize(use_cache=False)
+    optimizer.update_parameters(co2_price=120.0)
+    optimizer.resolve()
+
+    cfg["data"]["co2_price"] = 120.0
+    assert optimizer.objective_value == pytest.approx(fresh_objective(week, cfg), rel=1e-6)
+
+
+def test_update_after_cache_hit_builds_the_model(week, cfg):
+    ORToolsOptimizer(week, cfg).optimize()
+    cached = ORToolsOptimizer(week, cfg)
+    cached.optimize()
+    assert cached.from_cache and cached.solver is None
+
+    data = updated_data(week)
+    cached.update_parameters(price_el=data["price_el"])
+    cached.resolve()
+    data["price_gas"], data["demand_th"] = week["price_gas"], week["demand_th"]
+    assert cached.objective_value == pytest.approx(fresh_objective(data, cfg), rel=1e-6)
+
+
+def test_update_rejects_wrong_length(week, cfg):
+    optimizer = ORToolsOptimizer(week, cfg)
+    optimizer.optimize(use_cache=False)
+    with pytest.raises(ValueError, match="time steps"):
+        optimizer.update_parameters(price_el=np.ones(len(week) - 1))
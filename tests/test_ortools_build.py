@@ -0,0 +1,59 @@
+"""Loop and array builds of ORToolsOptimizer must produce the same model."""
+
+import pytest
+from ortools.linear_solver import linear_solver_pb2
+
+from src.models.ortools_model import ORToolsOptimizer
+
+
+def build_proto(data, cfg, build_mode: str) -> linear_solver_pb2.MPModelProto:
+    """Build the model in one mode and export it."""
+    cfg["settings"]["build_mode"] = build_mode
+    optimizer = ORToolsOptimizer(data, cfg)
+    optimizer._build_model()
+    proto = linear_solver_pb2.MPModelProto()
+    optimizer.solver.ExportModelToProto(proto)
+    return proto
+
+
+def canonical(proto: linear_solver_pb2.MPModelProto) -> dict:
+    """Variables and rows of a model, independent of the term order in each row."""
+    variables = [
+        (v.name, v.lower_bound, v.upper_bound, v.is_integer, v.objective_coefficient)
+        for v in proto.variable
+    ]
+    rows = sorted(
+        (c.lower_bound, c.upper_bound,
+         tuple(sorted(zip(c.var_index, c.coefficient))))
+        for c in proto.constraint
+    )
+    return {
+        "variables": variables,
+        "rows": rows,
+        "maximize": proto.maximize,
+        "offset": proto.objective_offset,
+    }
+
+
+@pytest.mark.parametrize("startup_cost", [0.0, 200.0])
+def test_array_build_matches_loop_build(week, cfg, startup_cost):
+    cfg["chp"]["startup_cost"] = startup_cost
+    loop = canonical(build_proto(week, cfg, "loop"))
+    array = canonical(build_proto(week, cfg, "array"))
+    assert array == loop
+
+
+def test_array_build_solves_to_loop_objective(week, cfg):
+    objectives = {}
+    for mode in ("loop", "array"):
+        cfg["settings"]["build_mode"] = mode
+        optimizer = ORToolsOptimizer(week, cfg)
+        optimizer.optimize(use_cache=False)
+        objectives[mode] = optimizer.objective_value
+    assert objectives["array"] == pytest.approx(objectives["loop"], rel=1e-9)
+
+
+def test_unknown_build_mode_is_rejected(week, cfg):
+    cfg["settings"]["build_mode"] = "matrix"
+    with pytest.raises(ValueError, match="Unknown build_mode"):
+        ORToolsOptimizer(week, cfg)._build_model()
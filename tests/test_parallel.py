@@ -0,0 +1,64 @@
+"""Process-pool execution of independent windows."""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from src.models.rolling_horizon import RollingHorizonOptimizer
+from src.utils.parallel import iter_parallel, resolve_workers, run_parallel
+
+
+def _scaled_sqrt(task, shared: dict) -> float:
+    """Task function for the pool (module level, so workers can unpickle it)."""
+    if task < 0:
+        raise ValueError(f"negative task {task}")
+    return shared["scale"] * task ** 0.5
+
+
+def _sleep(seconds: float, shared: dict) -> float:
+    """Task function that takes the given time."""
+    time.sleep(seconds)
+    return seconds
+
+
+def test_resolve_workers():
+    assert resolve_workers(None) == (os.cpu_count() or 1)
+    assert resolve_workers(0) == (os.cpu_count() or 1)
+    assert resolve_workers(3) == 3
+    assert resolve_workers(-2) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_parallel_keeps_task_order_and_reports_failures(workers):
+    records = run_parallel(_scaled_sqrt, [4, -1, 9], workers=workers, shared={"scale": 2.0})
+
+    assert [r["index"] for r in records] == [0, 1, 2]
+    assert [r["ok"] for r in records] == [True, False, True]
+    assert records[0]["result"] == 4.0
+    assert records[2]["result"] == 6.0
+    assert records[1]["error"].startswith("ValueError: negative task -1")
+
+
+def test_iter_parallel_yields_in_completion_order():
+    start = time.perf_counter()
+    records = list(iter_parallel(_sleep, [1.0, 0.1], workers=2))
+
+    assert [r["index"] for r in records] == [1, 0]
+    assert time.perf_counter() - start < 1.8
+    assert records[0]["pid"] != records[1]["pid"]
+
+
+def test_parallel_windows_match_serial(week, cfg):
+    cfg["rolling_horizon"] = {"window_hours": 48, "commit_hours": 40}
+    serial = RollingHorizonOptimizer(week, cfg)
+    serial.optimize()
+
+    cfg["execution"]["workers"] = 2
+    parallel = RollingHorizonOptimizer(week, cfg)
+    parallel.optimize()
+
+    pd.testing.assert_frame_equal(parallel.results, serial.results, atol=1e-6)
+    assert parallel.objective_value == pytest.approx(serial.objective_value)
+    assert parallel.window_stats["initial_status"].isna().all()
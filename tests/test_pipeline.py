@@ -0,0 +1,86 @@
+"""Stage pipeline with fingerprint-based skipping."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils.pipeline import Pipeline, Stage
+
+
+def load(n: int) -> pd.DataFrame:
+    index = pd.date_range("2026-07-01", periods=n, freq="h", name="datetime")
+    return pd.DataFrame({"x": range(n)}, index=index, dtype=float)
+
+
+def scale(df: pd.DataFrame, factor: float) -> pd.DataFrame:
+    return df * factor
+
+
+def report(df: pd.DataFrame, path: str) -> dict:
+    df.to_csv(path)
+    return {"total": float(df["x"].sum())}
+
+
+def fail(df: pd.DataFrame) -> dict:
+    raise RuntimeError("solver crashed")
+
+
+def pipeline(cfg, tmp_path, factor: float = 2.0, extra: list = ()) -> Pipeline:
+    return Pipeline(cfg, [
+        Stage("load", load, kwargs={"n": 24}),
+        Stage("scale", scale, inputs=["load"], kwargs={"factor": factor}, process=True),
+        Stage("report", report, inputs=["scale"], kwargs={"path": str(tmp_path / "out.csv")},
+              key="report", outputs=[str(tmp_path / "out.csv")]),
+        *extra,
+    ])
+
+
+def test_second_run_is_cached(cfg, tmp_path):
+    assert set(pipeline(cfg, tmp_path).run().values()) == {"ran"}
+    assert set(pipeline(cfg, tmp_path).run().values()) == {"cached"}
+    assert set(pipeline(cfg, tmp_path).run(force=True).values()) == {"ran"}
+
+
+def test_change_reruns_the_stage_and_everything_downstream(cfg, tmp_path):
+    pipeline(cfg, tmp_path).run()
+    status = pipeline(cfg, tmp_path, factor=3.0).run(workers=0)
+
+    assert status == {"load": "cached", "scale": "ran", "report": "ran"}
+    assert pd.read_csv(tmp_path / "out.csv")["x"].sum() == 3.0 * sum(range(24))
+
+
+def test_missing_output_reruns_only_its_stage(cfg, tmp_path):
+    pipeline(cfg, tmp_path).run()
+    os.remove(tmp_path / "out.csv")
+    status = pipeline(cfg, tmp_path).run()
+
+    assert status == {"load": "cached", "scale": "cached", "report": "ran"}
+    assert pd.read_csv(tmp_path / "out.csv")["x"].sum() == 2.0 * sum(range(24))
+
+
+def test_targets_run_only_their_ancestors(cfg, tmp_path):
+    assert pipeline(cfg, tmp_path).run(["scale"]) == {"load": "ran", "scale": "ran"}
+
+
+def test_failure_blocks_dependents_only(cfg, tmp_path):
+    extra = [Stage("solve", fail, inputs=["load"], process=True),
+             Stage("compare", report, inputs=["solve"], kwargs={"path": str(tmp_path / "c.csv")})]
+    status = pipeline(cfg, tmp_path, extra=extra).run()
+
+    assert status == {"load": "ran", "scale": "ran", "report": "ran",
+                      "solve": "failed", "compare": "blocked"}
+
+
+def test_disabled_cache_always_runs(cfg, tmp_path):
+    cfg["cache"]["enabled"] = False
+    pipeline(cfg, tmp_path).run()
+    assert set(pipeline(cfg, tmp_path).run().values()) == {"ran"}
+
+
+def test_invalid_graphs_are_rejected(cfg):
+    with pytest.raises(ValueError, match="unknown stage"):
+        Pipeline(cfg, [Stage("a", load, inputs=["b"])])
+    cycle = Pipeline(cfg, [Stage("a", load, inputs=["b"]), Stage("b", load, inputs=["a"])])
+    with pytest.raises(ValueError, match="cycle"):
+        cycle.run()
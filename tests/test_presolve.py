@@ -0,0 +1,67 @@
+"""Presolve of the CHP status binaries."""
+
+import numpy as np
+import pytest
+
+from src.models.dispatch import objective_coefficients, presolve_status
+from src.models.ortools_model import ORToolsOptimizer
+
+# Demand-fixed off and on, margin-fixed on and off, and a small margin
+DEMAND = np.array([0.3, 17.0, 5.0, 5.0, 5.0])
+COEFF_CHP = np.array([0.0, 0.0, 20.0, -100.0, -20.0])
+COEFF_BOILER = np.full(5, -50.0)
+
+
+def _status(cfg, startup_cost):
+    return presolve_status(COEFF_CHP, COEFF_BOILER, DEMAND, cfg["chp"], cfg["boiler"],
+                           startup_cost)
+
+
+def test_demand_and_margin_rules(cfg):
+    fix = _status(cfg, startup_cost=50.0)
+    np.testing.assert_array_equal(fix["status"], [0.0, 1.0, 1.0, 0.0, np.nan])
+    assert (fix["fixed_by_demand"], fix["fixed_by_margin"]) == (2, 2)
+
+    # Bounds: no CHP where off, at least the minimum load where on
+    assert fix["chp_gas_ub"][0] == fix["chp_gas_ub"][3] == 0.0
+    assert fix["chp_gas_lb"][2] == cfg["chp"]["p_gas_min"]
+    assert fix["chp_gas_lb"][4] == 0.0
+    assert (fix["boiler_gas_lb"] <= fix["boiler_gas_ub"]).all()
+
+
+def test_startup_cost_widens_the_margin(cfg):
+    assert np.isnan(_status(cfg, startup_cost=200.0)["status"][2:]).all()
+    # Without a start-up cost every feasible hour is decided
+    np.testing.assert_array_equal(_status(cfg, startup_cost=0.0)["status"],
+                                  [0.0, 1.0, 1.0, 0.0, 1.0])
+
+
+@pytest.mark.parametrize("build_mode", ["loop", "array"])
+@pytest.mark.parametrize("startup_cost", [0.0, 10.0, 50.0])
+def test_presolve_keeps_the_optimum(data, cfg, build_mode, startup_cost):
+    cfg["settings"]["build_mode"] = build_mode
+    cfg["chp"]["startup_cost"] = startup_cost
+
+    objectives = {}
+    for presolve in (False, True):
+        cfg["settings"]["presolve"] = presolve
+        optimizer = ORToolsOptimizer(data, cfg)
+        optimizer.optimize(use_cache=False)
+        objectives[presolve] = optimizer.objective_value
+
+    assert optimizer.presolve_stats["free"] < len(data)
+    assert objectives[True] == pytest.approx(objectives[False], rel=1e-7)
+
+
+def test_fixed_hours_follow_the_optimal_schedule(data, cfg):
+    cfg["chp"]["startup_cost"] = 10.0
+    optimizer = ORToolsOptimizer(data, cfg)
+    optimizer.optimize(use_cache=False)
+
+    coeff_chp, coeff_boiler = objective_coefficients(data, cfg)
+    status = presolve_status(coeff_chp, coeff_boiler, data["demand_th"].values,
+                             cfg["chp"], cfg["boiler"], 10.0)["status"]
+    fixed = ~np.isnan(status)
+    assert fixed.any()
+    np.testing.assert_array_equal(optimizer.results["chp_status"].values[fixed].round(),
+                                  status[fixed])
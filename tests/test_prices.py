@@ -0,0 +1,75 @@
+"""Raw exchange price parser."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.price_parser import read_price_csv_legacy
+from src.utils.prices import parse_price_csv
+
+SAMPLE = """header;line;ignored
+01.07.2026 23:59:59;01.07.2026 00:00:00;10,5
+01.07.2026 23:59:59;01.07.2026 01:00:00;11
+02.07.2026 10:00:00;01.07.2026 01:00:00;12,25
+01.07.2026 23:59:59;01.07.2026 04:00:00;-3,75
+01.07.2026 23:59:59;01.07.2026 02:00:00;13
+01.07.2026 23:59:59;01.07.2026 02:30:00;99
+01.07.2026 23:59:59;01.07.2026 02:00:00;13
+"""
+
+
+@pytest.mark.parametrize("key", ["electricity_price", "gas_price"])
+def test_raw_files_match_read_csv_baseline(cfg, key):
+    parsed, summary = parse_price_csv(cfg["data"][key], "price")
+    baseline = read_price_csv_legacy(cfg["data"][key], "price")
+    pd.testing.assert_frame_equal(parsed, baseline)
+    assert summary["rows"] >= len(baseline.dropna())
+
+
+def test_keep_latest_matches_pandas_reference(cfg):
+    path = cfg["data"]["electricity_price"]
+    parsed, _ = parse_price_csv(path, "price", keep="latest")
+
+    raw = pd.read_csv(path, sep=";", names=["published", "datetime", "price"], header=None,
+                      skiprows=1, decimal=",")
+    for col in ("published", "datetime"):
+        raw[col] = pd.to_datetime(raw[col], format="%d.%m.%Y %H:%M:%S")
+    raw["row"] = np.arange(len(raw))
+    latest = raw.sort_values(["datetime", "published", "row"], ascending=[True, False, False])
+    reference = (latest.drop_duplicates("datetime").set_index("datetime")[["price"]]
+                 .resample("h").asfreq())
+    pd.testing.assert_frame_equal(parsed, reference)
+
+
+@pytest.mark.parametrize("keep, price_1h", [("first", 11.0), ("latest", 12.25)])
+def test_duplicates_gaps_and_order(keep, price_1h):
+    df, summary = parse_price_csv(io.StringIO(SAMPLE), "price_el", keep=keep)
+
+    expected = pd.DataFrame(
+        {"price_el": [10.5, price_1h, 13.0, np.nan, -3.75]},
+        index=pd.date_range("2026-07-01", periods=5, freq="h", name="datetime"))
+    pd.testing.assert_frame_equal(df, expected, check_freq=False, check_index_type=False)
+    assert summary["rows"] == 7
+    assert summary["duplicates"] == 2
+    assert summary["conflicting_duplicates"] == 1
+    assert summary["duplicate_timestamps"] == ["2026-07-01 01:00:00", "2026-07-01 02:00:00"]
+    assert summary["missing_hours"] == 1
+    assert summary["gaps"] == ["2026-07-01 03:00:00"]
+    assert summary["published"] == ["2026-07-01 23:59:59", "2026-07-02 10:00:00"]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("01.07.2026 23:59:59;2026-07-01 05:00:00;1,0", "Row 9: datetime does not match"),
+    ("01.07.2026 23:59:59;01.07.2026 05:00:00;1.5", "Row 9: price is not a number"),
+    ("1.7.26;01.07.2026 05:00:00;1,0", "Row 9: published does not match"),
+])
+def test_malformed_row_is_reported(line, message):
+    with pytest.raises(ValueError, match=message):
+        parse_price_csv(io.StringIO(SAMPLE + line + "\n"), "price")
+
+
+def test_unknown_keep_rule():
+    with pytest.raises(ValueError, match="keep must be"):
+        parse_price_csv(io.StringIO(SAMPLE), "price", keep="last")
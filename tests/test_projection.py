@@ -0,0 +1,57 @@
+"""Heat demand projection through the (month, day, hour) lookup table."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.projection import DemandProjection
+
+
+@pytest.fixture
+def profile() -> pd.Series:
+    """Synthetic one-year profile whose value encodes the hour of the year."""
+    index = pd.date_range("2026-01-01", "2026-12-31 23:00", freq="h")
+    return pd.Series(np.arange(len(index), dtype=float), index=index)
+
+
+def test_profile_year_is_reproduced(year):
+    demand = year["demand_th"]
+    demand = demand[~demand.index.duplicated(keep="first")]
+    projected = DemandProjection(year["demand_th"]).project(demand.index)
+    np.testing.assert_array_equal(projected, demand.to_numpy())
+
+
+def test_gaps_and_repeated_hours(profile):
+    spring = pd.Timestamp("2026-03-29 02:00")
+    autumn = pd.Timestamp("2026-10-25 02:00")
+    repeated = pd.Series([-1.0], index=[autumn])
+    local = pd.concat([profile.drop([spring, profile.index[0]]), repeated])
+
+    projection = DemandProjection(local)
+    # Missing spring hour: previous hour; missing Jan 1 00:00: Dec 31 23:00
+    assert projection.project([spring])[0] == profile[spring - pd.Timedelta("1h")]
+    assert projection.project(["2030-01-01 00:00"])[0] == profile.iloc[-1]
+    # Repeated autumn hour keeps its first value
+    assert projection.project([autumn])[0] == profile[autumn]
+
+
+def test_leap_day_reuses_feb_28(profile):
+    leap_day = pd.date_range("2028-02-29", periods=24, freq="h")
+    projected = DemandProjection(profile).project(leap_day)
+    np.testing.assert_array_equal(projected, profile["2026-02-28"].to_numpy())
+
+
+def test_chunks_match_one_projection(profile):
+    projection = DemandProjection(profile)
+    chunks = list(projection.iter_chunks("2027-12-30", "2028-03-02 05:00", chunk_size=500))
+    streamed = pd.concat(chunks)
+
+    index = pd.date_range("2027-12-30", "2028-03-02 05:00", freq="h")
+    assert streamed.index.equals(index)
+    assert max(len(c) for c in chunks) == 500
+    np.testing.assert_array_equal(streamed.to_numpy(), projection.project(index))
+
+
+def test_empty_profile_is_rejected():
+    with pytest.raises(ValueError, match="no values"):
+        DemandProjection(pd.Series([np.nan], index=[pd.Timestamp("2026-01-01")]))
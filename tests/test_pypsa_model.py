@@ -0,0 +1,75 @@
+"""PyPSAOptimizer checks; the solves run in a fresh interpreter (see isolated.py)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from isolated import run_isolated
+
+
+def _solve(data: pd.DataFrame, cfg: dict, **kwargs) -> dict:
+    """Build and solve with HiGHS; return status, objective and results."""
+    from src.models.pypsa_model import PyPSAOptimizer
+
+    optimizer = PyPSAOptimizer(data, cfg)
+    optimizer.build_model()
+    optimizer.solve(solver_name="highs", export_readable=False, use_cache=False, **kwargs)
+    return {"status": optimizer.status, "objective": optimizer.objective_value,
+            "results": optimizer.results, "relaxation": optimizer.relaxation}
+
+
+def _reuse_and_rebuild(data: pd.DataFrame, cfg: dict, scenarios: list) -> list:
+    """Re-solve each scenario on one patched model and on a rebuilt one."""
+    from src.models.pypsa_model import PyPSAOptimizer
+
+    reused = PyPSAOptimizer(data, cfg)
+    reused.build_model()
+    reused.solve(solver_name="highs", export_readable=False, use_cache=False)
+
+    pairs = []
+    for scenario in scenarios:
+        reused.update_parameters(**scenario)
+        reused.resolve(solver_name="highs")
+
+        # Updates accumulate on the reused model
+        data = data.assign(**{k: v for k, v in scenario.items() if k != "co2_price"})
+        if "co2_price" in scenario:
+            cfg = {**cfg, "data": {**cfg["data"], "co2_price": scenario["co2_price"]}}
+        rebuilt = _solve(data, cfg)
+        pairs.append(({"status": reused.status, "objective": reused.objective_value,
+                       "results": reused.results.copy()}, rebuilt))
+    return pairs
+
+
+@pytest.fixture
+def days(week) -> pd.DataFrame:
+    """Three July days, enough for the PyPSA checks."""
+    return week.iloc[:72].copy()
+
+
+def test_reused_model_matches_rebuild(days, cfg):
+    rng = np.random.default_rng(0)
+    scenarios = [
+        {"price_el": days["price_el"].values * rng.uniform(0.8, 2.0, len(days)),
+         "demand_th": days["demand_th"].values * rng.uniform(0.9, 1.1, len(days))},
+        {"price_gas": days["price_gas"].values * 1.1, "co2_price": 90.0},
+    ]
+    for reused, rebuilt in run_isolated(_reuse_and_rebuild, days, cfg, scenarios):
+        assert reused["status"] == rebuilt["status"] == "ok"
+        assert reused["objective"] == pytest.approx(rebuilt["objective"], rel=1e-6)
+        pd.testing.assert_frame_equal(reused["results"], rebuilt["results"], atol=1e-6)
+
+
+def test_relaxed_commitment_is_bounded_by_the_milp(days, cfg):
+    relaxed_cfg = {**cfg, "commitment": {"mode": "relaxed"}}
+    milp = run_isolated(_solve, days, cfg)
+    relaxed = run_isolated(_solve, days, relaxed_cfg)
+
+    assert milp["status"] == relaxed["status"] == "ok"
+    # PyPSA minimizes cost: the relaxation bounds the MILP from below
+    tolerance = 1e-6 * abs(milp["objective"])
+    assert relaxed["relaxation"]["bound"] <= milp["objective"] + tolerance
+    assert relaxed["objective"] >= milp["objective"] - tolerance
+    # Integer-feasible: the CHP is either off or above its minimum load
+    gas = relaxed["results"]["chp_gas_in"]
+    assert ((gas < 1e-6) | (gas >= cfg["chp"]["p_gas_min"] - 1e-6)).all()
@@ -0,0 +1,112 @@
+"""Cache of solved results."""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.models.ortools_model import ORToolsOptimizer
+from src.models.rolling_horizon import RollingHorizonOptimizer
+from src.utils import cache
+from src.utils.cache import load_result, lookup_result, save_result
+
+
+def solve(data, cfg) -> ORToolsOptimizer:
+    optimizer = ORToolsOptimizer(data, cfg)
+    optimizer.optimize()
+    return optimizer
+
+
+def entries(cfg) -> list:
+    directory = cfg["result_cache"]["dir"]
+    return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+
+def test_unchanged_inputs_hit(week, cfg):
+    first = solve(week, cfg)
+    second = solve(week, cfg)
+
+    assert not first.from_cache and second.from_cache
+    assert second.objective_value == first.objective_value
+    pd.testing.assert_frame_equal(second.results, first.results, check_freq=False)
+
+
+@pytest.mark.parametrize("change", [
+    lambda data, cfg: cfg["chp"].update(eta_el=0.36),
+    lambda data, cfg: cfg["data"].update(co2_price=80.0),
+    lambda data, cfg: cfg["settings"].update(solver="CBC"),
+    lambda data, cfg: cfg["settings"].update(presolve=True),
+    lambda data, cfg: cfg["settings"].update(heuristic=True, cutoff=True),
+    lambda data, cfg: cfg["solver_options"].update(mip_rel_gap=0.01),
+    lambda data, cfg: data.__setitem__("price_el", data["price_el"] + 1e-6),
+])
+def test_changed_inputs_miss(week, cfg, change):
+    solve(week, cfg)
+    change(week, cfg)
+    assert not solve(week, cfg).from_cache
+    assert len(entries(cfg)) == 2
+
+
+def test_disabled_cache_stores_nothing(week, cfg):
+    cfg["result_cache"]["enabled"] = False
+    solve(week, cfg)
+    assert not solve(week, cfg).from_cache
+    assert entries(cfg) == []
+
+
+def test_least_recently_used_entries_are_evicted(week, cfg):
+    directory = cfg["result_cache"]["dir"]
+    save_result(cfg, "test", "a" * 64, week)
+    size = sum(e.stat().st_size for e in os.scandir(os.path.join(directory, f"test-{'a' * 16}")))
+    cfg["result_cache"]["max_mb"] = 2.5 * size / 2**20
+    save_result(cfg, "test", "b" * 64, week)
+    for key, mtime in (("a", 1), ("b", 2)):
+        os.utime(os.path.join(directory, f"test-{key * 16}", "meta.json"), (mtime, mtime))
+
+    # A lookup marks "a" as recently used, so "b" goes first
+    assert load_result(cfg, "test", "a" * 64) is not None
+    save_result(cfg, "test", "c" * 64, week)
+    assert entries(cfg) == [f"test-{key * 16}" for key in "ac"]
+
+
+def test_rolling_horizon_windows_bypass_cache(week, cfg):
+    cfg["rolling_horizon"] = {"window_hours": 48, "commit_hours": 40}
+    RollingHorizonOptimizer(week, cfg).optimize()
+    assert entries(cfg) == []
+
+
+def test_lookup_restores_the_index(week, cfg):
+    results = week[["price_el"]].rename(columns={"price_el": "chp_gas_in"})
+    save_result(cfg, "test", "k", results, {"objective_value": 1.0})
+    # No key: nothing is stored or looked up
+    save_result(cfg, "test", None, results)
+    assert lookup_result(cfg, "test", None, week.index) is None
+    assert len(entries(cfg)) == 1
+
+    cached, extra = lookup_result(cfg, "test", "k", week.index)
+    assert extra == {"objective_value": 1.0}
+    pd.testing.assert_frame_equal(cached, results)
+
+
+@pytest.mark.parametrize("evicted", ["during_read", "after_read"])
+def test_concurrent_eviction_is_a_miss_or_a_hit(week, cfg, monkeypatch, evicted):
+    results = week[["price_el"]].rename(columns={"price_el": "chp_gas_in"})
+    save_result(cfg, "test", "k", results, {"objective_value": 1.0})
+    entry = os.path.join(cfg["result_cache"]["dir"], entries(cfg)[0])
+    load_frame = cache.load_frame
+
+    def evicting_load_frame(*args, **kwargs):
+        # Another process evicts the entry around this read
+        if evicted == "during_read":
+            os.remove(os.path.join(entry, "col0.npy"))
+        frame = load_frame(*args, **kwargs)
+        shutil.rmtree(entry)
+        return frame
+
+    monkeypatch.setattr(cache, "load_frame", evicting_load_frame)
+    cached = load_result(cfg, "test", "k")
+    if evicted == "during_read":
+        assert cached is None
+    else:
+        assert cached[1] == {"objective_value": 1.0}
@@ -0,0 +1,69 @@
+"""Rolling-horizon windows and stitching."""
+
+import pytest
+
+from src.models.ortools_model import ORToolsOptimizer
+from src.models.rolling_horizon import RollingHorizonOptimizer, resolve_window
+
+
+@pytest.mark.parametrize("rh_cfg, expected", [
+    ({"window_hours": 168, "commit_hours": 144}, (168, 144, 24)),
+    ({"window_hours": 168, "overlap_hours": 24}, (168, 144, 24)),
+    ({"commit_hours": 144, "overlap_hours": 24}, (168, 144, 24)),
+    ({"window_hours": 48}, (48, 48, 0)),
+])
+def test_resolve_window(rh_cfg, expected):
+    assert resolve_window(rh_cfg) == expected
+
+
+@pytest.mark.parametrize("rh_cfg", [
+    {"window_hours": 24, "commit_hours": 36},
+    {"window_hours": 24, "commit_hours": 12, "overlap_hours": 6},
+    {"commit_hours": 24},
+])
+def test_resolve_window_rejects_inconsistent_lengths(rh_cfg):
+    with pytest.raises(ValueError):
+        resolve_window(rh_cfg)
+
+
+def test_windows_commit_every_hour_once(week, cfg):
+    cfg["rolling_horizon"] = {"window_hours": 48, "commit_hours": 40}
+    windows = RollingHorizonOptimizer(week, cfg).windows()
+
+    committed = [h for start, _, n_commit in windows for h in range(start, start + n_commit)]
+    assert committed == list(range(len(week)))
+    assert all(end - start <= 48 for start, end, _ in windows)
+
+
+def test_independent_hours_stitch_to_full_optimum(week, cfg):
+    cfg["rolling_horizon"] = {"window_hours": 48, "commit_hours": 40}
+    stitched = RollingHorizonOptimizer(week, cfg)
+    results = stitched.optimize()
+
+    full = ORToolsOptimizer(week, cfg)
+    full.optimize(use_cache=False)
+    assert results.index.equals(week.index)
+    assert stitched.objective_value == pytest.approx(full.objective_value, rel=1e-6)
+
+
+def test_startup_cost_stitches_a_feasible_schedule(week, cfg):
+    cfg["chp"]["startup_cost"] = 200.0
+    cfg["rolling_horizon"] = {"window_hours": 48, "commit_hours": 40}
+    stitched = RollingHorizonOptimizer(week, cfg)
+    stitched.optimize()
+
+    full = ORToolsOptimizer(week, cfg)
+    full.optimize(use_cache=False)
+    assert stitched.objective_value <= full.objective_value + 1e-6 * abs(full.objective_value)
+    assert not stitched.results.isna().any().any()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_window_raises_with_its_hours(week, cfg, workers):
+    data = week.copy()
+    # More heat than CHP and boiler can deliver, inside the third window only
+    data.iloc[100, data.columns.get_loc("demand_th")] = 1e4
+    cfg["rolling_horizon"] = {"window_hours": 48, "commit_hours": 40}
+    cfg["execution"]["workers"] = workers
+    with pytest.raises(RuntimeError, match=r"Window 2 \(hours 80-127, "):
+        RollingHorizonOptimizer(data, cfg).optimize()
@@ -0,0 +1,58 @@
+"""Scaling benchmark cases, baseline and regression check."""
+
+import json
+
+import pytest
+
+from benchmarks.scaling import DEFAULT_HORIZONS, SIZE_METRICS, compare, run_case, run_isolated
+
+BASELINE = "benchmarks/baselines/scaling.json"
+
+
+def record(**metrics) -> dict:
+    base = {"backend": "ortools", "horizon": "1w", "status": "optimal", "build_s": 1.0,
+            "solve_s": 1.0, "extract_s": 0.1, "peak_mb": 200.0, "n_vars": 504}
+    return {**base, **metrics}
+
+
+def test_compare_flags_regressions_beyond_threshold_and_noise():
+    baseline = {"results": [record()]}
+    table = compare([record(build_s=1.2, solve_s=1.5, extract_s=0.14, n_vars=505)],
+                    baseline, threshold=0.25).set_index("metric")
+
+    assert table.loc["solve_s", "regression"]
+    assert not table.loc["build_s", "regression"]  # +20%
+    assert not table.loc["extract_s", "regression"]  # +40%, but below the 0.05 s floor
+    assert not table.loc["n_vars", "regression"]
+    assert compare([record(extract_s=0.14)], baseline, 0.25, min_delta_s=0.01) \
+        .set_index("metric").loc["extract_s", "regression"]
+
+
+def test_compare_flags_lost_solutions():
+    table = compare([record(status="timeout")], {"results": [record()]}, threshold=0.25)
+    assert table[table["metric"] == "status"]["regression"].all()
+
+
+def test_baseline_has_optimal_default_cases():
+    with open(BASELINE) as f:
+        results = json.load(f)["results"]
+    cases = {(r["backend"], r["horizon"]): r for r in results}
+
+    for backend, horizons in DEFAULT_HORIZONS.items():
+        for horizon in horizons:
+            assert cases[(backend, horizon)]["status"] == "optimal", (backend, horizon)
+
+
+@pytest.mark.parametrize("backend", ["ortools", "pypsa"])
+def test_short_case_matches_baseline_model_size(backend):
+    with open(BASELINE) as f:
+        base = {(r["backend"], r["horizon"]): r for r in json.load(f)["results"]}
+    if backend == "ortools":
+        current = run_case(backend, "24h", "highs")
+    else:
+        current = run_isolated(backend, "24h", "highs", timeout=300)
+
+    assert current["status"] == "optimal"
+    assert current["hours"] == 24
+    for metric in SIZE_METRICS:
+        assert current[metric] == base[(backend, "24h")][metric], metric
@@ -0,0 +1,73 @@
+"""Batch scenario sweeps."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils.scenarios import apply_overrides, expand_scenarios, run_sweep
+
+
+def test_expand_scenarios_grid_then_explicit():
+    scenarios = expand_scenarios({
+        "grid": {"co2_price": [55.0, 80.0], "price_el_scale": [1.0, 1.5]},
+        "scenarios": [{"chp.eta_el": 0.35}],
+    })
+    assert scenarios == [
+        {"co2_price": 55.0, "price_el_scale": 1.0},
+        {"co2_price": 55.0, "price_el_scale": 1.5},
+        {"co2_price": 80.0, "price_el_scale": 1.0},
+        {"co2_price": 80.0, "price_el_scale": 1.5},
+        {"chp.eta_el": 0.35},
+    ]
+
+
+def test_apply_overrides_leaves_inputs_unchanged(week, cfg):
+    data, scenario_cfg = apply_overrides(
+        week, cfg, {"co2_price": 120.0, "demand_scale": 2.0, "chp.eta_el": 0.35})
+
+    assert scenario_cfg["data"]["co2_price"] == 120.0
+    assert scenario_cfg["chp"]["eta_el"] == 0.35
+    pd.testing.assert_series_equal(data["demand_th"], week["demand_th"] * 2.0)
+    assert cfg["data"]["co2_price"] == 55.0
+    assert cfg["chp"]["eta_el"] == 0.372
+
+
+def test_apply_overrides_rejects_unknown_parameter(week, cfg):
+    with pytest.raises(KeyError, match="Unknown scenario parameter"):
+        apply_overrides(week, cfg, {"wind_speed": 3.0})
+
+
+def test_sweep_backends_agree(week, cfg, tmp_path):
+    output = tmp_path / "sweep.csv"
+    store = run_sweep(week, cfg, {
+        "backends": ["ortools", "merit_order"],
+        "grid": {"co2_price": [55.0, 120.0]},
+        "scenarios": [{"turbine.eta": 0.3}],
+        "output": str(output),
+    })
+
+    assert list(store.index) == [(i, b) for i in range(3) for b in ("ortools", "merit_order")]
+    solved = store[store["ok"]]
+    assert len(solved) == 4
+    profits = solved["profit_eur"].unstack("backend")
+    pd.testing.assert_series_equal(profits["merit_order"], profits["ortools"],
+                                   check_names=False, rtol=1e-4)
+    assert store.loc[2, "error"].str.startswith("KeyError").all()
+    assert output.exists()
+    # One-off scenarios stay out of the result cache
+    assert not os.path.exists(cfg["result_cache"]["dir"])
+
+
+def test_sweep_runs_pypsa_beside_ortools(week, cfg):
+    # OR-Tools is loaded in this process, so PyPSA with HiGHS must run elsewhere
+    import src.models.ortools_model  # noqa: F401
+
+    cfg["settings"]["solver"] = "highs"
+    store = run_sweep(week.iloc[:72], cfg, {
+        "backends": ["pypsa", "merit_order"],
+        "grid": {"co2_price": [55.0, 120.0]},
+    })
+
+    assert store["ok"].all(), store.get("error")
+    assert list(store.index) == [(i, b) for i in range(2) for b in ("pypsa", "merit_order")]
@@ -0,0 +1,165 @@
+"""Solver options: presets, the telemetry gap and the per-backend mappings."""
+
+import pytest
+
+from src.models.cpsat_model import CPSATOptimizer, cpsat_settings
+from src.models.ortools_model import ORToolsOptimizer
+from src.utils.solver_options import (
+    SCIP_EMPHASIS, active_options, linopy_options, scip_parameters, solver_options, stop_gap,
+    stop_time,
+)
+
+PRESETS = {"solver_options": {
+    "threads": 2,
+    "presets": [
+        {"max_hours": 24, "mip_rel_gap": 0.0},
+        {"max_hours": 8784, "mip_rel_gap": 1e-4},
+        {"max_hours": None, "mip_rel_gap": 1e-3, "time_limit_s": 900},
+    ],
+}}
+
+
+def test_defaults():
+    options = solver_options({}, 168)
+    assert all(value is None for value in options.values())
+    assert active_options(options) == {}
+
+
+@pytest.mark.parametrize("steps, gap, time_limit", [
+    (24, 0.0, None), (25, 1e-4, None), (8784, 1e-4, None), (43800, 1e-3, 900),
+])
+def test_first_matching_preset_applies(steps, gap, time_limit):
+    options = solver_options(PRESETS, steps)
+    assert (options["mip_rel_gap"], options["time_limit_s"]) == (gap, time_limit)
+    # Values outside the presets apply to every horizon
+    assert options["threads"] == 2
+    assert "presets" not in options and "max_hours" not in options
+
+
+def test_without_a_matching_preset():
+    cfg = {"solver_options": {"mip_rel_gap": 0.01,
+                              "presets": [{"max_hours": 24, "mip_rel_gap": 0.0}]}}
+    assert solver_options(cfg, 168)["mip_rel_gap"] == 0.01
+
+
+def test_invalid_options_raise():
+    with pytest.raises(KeyError, match="mip_gap"):
+        solver_options({"solver_options": {"presets": [{"max_hours": None, "mip_gap": 0.1}]}}, 24)
+    with pytest.raises(ValueError, match="emphasis"):
+        solver_options({"solver_options": {"emphasis": "speed"}}, 24)
+
+
+def test_stop_gap():
+    assert stop_gap(None, None) is None
+    assert stop_gap(0.01, None) == 0.01
+    assert stop_gap(None, 0.001) == 0.001
+    # Either rule ends the solve: the looser gap applies
+    assert stop_gap(0.01, 0.001) == 0.01
+    assert stop_gap(0.001, 0.01) == 0.01
+
+
+def test_stop_time():
+    assert stop_time(None, None) is None
+    assert stop_time(30, None) == 30.0
+    assert stop_time(None, 60) == 60.0
+    # Either limit ends the solve: the tighter one applies
+    assert stop_time(30, 60) == 30.0
+    assert stop_time(60, 30) == 30.0
+
+
+def test_scip_parameters():
+    options = solver_options({"solver_options": {"emphasis": "feasibility",
+                                                 "mip_abs_gap": 5.0, "seed": 3}}, 24)
+    assert scip_parameters(options) == {**SCIP_EMPHASIS["feasibility"],
+                                        "limits/absgap": 5.0,
+                                        "randomization/randomseedshift": 3}
+    assert scip_parameters(solver_options({}, 24)) == {}
+
+
+def test_linopy_options(capsys):
+    options = solver_options({"solver_options": {
+        "time_limit_s": 60, "mip_rel_gap": 0.01, "threads": 4, "seed": 1,
+        "presolve": False, "emphasis": "optimality"}}, 24)
+    assert linopy_options("highs", options) == {
+        "time_limit": 60.0, "mip_rel_gap": 0.01, "threads": 4, "random_seed": 1,
+        "presolve": "off", "mip_heuristic_effort": 0.0}
+    assert linopy_options("scip", options) == {
+        "limits/time": 60.0, "limits/gap": 0.01, "parallel/maxnthreads": 4,
+        "randomization/randomseedshift": 1, "setPresolve": "off",
+        "setEmphasis": "optimality"}
+    assert linopy_options("glpk", options) == {}
+    assert "not mapped for glpk" in capsys.readouterr().out
+    assert linopy_options("glpk", solver_options({}, 24)) == {}
+
+
+def _ortools_gap(week, cfg, monkeypatch) -> float:
+    """Solve with OR-Tools and return the relative MIP gap passed to Solve()."""
+    used = []
+    build_parameters = ORToolsOptimizer._solver_parameters
+
+    def spy(self, options):
+        params = build_parameters(self, options)
+        used.append(params)
+        return params
+
+    monkeypatch.setattr(ORToolsOptimizer, "_solver_parameters", spy)
+    ORToolsOptimizer(week, cfg).optimize(use_cache=False)
+    (params,) = used
+    return params.GetDoubleParam(params.RELATIVE_MIP_GAP)
+
+
+@pytest.mark.parametrize("mip_rel_gap, expected", [(None, 0.05), (1e-4, 0.05), (0.1, 0.1)])
+def test_telemetry_gap_reaches_ortools(week, cfg, tmp_path, monkeypatch, mip_rel_gap, expected):
+    cfg["telemetry"] = {"enabled": True, "path": str(tmp_path / "telemetry.jsonl"), "gap": 0.05}
+    cfg["solver_options"] = {"mip_rel_gap": mip_rel_gap}
+    assert _ortools_gap(week, cfg, monkeypatch) == pytest.approx(expected)
+
+
+def test_option_gap_reaches_ortools(week, cfg, monkeypatch):
+    cfg["solver_options"] = {"mip_rel_gap": 0.02}
+    assert _ortools_gap(week, cfg, monkeypatch) == pytest.approx(0.02)
+
+
+def test_telemetry_gap_reaches_cpsat(week, cfg, tmp_path):
+    cfg["telemetry"] = {"enabled": True, "path": str(tmp_path / "telemetry.jsonl"), "gap": 0.05}
+    cfg["solver_options"] = {"mip_rel_gap": 1e-4, "seed": 7, "threads": 2}
+    optimizer = CPSATOptimizer(week, cfg)
+    optimizer.optimize(use_cache=False)
+    assert optimizer.solver.parameters.relative_gap_limit == pytest.approx(0.05)
+    assert optimizer.solver.parameters.random_seed == 7
+
+
+@pytest.mark.parametrize("telemetry_limit, option_limit, expected", [
+    (None, None, float("inf")), (None, 60, 60.0), (30, 60, 30.0), (60, 30, 30.0),
+])
+def test_time_limits_and_threads_reach_cpsat(week, cfg, tmp_path, telemetry_limit,
+                                             option_limit, expected):
+    cfg["telemetry"] = {"enabled": True, "path": str(tmp_path / "telemetry.jsonl"),
+                        "time_limit_s": telemetry_limit}
+    cfg["solver_options"] = {"time_limit_s": option_limit, "threads": 2}
+    optimizer = CPSATOptimizer(week.iloc[:24], cfg)
+    optimizer.optimize(use_cache=False)
+    params = optimizer.solver.parameters
+    assert params.num_workers == 2
+    assert params.max_time_in_seconds == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("setting", ["workers", "time_limit_s"])
+def test_moved_cpsat_settings_raise(setting):
+    with pytest.raises(KeyError, match=f"cpsat.{setting} is now solver_options"):
+        cpsat_settings({"cpsat": {setting: 2}})
+
+
+def test_unsupported_options_are_reported(week, cfg, capsys):
+    cfg["settings"]["solver"] = "CBC"
+    cfg["solver_options"] = {"threads": 2, "emphasis": "feasibility"}
+    ORToolsOptimizer(week, cfg).optimize(use_cache=False)
+    assert "not supported by CBC: threads, emphasis" in capsys.readouterr().out
+
+
+def test_options_are_part_of_the_cache_key(week, cfg):
+    ORToolsOptimizer(week, cfg).optimize()
+    cfg["solver_options"] = {"mip_rel_gap": 0.01}
+    changed = ORToolsOptimizer(week, cfg)
+    changed.optimize()
+    assert not changed.from_cache
@@ -0,0 +1,119 @@
+"""Solver telemetry records and early-stop rules."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.ortools_model import ORToolsOptimizer
+from src.utils import telemetry
+from src.utils.telemetry import SolveMonitor, early_stop_rules, relative_gap, telemetry_settings
+
+
+class Clock:
+    """Manually advanced replacement of time.perf_counter."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(telemetry, "time", SimpleNamespace(perf_counter=clock))
+    return clock
+
+
+def _settings(tmp_path, **rules):
+    return telemetry_settings({"telemetry": {"enabled": True, "interval_s": 0.0,
+                                             "path": str(tmp_path / "telemetry.jsonl"), **rules}})
+
+
+def _records(tmp_path):
+    with open(tmp_path / "telemetry.jsonl") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_relative_gap():
+    assert relative_gap(100.0, 101.0) == pytest.approx(0.01)
+    assert relative_gap(-100.0, -99.0) == pytest.approx(0.01)
+    assert relative_gap(None, 1.0) is None
+    assert relative_gap(1.0, None) is None
+    assert relative_gap(0.0, 0.0) == 0.0
+
+
+def test_early_stop_rules():
+    assert early_stop_rules({}) is None
+    assert early_stop_rules({"telemetry": {"enabled": True}}) is None
+    assert early_stop_rules({"telemetry": {"enabled": False, "gap": 0.01}}) is None
+    assert early_stop_rules({"telemetry": {"enabled": True, "gap": 0.01}}) == {"gap": 0.01}
+
+
+def test_gap_rule_and_tightest_bound(tmp_path, clock):
+    monitor = SolveMonitor("test", _settings(tmp_path, gap=0.01), sense="max")
+    assert monitor.update(incumbent=90.0, bound=120.0) is None
+    # A looser bound and a worse incumbent are ignored
+    assert monitor.update(incumbent=80.0, bound=130.0) is None
+    assert (monitor.incumbent, monitor.bound) == (90.0, 120.0)
+    assert monitor.update(incumbent=99.5, bound=100.0) == "gap"
+    monitor.finish("FEASIBLE")
+
+    records = _records(tmp_path)
+    assert [r["event"] for r in records] == ["incumbent", "progress", "incumbent", "end"]
+    assert len({r["run"] for r in records}) == 1
+    assert records[-1]["stop"] == "gap" and records[-1]["status"] == "FEASIBLE"
+    assert records[-1]["gap"] == pytest.approx(0.5 / 99.5)
+
+
+def test_minimize_keeps_the_highest_bound(tmp_path, clock):
+    monitor = SolveMonitor("test", _settings(tmp_path), sense="min")
+    monitor.update(incumbent=100.0, bound=80.0)
+    monitor.update(incumbent=95.0, bound=70.0)
+    monitor.update(bound=float("-inf"))
+    assert (monitor.incumbent, monitor.bound) == (95.0, 80.0)
+
+
+def test_stall_rule(tmp_path, clock):
+    monitor = SolveMonitor("test", _settings(tmp_path, stall_s=10.0))
+    # No incumbent yet: nothing to stall on
+    clock.now += 20.0
+    assert monitor.update(bound=200.0) is None
+    assert monitor.time_left() is None
+    monitor.update(incumbent=50.0)
+    clock.now += 6.0
+    assert monitor.time_left() == pytest.approx(4.0)
+    assert monitor.update(incumbent=60.0) is None
+    clock.now += 9.0
+    assert monitor.update(incumbent=60.0) is None
+    clock.now += 1.0
+    assert monitor.update() == "stall"
+
+
+def test_time_limit_rule(tmp_path, clock):
+    monitor = SolveMonitor("test", _settings(tmp_path, time_limit_s=30.0))
+    clock.now += 20.0
+    assert monitor.update(incumbent=1.0) is None
+    assert monitor.time_left() == pytest.approx(10.0)
+    clock.now += 10.0
+    assert monitor.update() == "time_limit"
+    # The first reason sticks
+    assert monitor.update(incumbent=2.0) == "time_limit"
+
+
+@pytest.mark.parametrize("slice_s", [None, 1.0])
+def test_monitored_ortools_solve(week, cfg, tmp_path, slice_s):
+    plain = ORToolsOptimizer(week, cfg)
+    plain.optimize()
+
+    cfg["telemetry"] = {"enabled": True, "path": str(tmp_path / "telemetry.jsonl"),
+                        "gap": 1e-6, "slice_s": slice_s}
+    monitored = ORToolsOptimizer(week, cfg)
+    monitored.optimize()
+
+    assert monitored.objective_value == pytest.approx(plain.objective_value, rel=1e-6)
+    records = _records(tmp_path)
+    assert records[-1]["event"] == "end" and records[-1]["component"] == "ortools"
+    assert records[-1]["incumbent"] == pytest.approx(monitored.objective_value)